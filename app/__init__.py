@@ -2,6 +2,8 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from config import Config
 import os
 
@@ -10,21 +12,31 @@ migrate = Migrate()
 login_manager = LoginManager()
 login_manager.login_view = "auth.login"
 
-def create_app():
+POOL_SIZING_OPTIONS = ("pool_size", "max_overflow", "pool_timeout")
+
+def create_app(test_config=None):
     flask_app = Flask(__name__, instance_relative_config=True, template_folder="templates", static_folder="static")
 
     flask_app.config.from_object(Config)
+    if test_config:
+        flask_app.config.update(test_config)
 
     os.makedirs(flask_app.instance_path, exist_ok=True)
-    db_path = os.path.join(flask_app.instance_path, "app.db")
-    flask_app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + db_path
+    if not flask_app.config.get("SQLALCHEMY_DATABASE_URI"):
+        db_path = os.path.join(flask_app.instance_path, "app.db")
+        flask_app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + db_path
     flask_app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    _configure_engine_options(flask_app)
 
     db.init_app(flask_app)
     migrate.init_app(flask_app, db)
     login_manager.init_app(flask_app)
 
+    with flask_app.app_context():
+        _install_sqlite_pragmas(flask_app)
+
     import app.models  # noqa
+    import app.services.session_users  # noqa: registers the Flask-Login user loader
 
     from app.routes.auth import auth_bp
     from app.routes.admin import admin_bp
@@ -36,7 +48,32 @@ def create_app():
     flask_app.register_blueprint(matches_bp)
     flask_app.register_blueprint(telegram_api_bp)
 
+    from app.services.profiling import init_profiling
+    init_profiling(flask_app)
+
     from app.cli import register_cli
     register_cli(flask_app)
 
     return flask_app
+
+def _configure_engine_options(flask_app):
+    """Drop pool sizing for in-memory SQLite, which Flask-SQLAlchemy runs on a StaticPool."""
+    url = make_url(flask_app.config["SQLALCHEMY_DATABASE_URI"])
+    options = dict(flask_app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        for key in POOL_SIZING_OPTIONS:
+            options.pop(key, None)
+    flask_app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+def _install_sqlite_pragmas(flask_app):
+    engine = db.engine
+    pragmas = flask_app.config.get("SQLITE_PRAGMAS") or {}
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
@@ -1,7 +1,22 @@
+import os
+import time
 import click
 from flask import current_app
 from app import db
-from app.models import User, Player
+from app.models import Match, User, Player
+from app.services.aggregates import find_mvp_tally_drift, rebuild_mvp_tallies, rebuild_season_totals
+from app.services.bulk_import import (
+    DEFAULT_CHUNK_SIZE,
+    IMPORTERS,
+    ImportFileError,
+    detect_format,
+    read_records,
+    run_import,
+)
+from app.services.session_users import invalidate_session_user
+from app.services.standings import rebuild_standings
+from app.services.telegram_queue import DEFAULT_BATCH_SIZE, apply_queued_commands
+from app.services.versions import GLOBAL, bump_versions
 
 def register_cli(app):
     @app.cli.command("create-admin")
@@ -20,6 +35,7 @@ def register_cli(app):
 
         db.session.add(user)
         db.session.commit()
+        invalidate_session_user(user.id)
         click.echo("Admin user created.")
 
     @app.cli.command("smoke-matches")
@@ -32,3 +48,156 @@ def register_cli(app):
                 click.echo(f"OK: {target}")
             else:
                 click.echo(f"Missing: {target}")
+
+    @app.cli.command("rebuild-season-totals")
+    @click.option("--season-id", type=int, default=None, help="Only rebuild this season.")
+    def rebuild_season_totals_command(season_id):
+        """Recompute season player totals from match stats and MVP votes."""
+        rows = rebuild_season_totals(season_id)
+        bump_versions(GLOBAL)
+        db.session.commit()
+        click.echo(f"Season totals rebuilt ({rows} rows).")
+
+    @app.cli.command("rebuild-standings")
+    @click.option("--season-id", type=int, default=None, help="Only rebuild this season.")
+    def rebuild_standings_command(season_id):
+        """Recompute season standings (W/D/L, goals, form) from match results."""
+        rows = rebuild_standings(season_id)
+        bump_versions(GLOBAL)
+        db.session.commit()
+        click.echo(f"Season standings rebuilt ({rows} rows).")
+
+    @app.cli.command("check-mvp-tallies")
+    @click.option("--match-id", type=int, default=None, help="Only check this match.")
+    @click.option("--fix", is_flag=True, help="Rebuild the tallies from mvp_votes.")
+    def check_mvp_tallies_command(match_id, fix):
+        """Report MVP tallies that disagree with the recorded votes."""
+        drift = find_mvp_tally_drift(match_id)
+        for drift_match_id, player_id, expected, actual in drift:
+            click.echo(f"Match {drift_match_id}, player {player_id}: expected {expected}, found {actual}")
+        if not drift:
+            click.echo("MVP tallies match the recorded votes.")
+            return
+        if fix:
+            rows = rebuild_mvp_tallies(match_id)
+            # MVP wins in season_player_totals were derived from the drifted tallies.
+            season_ids = set(db.session.scalars(
+                db.select(Match.season_id)
+                .where(Match.id.in_({drift_match_id for drift_match_id, *_ in drift}))
+                .distinct()
+            ))
+            if len(season_ids) == 1:
+                rebuild_season_totals(season_ids.pop())
+            else:
+                rebuild_season_totals()
+            bump_versions(GLOBAL)
+            db.session.commit()
+            click.echo(f"MVP tallies rebuilt ({rows} rows), with the season totals they feed.")
+        else:
+            click.echo(f"{len(drift)} tallies drifted; rerun with --fix to rebuild them.")
+
+    @app.cli.command("telegram-worker")
+    @click.option("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Commands applied per transaction.")
+    @click.option("--interval", type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+    @click.option("--once", is_flag=True, help="Drain the queue once and exit.")
+    def telegram_worker_command(batch_size, interval, once):
+        """Apply queued Telegram commands (TELEGRAM_INGEST_MODE=queue)."""
+        total = 0
+        while True:
+            applied = apply_queued_commands(batch_size)
+            total += applied
+            if applied:
+                click.echo(f"Applied {applied} queued commands.")
+            elif once:
+                click.echo(f"Queue drained ({total} commands).")
+                return
+            else:
+                time.sleep(interval)
+
+    @app.cli.group("import")
+    def import_group():
+        """Bulk-load players, rosters, matches or stats from CSV or JSON files."""
+
+    def make_import_command(kind):
+        @import_group.command(kind, help=f"Import {kind} from a CSV or JSON (array or lines) file.")
+        @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+        @click.option("--format", "file_format", type=click.Choice(["csv", "json"]), default=None,
+                      help="File format (default: from the extension).")
+        @click.option("--chunk-size", type=click.IntRange(min=1), default=DEFAULT_CHUNK_SIZE,
+                      show_default=True, help="Rows per INSERT batch.")
+        @click.option("--skip-invalid", is_flag=True, help="Import the valid rows even if some fail.")
+        @click.option("--dry-run", is_flag=True, help="Validate and report, then roll back.")
+        @click.option("--max-errors", type=int, default=50, show_default=True, help="Row errors to print.")
+        def import_command(path, file_format, chunk_size, skip_invalid, dry_run, max_errors):
+            try:
+                file_format = file_format or detect_format(path)
+                with open(path, newline="", encoding="utf-8-sig") as handle:
+                    report = run_import(
+                        IMPORTERS[kind](),
+                        read_records(handle, file_format),
+                        chunk_size=chunk_size,
+                        skip_invalid=skip_invalid,
+                    )
+            except ImportFileError as exc:
+                db.session.rollback()
+                raise click.ClickException(str(exc))
+
+            for number, message in report.errors[:max_errors]:
+                click.echo(f"Row {number}: {message}", err=True)
+            if len(report.errors) > max_errors:
+                click.echo(f"... and {len(report.errors) - max_errors} more errors.", err=True)
+
+            if dry_run or (report.errors and not skip_invalid):
+                db.session.rollback()
+            else:
+                db.session.commit()
+            click.echo(
+                f"{report.rows} rows read in {report.seconds:.2f}s ({report.rows_per_second:.0f} rows/s), "
+                f"{len(report.errors)} invalid."
+            )
+            if dry_run:
+                click.echo("Dry run: nothing was written.")
+            elif report.errors and not skip_invalid:
+                raise click.ClickException("Nothing was imported; fix the rows above or pass --skip-invalid.")
+            else:
+                click.echo(f"Imported {report.imported} {kind} rows.")
+
+        return import_command
+
+    for kind in IMPORTERS:
+        make_import_command(kind)
+
+    @app.cli.command("bench")
+    @click.option("--database", type=click.Path(dir_okay=False), default=None,
+                  help="New SQLite file to seed (default: in memory).")
+    @click.option("--seasons", type=int, default=10, show_default=True)
+    @click.option("--players", type=int, default=500, show_default=True)
+    @click.option("--roster-size", type=int, default=30, show_default=True)
+    @click.option("--matches", "matches_per_season", type=int, default=20, show_default=True,
+                  help="Matches per season.")
+    @click.option("--iterations", type=int, default=50, show_default=True, help="Timed calls per scenario.")
+    @click.option("--seed", type=int, default=1, show_default=True)
+    @click.option("--scenario", "scenarios", multiple=True, help="Only run these scenarios (repeatable).")
+    def bench_command(database, seasons, players, roster_size, matches_per_season, iterations, seed, scenarios):
+        """Time the main routes on a generated league (never the app's own database)."""
+        from benchmarks.routes import SCENARIOS, run
+
+        unknown = [name for name in scenarios if name not in SCENARIOS]
+        if unknown:
+            raise click.BadParameter(
+                f"unknown scenario {', '.join(unknown)}; choose from {', '.join(SCENARIOS)}",
+                param_hint="--scenario",
+            )
+        if database and os.path.exists(database):
+            raise click.BadParameter(f"{database} already exists.", param_hint="--database")
+        run(
+            database=database,
+            scenarios=scenarios or None,
+            iterations=iterations,
+            seed=seed,
+            echo=click.echo,
+            seasons=seasons,
+            players=players,
+            roster_size=roster_size,
+            matches_per_season=matches_per_season,
+        )
@@ -1,7 +1,7 @@
 from datetime import datetime
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
-from app import db, login_manager
+from app import db
+from app.services.passwords import hash_password, verify_password
 
 def utcnow():
     return datetime.utcnow()
@@ -33,15 +33,15 @@ class User(UserMixin, db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=utcnow, onupdate=utcnow)
 
+    __table_args__ = (
+        db.Index("ix_users_player_id", "player_id"),
+    )
+
     def set_password(self, password: str):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
-
-@login_manager.user_loader
-def load_user(user_id):
-    return User.query.get(int(user_id))
+        return verify_password(self.password_hash, password)
 
 # ---------- Player ----------
 class Player(db.Model):
@@ -84,6 +84,8 @@ class Season(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("year", "term", "tournament_id", name="uq_season_year_term_tournament"),
+        db.Index("ix_seasons_is_active", "is_active"),
+        db.Index("ix_seasons_tournament_id", "tournament_id"),
     )
 
 # ---------- Season roster ----------
@@ -104,6 +106,11 @@ class RosterMembership(db.Model):
     season = db.relationship("Season")
     player = db.relationship("Player")
 
+    __table_args__ = (
+        db.Index("ix_roster_memberships_season_status_player", "season_id", "status", "player_id"),
+        db.Index("ix_roster_memberships_player_id", "player_id"),
+    )
+
 # ---------- Match ----------
 class Match(db.Model):
     __tablename__ = "matches"
@@ -126,6 +133,11 @@ class Match(db.Model):
 
     season = db.relationship("Season")
 
+    __table_args__ = (
+        db.Index("ix_matches_season_date_id", "season_id", "date", "id"),
+        db.Index("ix_matches_date_id", "date", "id"),
+    )
+
 # ---------- Match player stats ----------
 class MatchPlayerStat(db.Model):
     __tablename__ = "match_player_stats"
@@ -148,6 +160,7 @@ class MatchPlayerStat(db.Model):
     __table_args__ = (
         db.UniqueConstraint("match_id", "player_id", name="uq_match_player_stats"),
         db.CheckConstraint("red_cards >= 0", name="ck_match_player_stats_red_cards_nonneg"),
+        db.Index("ix_match_player_stats_player_id", "player_id"),
     )
 
 # ---------- MVP votes ----------
@@ -160,6 +173,7 @@ class MVPVote(db.Model):
     voted_player_id = db.Column(db.Integer, db.ForeignKey("players.id"), nullable=False)
 
     created_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow, onupdate=utcnow)
 
     match = db.relationship("Match")
     voter_player = db.relationship("Player", foreign_keys=[voter_player_id])
@@ -168,4 +182,182 @@ class MVPVote(db.Model):
     __table_args__ = (
         db.UniqueConstraint("match_id", "voter_player_id", name="uq_mvp_vote_match_voter"),
         db.CheckConstraint("voter_player_id != voted_player_id", name="ck_mvp_vote_no_self"),
+        db.Index("ix_mvp_votes_match_voted", "match_id", "voted_player_id"),
+        db.Index("ix_mvp_votes_voted_player_id", "voted_player_id"),
+    )
+
+# ---------- Season player totals ----------
+class SeasonPlayerTotal(db.Model):
+    """Per-season player aggregates maintained by app.services.aggregates."""
+
+    __tablename__ = "season_player_totals"
+
+    id = db.Column(db.Integer, primary_key=True)
+    season_id = db.Column(db.Integer, db.ForeignKey("seasons.id"), nullable=False)
+    player_id = db.Column(db.Integer, db.ForeignKey("players.id"), nullable=False)
+
+    games_played = db.Column(db.Integer, nullable=False, default=0)
+    goals = db.Column(db.Integer, nullable=False, default=0)
+    yellow_cards = db.Column(db.Integer, nullable=False, default=0)
+    red_cards = db.Column(db.Integer, nullable=False, default=0)
+    mvp_votes_received = db.Column(db.Integer, nullable=False, default=0)
+    mvp_wins = db.Column(db.Integer, nullable=False, default=0)  # matches topped, ties included
+
+    created_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow, onupdate=utcnow)
+
+    season = db.relationship("Season")
+    player = db.relationship("Player")
+
+    __table_args__ = (
+        db.UniqueConstraint("season_id", "player_id", name="uq_season_player_totals"),
+        db.Index("ix_season_player_totals_player_id", "player_id"),
+    )
+
+# ---------- Leaderboard totals ----------
+class LeaderboardTotal(db.Model):
+    """Player totals per leaderboard scope ("all" or "tournament:<id>").
+
+    Maintained alongside season_player_totals; each ranked column has a
+    ``(scope, column, player_id)`` index so top-k reads stop after k rows.
+    """
+
+    __tablename__ = "leaderboard_totals"
+
+    id = db.Column(db.Integer, primary_key=True)
+    scope = db.Column(db.String(32), nullable=False)
+    player_id = db.Column(db.Integer, db.ForeignKey("players.id"), nullable=False)
+
+    goals = db.Column(db.Integer, nullable=False, default=0)
+    yellow_cards = db.Column(db.Integer, nullable=False, default=0)
+    red_cards = db.Column(db.Integer, nullable=False, default=0)
+    cards = db.Column(db.Integer, nullable=False, default=0)  # yellow + red
+    mvp_votes_received = db.Column(db.Integer, nullable=False, default=0)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow, onupdate=utcnow)
+
+    player = db.relationship("Player")
+
+    __table_args__ = (
+        db.UniqueConstraint("scope", "player_id", name="uq_leaderboard_totals_scope_player"),
+        db.Index("ix_leaderboard_totals_goals", "scope", "goals", "player_id"),
+        db.Index("ix_leaderboard_totals_cards", "scope", "cards", "player_id"),
+        db.Index("ix_leaderboard_totals_mvp_votes", "scope", "mvp_votes_received", "player_id"),
+    )
+
+# ---------- Season standings ----------
+class SeasonStanding(db.Model):
+    """Per-season results record maintained by app.services.standings."""
+
+    __tablename__ = "season_standings"
+
+    id = db.Column(db.Integer, primary_key=True)
+    season_id = db.Column(db.Integer, db.ForeignKey("seasons.id"), nullable=False)
+
+    played = db.Column(db.Integer, nullable=False, default=0)
+    won = db.Column(db.Integer, nullable=False, default=0)
+    drawn = db.Column(db.Integer, nullable=False, default=0)
+    lost = db.Column(db.Integer, nullable=False, default=0)
+    goals_for = db.Column(db.Integer, nullable=False, default=0)
+    goals_against = db.Column(db.Integer, nullable=False, default=0)
+    form = db.Column(db.String(10), nullable=False, default="")  # recent results, oldest first: "WDLWW"
+
+    created_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow, onupdate=utcnow)
+
+    season = db.relationship("Season")
+
+    __table_args__ = (
+        db.UniqueConstraint("season_id", name="uq_season_standings_season"),
+    )
+
+    @property
+    def points(self):
+        return 3 * self.won + self.drawn
+
+    @property
+    def goal_difference(self):
+        return self.goals_for - self.goals_against
+
+# ---------- MVP tallies ----------
+class MVPTally(db.Model):
+    """Live MVP vote count per match and player, maintained alongside MVPVote."""
+
+    __tablename__ = "mvp_tallies"
+
+    id = db.Column(db.Integer, primary_key=True)
+    match_id = db.Column(db.Integer, db.ForeignKey("matches.id"), nullable=False)
+    player_id = db.Column(db.Integer, db.ForeignKey("players.id"), nullable=False)
+    votes = db.Column(db.Integer, nullable=False, default=0)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow, onupdate=utcnow)
+
+    match = db.relationship("Match")
+    player = db.relationship("Player")
+
+    __table_args__ = (
+        db.UniqueConstraint("match_id", "player_id", name="uq_mvp_tallies_match_player"),
+    )
+
+# ---------- Telegram ingest queue ----------
+class TelegramCommand(db.Model):
+    """A Telegram message waiting for, or already applied by, the ingest worker."""
+
+    __tablename__ = "telegram_commands"
+
+    id = db.Column(db.Integer, primary_key=True)
+    idempotency_key = db.Column(db.String(128), nullable=True)
+    telegram_user_id = db.Column(db.String(32), nullable=False)
+    text = db.Column(db.Text, nullable=False)
+    is_batch = db.Column(db.Boolean, nullable=False, default=False)
+
+    status = db.Column(db.String(20), nullable=False, default="queued")  # queued|applying|applied|partial|failed
+    claim_token = db.Column(db.String(32), nullable=True)
+    claimed_at = db.Column(db.DateTime, nullable=True)
+    response = db.Column(db.JSON, nullable=True)
+    response_status = db.Column(db.Integer, nullable=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+    applied_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.UniqueConstraint("idempotency_key", name="uq_telegram_commands_idempotency_key"),
+        db.Index("ix_telegram_commands_status_id", "status", "id"),
+    )
+
+# ---------- Telegram delivery dedup ----------
+class TelegramDelivery(db.Model):
+    """Response already sent for a webhook delivery, replayed on re-delivery."""
+
+    __tablename__ = "telegram_deliveries"
+
+    id = db.Column(db.Integer, primary_key=True)
+    idempotency_key = db.Column(db.String(128), nullable=False)
+    response = db.Column(db.JSON, nullable=False)
+    response_status = db.Column(db.Integer, nullable=False)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint("idempotency_key", name="uq_telegram_deliveries_idempotency_key"),
+        db.Index("ix_telegram_deliveries_created_at", "created_at"),
+    )
+
+# ---------- Resource versions ----------
+class ResourceVersion(db.Model):
+    """Write counter per cacheable resource ("match:12", "season:3", "global")."""
+
+    __tablename__ = "resource_versions"
+
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(64), nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow, onupdate=utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint("key", name="uq_resource_versions_key"),
     )
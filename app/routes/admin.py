@@ -1,4 +1,3 @@
-from datetime import date
 from flask import Blueprint, render_template, abort, request, redirect, url_for, flash
 from flask_login import login_required, current_user
 from app import db
@@ -9,13 +8,23 @@ from app.models import (
     RosterMembership,
     Match,
     MatchPlayerStat,
-    MVPVote,
+    MVPTally,
     User,
     utcnow,
 )
+from app.services.match_stats import StatFormError, parse_stats_form, save_match_stats
+from app.services.pagination import paginate_matches
+from app.services.season_cache import TERMS, invalidate_current_season
+from app.services.live_updates import queue_score_event
+from app.services.player_index import invalidate_player_index
+from app.services.profiling import endpoint_summaries
+from app.services.session_users import invalidate_session_user
+from app.services.standings import apply_result_change, result_snapshot
+from app.services.validation import ValidationError, parse_match_fields, parse_player_fields
+from app.services.versions import GLOBAL, bump_match, bump_versions, season_key
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
-TERMS = ["Winter", "Spring", "Summer", "Fall"]
+MATCH_WITH_SEASON = db.joinedload(Match.season).joinedload(Season.tournament)
 
 def require_admin():
     if not current_user.is_authenticated:
@@ -29,6 +38,12 @@ def index():
     require_admin()
     return render_template("admin/index.html")
 
+@admin_bp.route("/perf")
+@login_required
+def perf():
+    require_admin()
+    return render_template("admin/perf.html", endpoints=endpoint_summaries())
+
 @admin_bp.route("/tournaments", methods=["GET", "POST"])
 @login_required
 def tournaments():
@@ -92,11 +107,17 @@ def seasons():
             flash("Season already exists for that tournament and term.", "error")
         else:
             db.session.add(Season(year=year, term=term, tournament_id=tournament.id))
+            bump_versions(GLOBAL)
             db.session.commit()
+            invalidate_current_season()
             flash("Season created.", "success")
             return redirect(url_for("admin.seasons"))
 
-    seasons = Season.query.order_by(Season.year.desc(), Season.term.asc()).all()
+    seasons = (
+        Season.query.options(db.joinedload(Season.tournament))
+        .order_by(Season.year.desc(), Season.term.asc())
+        .all()
+    )
     return render_template(
         "admin/seasons.html",
         seasons=seasons,
@@ -114,7 +135,9 @@ def activate_season(season_id):
 
     Season.query.filter_by(is_active=True).update({Season.is_active: False})
     season.is_active = True
+    bump_versions(GLOBAL)
     db.session.commit()
+    invalidate_current_season()
     flash("Season activated.", "success")
     return redirect(url_for("admin.seasons"))
 
@@ -123,30 +146,18 @@ def activate_season(season_id):
 def players():
     require_admin()
     if request.method == "POST":
-        first_name = (request.form.get("first_name") or "").strip()
-        last_name = (request.form.get("last_name") or "").strip()
-        jersey_number_raw = (request.form.get("jersey_number") or "").strip()
-
-        jersey_number = None
-        if jersey_number_raw:
-            try:
-                jersey_number = int(jersey_number_raw)
-            except ValueError:
-                jersey_number = "invalid"
-
-        if not first_name or not last_name:
-            flash("First and last name are required.", "error")
-        elif jersey_number == "invalid":
-            flash("Jersey number must be a whole number.", "error")
-        else:
-            db.session.add(
-                Player(
-                    first_name=first_name,
-                    last_name=last_name,
-                    jersey_number=jersey_number,
-                )
+        try:
+            fields = parse_player_fields(
+                request.form.get("first_name"),
+                request.form.get("last_name"),
+                request.form.get("jersey_number"),
             )
+        except ValidationError as exc:
+            flash(str(exc), "error")
+        else:
+            db.session.add(Player(**fields))
             db.session.commit()
+            invalidate_player_index()
             flash("Player created.", "success")
             return redirect(url_for("admin.players"))
 
@@ -186,6 +197,7 @@ def create_player_user(player_id):
     user.set_password(password)
     db.session.add(user)
     db.session.commit()
+    invalidate_session_user(user.id)
     flash("Player user created.", "success")
     return redirect(url_for("admin.players"))
 
@@ -198,6 +210,9 @@ def deactivate_player(player_id):
         abort(404)
     player.is_active = False
     db.session.commit()
+    invalidate_player_index()
+    for (user_id,) in db.session.query(User.id).filter_by(player_id=player.id):
+        invalidate_session_user(user_id)
     flash("Player deactivated.", "success")
     return redirect(url_for("admin.players"))
 
@@ -205,7 +220,7 @@ def deactivate_player(player_id):
 @login_required
 def season_roster(season_id):
     require_admin()
-    season = db.session.get(Season, season_id)
+    season = db.session.get(Season, season_id, options=[db.joinedload(Season.tournament)])
     if not season:
         abort(404)
 
@@ -232,6 +247,7 @@ def season_roster(season_id):
                             player_id=player.id,
                         )
                     )
+                    bump_versions(season_key(season.id))
                     db.session.commit()
                     flash("Player added to roster.", "success")
                     return redirect(url_for("admin.season_roster", season_id=season.id))
@@ -249,6 +265,7 @@ def season_roster(season_id):
                 else:
                     active_membership.status = "inactive"
                     active_membership.left_at = utcnow()
+                    bump_versions(season_key(season.id))
                     db.session.commit()
                     flash("Player removed from roster.", "success")
                     return redirect(url_for("admin.season_roster", season_id=season.id))
@@ -256,12 +273,14 @@ def season_roster(season_id):
     active_memberships = (
         RosterMembership.query.filter_by(season_id=season.id, status="active")
         .join(Player)
+        .options(db.contains_eager(RosterMembership.player))
         .order_by(Player.last_name.asc(), Player.first_name.asc())
         .all()
     )
     inactive_memberships = (
         RosterMembership.query.filter_by(season_id=season.id, status="inactive")
         .join(Player)
+        .options(db.contains_eager(RosterMembership.player))
         .order_by(RosterMembership.left_at.desc())
         .all()
     )
@@ -284,48 +303,41 @@ def season_roster(season_id):
 @login_required
 def matches():
     require_admin()
-    seasons = Season.query.order_by(Season.year.desc(), Season.term.asc()).all()
+    seasons = (
+        Season.query.options(db.joinedload(Season.tournament))
+        .order_by(Season.year.desc(), Season.term.asc())
+        .all()
+    )
     active_season = Season.query.filter_by(is_active=True).first()
 
     if request.method == "POST":
         season_id_raw = (request.form.get("season_id") or "").strip()
-        date_raw = (request.form.get("date") or "").strip()
-        opponent = (request.form.get("opponent") or "").strip()
-        location = (request.form.get("location") or "").strip()
-
         try:
             season_id = int(season_id_raw)
         except ValueError:
             season_id = None
         season = db.session.get(Season, season_id) if season_id else None
-        try:
-            match_date = date.fromisoformat(date_raw) if date_raw else None
-        except ValueError:
-            match_date = None
-
         if not season:
             flash("Season is required.", "error")
-        elif not match_date:
-            flash("Match date is required.", "error")
-        elif not opponent:
-            flash("Opponent is required.", "error")
         else:
-            db.session.add(
-                Match(
-                    season_id=season.id,
-                    date=match_date,
-                    opponent=opponent,
-                    location=location or None,
+            try:
+                fields = parse_match_fields(
+                    request.form.get("date"),
+                    request.form.get("opponent"),
+                    request.form.get("location"),
                 )
-            )
-            db.session.commit()
-            flash("Match created.", "success")
-            return redirect(url_for("admin.matches"))
+            except ValidationError as exc:
+                flash(str(exc), "error")
+            else:
+                db.session.add(Match(season_id=season.id, **fields))
+                bump_versions(season_key(season.id))
+                db.session.commit()
+                flash("Match created.", "success")
+                return redirect(url_for("admin.matches"))
 
-    matches = (
-        Match.query.join(Season)
-        .order_by(Match.date.desc(), Match.id.desc())
-        .all()
+    matches = paginate_matches(
+        Match.query.join(Season).options(db.contains_eager(Match.season)),
+        request.args,
     )
     return render_template(
         "admin/matches.html",
@@ -345,45 +357,25 @@ def match_detail(match_id):
     if request.method == "POST":
         form_type = request.form.get("form")
         if form_type == "match":
-            date_raw = (request.form.get("date") or "").strip()
-            opponent = (request.form.get("opponent") or "").strip()
-            location = (request.form.get("location") or "").strip()
-            status = (request.form.get("status") or "").strip()
-            our_score_raw = (request.form.get("our_score") or "").strip()
-            their_score_raw = (request.form.get("their_score") or "").strip()
-            notes = (request.form.get("notes") or "").strip()
-
             try:
-                match_date = date.fromisoformat(date_raw) if date_raw else None
-            except ValueError:
-                match_date = None
-
-            try:
-                our_score = int(our_score_raw) if our_score_raw else 0
-            except ValueError:
-                our_score = None
-
-            try:
-                their_score = int(their_score_raw) if their_score_raw else 0
-            except ValueError:
-                their_score = None
-
-            if not match_date:
-                flash("Match date is required.", "error")
-            elif not opponent:
-                flash("Opponent is required.", "error")
-            elif status not in ["scheduled", "played", "cancelled"]:
-                flash("Status must be scheduled, played, or cancelled.", "error")
-            elif our_score is None or their_score is None:
-                flash("Scores must be whole numbers.", "error")
+                fields = parse_match_fields(
+                    request.form.get("date"),
+                    request.form.get("opponent"),
+                    request.form.get("location"),
+                    request.form.get("status"),
+                    request.form.get("our_score"),
+                    request.form.get("their_score"),
+                    request.form.get("notes"),
+                )
+            except ValidationError as exc:
+                flash(str(exc), "error")
             else:
-                match.date = match_date
-                match.opponent = opponent
-                match.location = location or None
-                match.status = status
-                match.our_score = our_score
-                match.their_score = their_score
-                match.notes = notes or None
+                before = result_snapshot(match)
+                for field, value in fields.items():
+                    setattr(match, field, value)
+                apply_result_change(match.season_id, before, result_snapshot(match))
+                bump_match(match)
+                queue_score_event(match)
                 db.session.commit()
                 flash("Match updated.", "success")
                 return redirect(url_for("admin.match_detail", match_id=match.id))
@@ -397,20 +389,25 @@ def match_detail(match_id):
 @login_required
 def match_stats(match_id):
     require_admin()
-    match = db.session.get(Match, match_id)
+    match = db.session.get(Match, match_id, options=[MATCH_WITH_SEASON])
     if not match:
         abort(404)
 
     roster_memberships = (
         RosterMembership.query.filter_by(season_id=match.season_id, status="active")
         .join(Player)
+        .options(db.contains_eager(RosterMembership.player))
         .order_by(Player.last_name.asc(), Player.first_name.asc())
         .all()
     )
     if roster_memberships:
         players = [membership.player for membership in roster_memberships]
     else:
-        players = Player.query.order_by(Player.last_name.asc(), Player.first_name.asc()).all()
+        players = (
+            Player.query.options(db.load_only(Player.id, Player.first_name, Player.last_name))
+            .order_by(Player.last_name.asc(), Player.first_name.asc())
+            .all()
+        )
 
     stats_by_player = {
         stat.player_id: stat
@@ -418,44 +415,14 @@ def match_stats(match_id):
     }
 
     if request.method == "POST":
-        for player in players:
-            played = request.form.get(f"played_{player.id}") == "on"
-            goals_raw = (request.form.get(f"goals_{player.id}") or "").strip()
-            yellow_raw = (request.form.get(f"yellow_{player.id}") or "").strip()
-            red_raw = (request.form.get(f"red_{player.id}") or "").strip()
-
-            try:
-                goals = int(goals_raw) if goals_raw else 0
-            except ValueError:
-                goals = None
-
-            try:
-                yellow_cards = int(yellow_raw) if yellow_raw else 0
-            except ValueError:
-                yellow_cards = None
-
-            try:
-                red_cards = int(red_raw) if red_raw else 0
-            except ValueError:
-                red_cards = None
-
-            if goals is None or yellow_cards is None or red_cards is None:
-                flash("Goals and cards must be whole numbers.", "error")
-                return redirect(url_for("admin.match_stats", match_id=match.id))
-            if goals < 0 or yellow_cards < 0 or red_cards < 0:
-                flash("Goals and cards must be zero or higher.", "error")
-                return redirect(url_for("admin.match_stats", match_id=match.id))
-
-            stat = stats_by_player.get(player.id)
-            if not stat:
-                stat = MatchPlayerStat(match_id=match.id, player_id=player.id)
-                db.session.add(stat)
-                stats_by_player[player.id] = stat
-            stat.played = played
-            stat.goals = goals
-            stat.yellow_cards = yellow_cards
-            stat.red_cards = red_cards
+        try:
+            rows = parse_stats_form(request.form, [player.id for player in players])
+        except StatFormError as exc:
+            flash(str(exc), "error")
+            return redirect(url_for("admin.match_stats", match_id=match.id))
 
+        if save_match_stats(match, rows, stats_by_player):
+            bump_match(match)
         db.session.commit()
         flash("Match stats updated.", "success")
         return redirect(url_for("admin.match_stats", match_id=match.id))
@@ -471,19 +438,15 @@ def match_stats(match_id):
 @login_required
 def match_mvp(match_id):
     require_admin()
-    match = db.session.get(Match, match_id)
+    match = db.session.get(Match, match_id, options=[MATCH_WITH_SEASON])
     if not match:
         abort(404)
 
     votes = (
-        db.session.query(
-            Player,
-            db.func.count(MVPVote.id).label("vote_count"),
-        )
-        .join(MVPVote, MVPVote.voted_player_id == Player.id)
-        .filter(MVPVote.match_id == match.id)
-        .group_by(Player.id)
-        .order_by(db.func.count(MVPVote.id).desc(), Player.last_name.asc())
+        db.session.query(Player, MVPTally.votes.label("vote_count"))
+        .join(MVPTally, MVPTally.player_id == Player.id)
+        .filter(MVPTally.match_id == match.id, MVPTally.votes > 0)
+        .order_by(MVPTally.votes.desc(), Player.last_name.asc())
         .all()
     )
 
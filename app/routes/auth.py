@@ -2,6 +2,8 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_user, logout_user, login_required
 from app.models import User
 from app import db
+from app.services.passwords import PasswordCheckBusy, needs_rehash
+from app.services.session_users import invalidate_session_user
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
@@ -12,10 +14,24 @@ def login():
         password = request.form.get("password") or ""
 
         user = User.query.filter_by(username=username, is_active=True).first()
-        if not user or not user.check_password(password):
+        try:
+            valid = user is not None and user.check_password(password)
+        except PasswordCheckBusy:
+            flash("Too many sign-ins right now. Please try again in a moment.", "error")
+            return render_template("auth/login.html"), 503
+        if not valid:
             flash("Invalid username or password", "error")
             return render_template("auth/login.html")
 
+        if needs_rehash(user.password_hash):
+            try:
+                user.set_password(password)
+                db.session.commit()
+            except PasswordCheckBusy:
+                pass  # keep the old hash; it is upgraded on a later login
+
+        # Start the new session from the database, not a snapshot cached before it.
+        invalidate_session_user(user.id)
         login_user(user)
         return redirect(url_for("admin.index"))
 
@@ -1,39 +1,66 @@
-from flask import Blueprint, render_template, abort, request, redirect, url_for, flash
+import csv
+import io
+import json
+import time
+from flask import Blueprint, Response, current_app, jsonify, make_response, render_template, abort, request, redirect, session, url_for, flash, stream_with_context
 from flask_login import login_required, current_user
 from app import db
-from app.models import Season, Match, RosterMembership, Player, MatchPlayerStat, MVPVote
+from app.models import Season, Match, RosterMembership, Player, MatchPlayerStat, MVPVote, MVPTally, SeasonPlayerTotal, Tournament
+from app.services.aggregates import TOTAL_FIELDS, apply_vote_change
+from app.services.fragment_cache import render_fragment
+from app.services.http_cache import make_etag, not_modified, with_validators
+from app.services.leaderboards import METRICS, parse_k, top_players
+from app.services.live_updates import format_event, get_broker, queue_tally_event
+from app.services.pagination import paginate_matches
+from app.services.season_cache import get_current_season, term_rank
+from app.services.standings import FORM_LENGTH, get_standing
+from app.services.versions import GLOBAL, bump_match, get_versions, match_key, season_key
 
 matches_bp = Blueprint("matches", __name__)
-TERMS = ["Winter", "Spring", "Summer", "Fall"]
-TERM_ORDER = {term: index for index, term in enumerate(TERMS)}
-
-def get_active_or_latest_season():
-    active = Season.query.filter_by(is_active=True).first()
-    if active:
-        return active
-    seasons = Season.query.all()
-    if not seasons:
-        return None
-    seasons.sort(key=lambda season: (season.year, TERM_ORDER.get(season.term, -1)))
-    return seasons[-1]
+matches_bp.add_app_template_global(render_fragment, "fragment")
+MATCH_WITH_SEASON = db.joinedload(Match.season).joinedload(Season.tournament)
+EXPORT_FIELDS = (
+    "player_id",
+    "first_name",
+    "last_name",
+    "games_played",
+    "goals",
+    "yellow_cards",
+    "red_cards",
+    "mvp_votes_received",
+)
+EXPORT_CHUNK_SIZE = 500
+RECONNECT_DELAY_MS = 3000
 
 @matches_bp.route("/matches")
 @login_required
 def list_matches():
-    season = get_active_or_latest_season()
-    matches = []
+    season = get_current_season()
+    etag, cached, versions = _cached_page(season_key(season.id) if season else None)
+    if cached:
+        return cached
+
+    matches = None
+    card_versions = {}
     if season:
-        matches = (
-            Match.query.filter_by(season_id=season.id)
-            .order_by(Match.date.desc(), Match.id.desc())
-            .all()
-        )
-    return render_template("matches/list.html", season=season, matches=matches)
+        matches = paginate_matches(Match.query.filter_by(season_id=season.id), request.args)
+        card_versions = _card_versions(matches, versions[GLOBAL])
+    return _page(
+        etag,
+        "matches/list.html",
+        season=season,
+        matches=matches,
+        card_versions=card_versions,
+    )
 
 @matches_bp.route("/matches/<int:match_id>")
 @login_required
 def detail(match_id):
-    match = db.session.get(Match, match_id)
+    etag, cached, _ = _cached_page(match_key(match_id))
+    if cached:
+        return cached
+
+    match = db.session.get(Match, match_id, options=[MATCH_WITH_SEASON])
     if not match:
         abort(404)
 
@@ -45,131 +72,215 @@ def detail(match_id):
             match_id=match.id,
             player_id=voter_player_id,
         ).first()
-        current_vote = MVPVote.query.filter_by(
-            match_id=match.id,
-            voter_player_id=voter_player_id,
-        ).first()
+        current_vote = (
+            MVPVote.query.options(db.joinedload(MVPVote.voted_player))
+            .filter_by(match_id=match.id, voter_player_id=voter_player_id)
+            .first()
+        )
 
     mvp_results = []
     if match.status == "played":
         mvp_results = (
-            db.session.query(
-                Player,
-                db.func.count(MVPVote.id).label("vote_count"),
-            )
-            .join(MVPVote, MVPVote.voted_player_id == Player.id)
-            .filter(MVPVote.match_id == match.id)
-            .group_by(Player.id)
+            db.session.query(Player, MVPTally.votes.label("vote_count"))
+            .join(MVPTally, MVPTally.player_id == Player.id)
+            .filter(MVPTally.match_id == match.id, MVPTally.votes > 0)
             .order_by(
-                db.func.count(MVPVote.id).desc(),
+                MVPTally.votes.desc(),
                 Player.last_name.asc(),
                 Player.first_name.asc(),
             )
             .all()
         )
 
-    return render_template(
+    return _page(
+        etag,
         "matches/detail.html",
         match=match,
         my_stat=my_stat,
         current_vote=current_vote,
         mvp_results=mvp_results,
         voter_player_id=voter_player_id,
+        # Read after the queries: events up to here are already in the page.
+        live_sequence=get_broker().sequence(match.id),
     )
 
+@matches_bp.route("/matches/<int:match_id>/events")
+@login_required
+def match_events(match_id):
+    """Server-sent events with the match's score/status and MVP tally changes."""
+    if not db.session.query(Match.id).filter_by(id=match_id).first():
+        abort(404)
+    broker = get_broker()
+    heartbeat = current_app.config.get("LIVE_STREAM_HEARTBEAT", 15)
+    deadline = time.monotonic() + current_app.config.get("LIVE_STREAM_MAX_SECONDS", 300)
+    last_seen = request.headers.get("Last-Event-ID", type=int)
+
+    # Runs after the request context is gone, so no DB connection stays
+    # checked out while the stream is open; it only reads the broker.
+    def stream():
+        channel = broker.subscribe(match_id)
+        # An id ahead of the channel comes from before a restart: start from now.
+        seen = channel.sequence if last_seen is None else min(last_seen, channel.sequence)
+        try:
+            yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+            while time.monotonic() < deadline:
+                events = broker.wait(channel, seen, heartbeat)
+                if not events:
+                    yield ": keep-alive\n\n"
+                for sequence, kind, data in events:
+                    seen = sequence
+                    yield format_event(sequence, kind, data)
+        finally:
+            broker.unsubscribe(match_id, channel)
+
+    response = Response(stream(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
 @matches_bp.route("/seasons/<int:season_id>/stats")
 @login_required
 def season_stats(season_id):
-    season = db.session.get(Season, season_id)
+    season = db.session.get(Season, season_id, options=[db.joinedload(Season.tournament)])
     if not season:
         abort(404)
+    _require_season_access(season.id)
+    stats_version_key = season_key(season.id)
+    etag, cached, versions = _cached_page(stats_version_key)
+    if cached:
+        return cached
 
-    is_admin = getattr(current_user, "role", None) == "admin"
-    voter_player_id = getattr(current_user, "player_id", None)
-    if not is_admin:
-        if not voter_player_id:
-            abort(403)
-        membership = RosterMembership.query.filter_by(
-            season_id=season.id,
-            player_id=voter_player_id,
-        ).first()
-        if not membership:
-            abort(403)
+    stats = _season_totals_query(season.id, Player).all()
+    matches = paginate_matches(Match.query.filter_by(season_id=season.id), request.args)
+    match_count = Match.query.filter_by(season_id=season.id).count()
 
-    roster_player_ids = (
-        db.session.query(RosterMembership.player_id)
-        .filter_by(season_id=season.id)
-        .distinct()
-        .subquery()
+    return _page(
+        etag,
+        "seasons/stats.html",
+        season=season,
+        stats=stats,
+        matches=matches,
+        match_count=match_count,
+        stats_version_key=stats_version_key,
+        stats_version=(versions[GLOBAL], versions[stats_version_key]),
     )
 
-    stats_subquery = (
-        db.session.query(
-            MatchPlayerStat.player_id.label("player_id"),
-            db.func.sum(
-                db.case(
-                    (MatchPlayerStat.played.is_(True), 1),
-                    else_=0,
-                )
-            ).label("games_played"),
-            db.func.coalesce(db.func.sum(MatchPlayerStat.goals), 0).label("goals"),
-            db.func.coalesce(db.func.sum(MatchPlayerStat.yellow_cards), 0).label("yellow_cards"),
-            db.func.coalesce(db.func.sum(MatchPlayerStat.red_cards), 0).label("red_cards"),
-        )
-        .join(Match, db.and_(
-            Match.id == MatchPlayerStat.match_id,
-            Match.season_id == season.id,
-        ))
-        .group_by(MatchPlayerStat.player_id)
-        .subquery()
-    )
+@matches_bp.route("/seasons/<int:season_id>/standings")
+@login_required
+def season_standings(season_id):
+    season = db.session.get(Season, season_id, options=[db.joinedload(Season.tournament)])
+    if not season:
+        abort(404)
+    _require_season_access(season.id)
+    etag, cached, _ = _cached_page(season_key(season.id))
+    if cached:
+        return cached
 
-    votes_subquery = (
-        db.session.query(
-            MVPVote.voted_player_id.label("player_id"),
-            db.func.count(MVPVote.id).label("mvp_votes_received"),
-        )
-        .join(Match, db.and_(
-            Match.id == MVPVote.match_id,
-            Match.season_id == season.id,
-        ))
-        .group_by(MVPVote.voted_player_id)
-        .subquery()
+    return _page(
+        etag,
+        "seasons/standings.html",
+        season=season,
+        standing=get_standing(season.id),
+        form_length=FORM_LENGTH,
     )
 
-    stats = (
-        db.session.query(
-            Player,
-            db.func.coalesce(stats_subquery.c.games_played, 0).label("games_played"),
-            db.func.coalesce(stats_subquery.c.goals, 0).label("goals"),
-            db.func.coalesce(stats_subquery.c.yellow_cards, 0).label("yellow_cards"),
-            db.func.coalesce(stats_subquery.c.red_cards, 0).label("red_cards"),
-            db.func.coalesce(votes_subquery.c.mvp_votes_received, 0).label("mvp_votes_received"),
-        )
-        .join(roster_player_ids, roster_player_ids.c.player_id == Player.id)
-        .outerjoin(stats_subquery, stats_subquery.c.player_id == Player.id)
-        .outerjoin(votes_subquery, votes_subquery.c.player_id == Player.id)
-        .order_by(
-            db.func.coalesce(stats_subquery.c.goals, 0).desc(),
-            Player.last_name.asc(),
-            Player.first_name.asc(),
-        )
-        .all()
+@matches_bp.route("/seasons/<int:season_id>/stats.<any(csv, json):export_format>")
+@login_required
+def season_stats_export(season_id, export_format):
+    season = db.session.get(Season, season_id)
+    if not season:
+        abort(404)
+    _require_season_access(season.id)
+
+    version, last_modified = _season_stats_version(season.id)
+    etag = make_etag("season-stats", season.id, export_format, *version)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+
+    rows = _season_totals_query(
+        season.id,
+        Player.id.label("player_id"),
+        Player.first_name,
+        Player.last_name,
+    ).yield_per(EXPORT_CHUNK_SIZE)
+    if export_format == "csv":
+        body, mimetype = _csv_chunks(rows), "text/csv"
+    else:
+        body, mimetype = _json_chunks(season.id, rows), "application/json"
+
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename=season-{season.id}-stats.{export_format}"
     )
+    return with_validators(response, etag, last_modified)
 
-    matches = (
-        Match.query.filter_by(season_id=season.id)
-        .order_by(Match.date.desc(), Match.id.desc())
-        .all()
+@matches_bp.route("/players/<int:player_id>")
+@login_required
+def player_profile(player_id):
+    player = db.session.get(Player, player_id)
+    if not player:
+        abort(404)
+
+    seasons = (
+        SeasonPlayerTotal.query.filter_by(player_id=player.id)
+        .join(SeasonPlayerTotal.season)
+        .options(db.contains_eager(SeasonPlayerTotal.season).joinedload(Season.tournament))
+        .order_by(Season.year.desc(), term_rank().desc(), Season.id.desc())
+    )
+    visible_season_ids = _accessible_season_ids()
+    if visible_season_ids is not None:
+        seasons = seasons.filter(SeasonPlayerTotal.season_id.in_(visible_season_ids))
+    seasons = seasons.all()
+    career = {
+        field: sum(getattr(totals, field) for totals in seasons)
+        for field in TOTAL_FIELDS
+    }
+    return render_template(
+        "players/profile.html",
+        player=player,
+        seasons=seasons,
+        career=career,
     )
 
+@matches_bp.route("/leaderboards/<any(goals, mvp_votes, cards):metric>")
+@login_required
+def leaderboard(metric):
+    tournament_id, tournament_ids = _leaderboard_tournaments()
+    k = parse_k(request.args.get("k"))
+    tournaments = Tournament.query.order_by(Tournament.name.asc())
+    if tournament_ids is not None:
+        tournaments = tournaments.filter(Tournament.id.in_(tournament_ids))
     return render_template(
-        "seasons/stats.html",
-        season=season,
-        stats=stats,
-        matches=matches,
+        "leaderboards/top.html",
+        metric=metric,
+        metrics=METRICS,
+        title=METRICS[metric][0],
+        tournaments=tournaments.all(),
+        tournament_id=tournament_id,
+        k=k,
+        rows=top_players(metric, tournament_id, k, tournament_ids),
     )
 
+@matches_bp.route("/leaderboards/<any(goals, mvp_votes, cards):metric>.json")
+@login_required
+def leaderboard_json(metric):
+    tournament_id, tournament_ids = _leaderboard_tournaments()
+    rows = top_players(metric, tournament_id, parse_k(request.args.get("k")), tournament_ids)
+    return jsonify({
+        "metric": metric,
+        "tournament_id": tournament_id,
+        "players": [
+            {
+                "player_id": player.id,
+                "first_name": player.first_name,
+                "last_name": player.last_name,
+                "value": value,
+            }
+            for player, value in rows
+        ],
+    })
+
 @matches_bp.route("/matches/<int:match_id>/vote", methods=["GET", "POST"])
 @login_required
 def vote(match_id):
@@ -180,6 +291,7 @@ def vote(match_id):
     roster_memberships = (
         RosterMembership.query.filter_by(season_id=match.season_id, status="active")
         .join(Player)
+        .options(db.contains_eager(RosterMembership.player))
         .order_by(Player.last_name.asc(), Player.first_name.asc())
         .all()
     )
@@ -208,6 +320,7 @@ def vote(match_id):
                 match_id=match.id,
                 voter_player_id=voter_player_id,
             ).first()
+            previous_voted_player_id = vote_record.voted_player_id if vote_record else None
             if not vote_record:
                 vote_record = MVPVote(
                     match_id=match.id,
@@ -217,6 +330,17 @@ def vote(match_id):
                 db.session.add(vote_record)
             else:
                 vote_record.voted_player_id = voted_player.id
+            apply_vote_change(match.id, match.season_id, previous_voted_player_id, voted_player.id)
+            bump_match(match)
+            if previous_voted_player_id != voted_player.id:
+                deltas = [{
+                    "player_id": voted_player.id,
+                    "delta": 1,
+                    "name": f"{voted_player.last_name}, {voted_player.first_name}",
+                }]
+                if previous_voted_player_id:
+                    deltas.append({"player_id": previous_voted_player_id, "delta": -1})
+                queue_tally_event(match.id, deltas)
             db.session.commit()
             flash("Your vote has been recorded.", "success")
             return redirect(url_for("matches.list_matches"))
@@ -232,3 +356,147 @@ def vote(match_id):
         eligible_players=eligible_players,
         current_vote=current_vote,
     )
+
+def _cached_page(key):
+    """Return ``(etag, response, versions)`` for a page showing ``key``'s resource.
+
+    The ETag is built from the write counters and their keys (one indexed
+    lookup), the user the page is rendered for and the full path, so
+    pagination cursors and a switch of the current season vary it too. ``response`` is a 304 when the client's copy is current,
+    else None; pages with pending flash messages are always rendered so
+    the messages get shown. ``versions`` maps the counters read to their
+    values for keying cached fragments.
+    """
+    keys = [GLOBAL, key] if key else [GLOBAL]
+    versions = get_versions(*keys)
+    etag = make_etag(
+        request.full_path,
+        current_user.get_id(),
+        getattr(current_user, "role", None),
+        getattr(current_user, "player_id", None),
+        *sorted(versions.items()),
+    )
+    if session.get("_flashes"):
+        return etag, None, versions
+    return etag, not_modified(etag), versions
+
+def _card_versions(matches, global_version):
+    """Map each match id to the ``(version_key, version)`` its cached card is keyed by."""
+    keys = {match.id: match_key(match.id) for match in matches}
+    versions = get_versions(*keys.values()) if keys else {}
+    return {
+        match_id: (key, (global_version, versions[key]))
+        for match_id, key in keys.items()
+    }
+
+def _page(etag, template, **context):
+    return with_validators(make_response(render_template(template, **context)), etag)
+
+def _require_season_access(season_id):
+    """Admins see every season; players only seasons they are rostered in."""
+    if getattr(current_user, "role", None) == "admin":
+        return
+    voter_player_id = getattr(current_user, "player_id", None)
+    if not voter_player_id:
+        abort(403)
+    membership = RosterMembership.query.filter_by(
+        season_id=season_id,
+        player_id=voter_player_id,
+    ).first()
+    if not membership:
+        abort(403)
+
+def _accessible_season_ids():
+    """Select of the season ids the user may see (as _require_season_access), None for admins."""
+    if getattr(current_user, "role", None) == "admin":
+        return None
+    voter_player_id = getattr(current_user, "player_id", None)
+    if not voter_player_id:
+        abort(403)
+    return db.select(RosterMembership.season_id).where(RosterMembership.player_id == voter_player_id)
+
+def _leaderboard_tournaments():
+    """Return ``(tournament_id, tournament_ids)`` for a leaderboard request.
+
+    ``tournament_ids`` lists the tournaments with a season the user may see
+    (None for admins); asking for any other tournament is a 404.
+    """
+    tournament_id = request.args.get("tournament_id", type=int)
+    season_ids = _accessible_season_ids()
+    if season_ids is None:
+        return tournament_id, None
+    tournament_ids = db.session.scalars(
+        db.select(Season.tournament_id).where(Season.id.in_(season_ids)).distinct()
+    ).all()
+    if tournament_id and tournament_id not in tournament_ids:
+        abort(404)
+    return tournament_id, tournament_ids
+
+def _season_totals_query(season_id, *entities):
+    """Rostered players with their season totals (zeros when none), most goals first."""
+    roster_player_ids = (
+        db.session.query(RosterMembership.player_id)
+        .filter_by(season_id=season_id)
+        .distinct()
+        .subquery()
+    )
+
+    return (
+        db.session.query(
+            *entities,
+            db.func.coalesce(SeasonPlayerTotal.games_played, 0).label("games_played"),
+            db.func.coalesce(SeasonPlayerTotal.goals, 0).label("goals"),
+            db.func.coalesce(SeasonPlayerTotal.yellow_cards, 0).label("yellow_cards"),
+            db.func.coalesce(SeasonPlayerTotal.red_cards, 0).label("red_cards"),
+            db.func.coalesce(SeasonPlayerTotal.mvp_votes_received, 0).label("mvp_votes_received"),
+        )
+        .join(roster_player_ids, roster_player_ids.c.player_id == Player.id)
+        .outerjoin(SeasonPlayerTotal, db.and_(
+            SeasonPlayerTotal.player_id == Player.id,
+            SeasonPlayerTotal.season_id == season_id,
+        ))
+        .order_by(
+            db.func.coalesce(SeasonPlayerTotal.goals, 0).desc(),
+            Player.last_name.asc(),
+            Player.first_name.asc(),
+        )
+    )
+
+def _season_stats_version(season_id):
+    """Return ``(version, last_modified)`` for a season's exported totals.
+
+    One round trip reads the newest stat, vote and roster change plus the
+    roster size (roster rows are only ever added or flagged inactive).
+    """
+    def newest(model, *criteria):
+        return db.select(db.func.max(model.updated_at)).where(*criteria).scalar_subquery()
+
+    in_season = db.select(Match.id).where(Match.season_id == season_id)
+    version = db.session.execute(db.select(
+        newest(MatchPlayerStat, MatchPlayerStat.match_id.in_(in_season)),
+        newest(MVPVote, MVPVote.match_id.in_(in_season)),
+        newest(RosterMembership, RosterMembership.season_id == season_id),
+        db.select(db.func.count(RosterMembership.id))
+        .where(RosterMembership.season_id == season_id)
+        .scalar_subquery(),
+    )).one()
+    last_modified = max((stamp for stamp in version[:3] if stamp is not None), default=None)
+    return tuple(version), last_modified
+
+def _csv_chunks(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def _json_chunks(season_id, rows):
+    yield f'{{"season_id": {season_id}, "players": ['
+    for count, row in enumerate(rows):
+        yield ("," if count else "") + json.dumps(dict(zip(EXPORT_FIELDS, row)))
+    yield "]}"
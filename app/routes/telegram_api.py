@@ -1,114 +1,117 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, url_for
 from app import db
-from app.models import Match, MatchPlayerStat, Player
-from app.services.telegram_commands import parse_command, CommandError
+from app.models import TelegramCommand
+from app.services.telegram_ingest import IngestError, apply_message, error_payload, validate_message
+from app.services.telegram_dedup import find_delivery, idempotency_key, record_delivery
+from app.services.telegram_queue import command_status, enqueue
 
 telegram_api_bp = Blueprint("telegram_api", __name__, url_prefix="/api/telegram")
 
 def _error(message, hint=None, status=400):
-    payload = {"ok": False, "error": message}
-    if hint:
-        payload["hint"] = hint
-    return jsonify(payload), status
+    return jsonify(error_payload(message, hint=hint)), status
 
-@telegram_api_bp.route("/admin", methods=["POST"])
-def admin_ingest():
+def _check_secret():
     secret = current_app.config.get("TELEGRAM_INGEST_SECRET")
     if not secret:
-        return _error("Server not configured for Telegram ingest.", status=500)
+        raise IngestError("Server not configured for Telegram ingest.", status=500)
 
     header_secret = request.headers.get("X-TELEGRAM_SECRET")
     if header_secret != secret:
-        return _error("Invalid secret.", status=401)
+        raise IngestError("Invalid secret.", status=401)
+
+def _authorized_payload():
+    """Check the shared secret and sender; return the JSON payload or raise IngestError."""
+    _check_secret()
 
     payload = request.get_json(silent=True) or {}
     telegram_user_id = payload.get("telegram_user_id")
     text = payload.get("text")
 
     if not telegram_user_id or not text:
-        return _error("Missing telegram_user_id or text.", hint="Provide telegram_user_id and text fields.")
+        raise IngestError("Missing telegram_user_id or text.", hint="Provide telegram_user_id and text fields.")
 
     admin_ids_raw = current_app.config.get("TELEGRAM_ADMIN_IDS", "")
     admin_ids = {item.strip() for item in admin_ids_raw.split(",") if item.strip()}
     if admin_ids and str(telegram_user_id) not in admin_ids:
-        return _error("User not authorized.", status=403)
+        raise IngestError("User not authorized.", status=403)
     if not admin_ids:
-        return _error("No TELEGRAM_ADMIN_IDS configured.", hint="Set TELEGRAM_ADMIN_IDS=123,456.", status=403)
+        raise IngestError("No TELEGRAM_ADMIN_IDS configured.", hint="Set TELEGRAM_ADMIN_IDS=123,456.", status=403)
+    return payload
+
+@telegram_api_bp.route("/admin", methods=["POST"])
+def admin_ingest():
+    try:
+        payload = _authorized_payload()
+    except IngestError as exc:
+        return _error(exc.message, hint=exc.hint, status=exc.status)
+    return _ingest(payload, batch=False)
 
+@telegram_api_bp.route("/admin/batch", methods=["POST"])
+def admin_ingest_batch():
+    try:
+        payload = _authorized_payload()
+    except IngestError as exc:
+        return _error(exc.message, hint=exc.hint, status=exc.status)
+    return _ingest(payload, batch=True)
+
+@telegram_api_bp.route("/commands/<int:command_id>")
+def command_detail(command_id):
+    try:
+        _check_secret()
+    except IngestError as exc:
+        return _error(exc.message, hint=exc.hint, status=exc.status)
+
+    command = db.session.get(TelegramCommand, command_id)
+    if not command:
+        return _error("Command not found.", status=404)
+    return jsonify(command_status(command))
+
+def _ingest(payload, batch):
+    key = idempotency_key(payload)
+    if current_app.config.get("TELEGRAM_INGEST_MODE") == "queue":
+        return _enqueue(payload, batch, key)
+
+    delivery = find_delivery(key)
+    if delivery:
+        return _replay(delivery)
+
+    response, status = apply_message(payload["text"], batch=batch)
+    if status != 200:
+        # Errors are not recorded, so a corrected retry of the update applies.
+        db.session.rollback()
+        return jsonify(response), status
+    record_delivery(key, response, status)
     try:
-        command = parse_command(text)
-    except CommandError as exc:
-        return _error(str(exc), hint="Use /match <id> score <home>-<away> [notes \"...\"] or /match <id> stats <player> goals=0 y=0 r=0 played=1")
-
-    match = db.session.get(Match, command["match_id"])
-    if not match:
-        return _error("Match not found.", status=404)
-
-    if command["type"] == "score":
-        match.our_score = command["home_score"]
-        match.their_score = command["away_score"]
-        if command["notes"] is not None:
-            match.notes = command["notes"]
         db.session.commit()
-        return jsonify({
-            "ok": True,
-            "message": f"Match {match.id} updated.",
-            "data": {
-                "match_id": match.id,
-                "score": f"{match.our_score}-{match.their_score}",
-                "notes": match.notes,
-            },
-        })
-
-    player = _resolve_player(command["player_identifier"])
-    if not player:
-        return _error("Player not found.", hint="Use full name or last name.")
-
-    stat = MatchPlayerStat.query.filter_by(match_id=match.id, player_id=player.id).first()
-    if not stat:
-        stat = MatchPlayerStat(match_id=match.id, player_id=player.id)
-        db.session.add(stat)
-
-    stat.played = command["played"]
-    stat.goals = command["goals"]
-    stat.yellow_cards = command["yellow_cards"]
-    stat.red_cards = command["red_cards"]
-    db.session.commit()
-
-    return jsonify({
-        "ok": True,
-        "message": f"Stats updated for {player.first_name} {player.last_name}.",
-        "data": {
-            "match_id": match.id,
-            "player_id": player.id,
-            "goals": stat.goals,
-            "yellow_cards": stat.yellow_cards,
-            "red_cards": stat.red_cards,
-            "played": stat.played,
-        },
-    })
-
-
-def _resolve_player(identifier: str):
-    normalized = identifier.strip().lower()
-    if not normalized:
-        return None
-
-    candidates = Player.query.all()
-    exact = []
-    for player in candidates:
-        full_name = f"{player.first_name} {player.last_name}".strip().lower()
-        if normalized == full_name or normalized == player.first_name.lower() or normalized == player.last_name.lower():
-            exact.append(player)
-
-    if len(exact) == 1:
-        return exact[0]
-    if len(exact) > 1:
-        return None
-
-    partial = [
-        player
-        for player in candidates
-        if normalized in f"{player.first_name} {player.last_name}".lower()
-    ]
-    return partial[0] if len(partial) == 1 else None
+    except db.exc.IntegrityError:
+        db.session.rollback()
+        # A concurrent delivery of the same update committed first: answer
+        # with its response. Any other conflict (e.g. a stat row inserted by
+        # another command) leaves nothing applied; the sender can retry.
+        delivery = find_delivery(key)
+        if delivery:
+            return _replay(delivery)
+        return _error("Conflicting update; nothing was applied.", hint="Retry the command.", status=409)
+    return jsonify(response), status
+
+def _replay(delivery):
+    return jsonify(delivery.response), delivery.response_status, {"Idempotent-Replayed": "true"}
+
+def _enqueue(payload, batch, key):
+    """Validate the message, queue it for the worker and answer 202 at once."""
+    text = payload["text"]
+    _, error = validate_message(text, batch=batch)
+    if error:
+        response, status = error
+        return jsonify(response), status
+
+    command, created = enqueue(
+        payload["telegram_user_id"],
+        text,
+        is_batch=batch,
+        key=key,
+    )
+    body = command_status(command)
+    body["duplicate"] = not created
+    body["status_url"] = url_for("telegram_api.command_detail", command_id=command.id)
+    return jsonify(body), 202
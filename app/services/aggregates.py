@@ -0,0 +1,328 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from app import db
+from app.models import (
+    LeaderboardTotal,
+    Match,
+    MatchPlayerStat,
+    MVPVote,
+    MVPTally,
+    Season,
+    SeasonPlayerTotal,
+    utcnow,
+)
+
+STAT_FIELDS = ("games_played", "goals", "yellow_cards", "red_cards")
+TOTAL_FIELDS = STAT_FIELDS + ("mvp_votes_received", "mvp_wins")
+LEADERBOARD_FIELDS = ("goals", "yellow_cards", "red_cards", "cards", "mvp_votes_received")
+ALL_TIME_SCOPE = "all"
+
+_UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+def tournament_scope(tournament_id):
+    return f"tournament:{tournament_id}"
+
+def dialect_insert():
+    """Return the dialect's ``insert`` construct with ON CONFLICT support, or None."""
+    return _UPSERT_INSERTS.get(db.engine.dialect.name)
+
+def stat_snapshot(stat):
+    """Return the counters a MatchPlayerStat contributes to its season totals."""
+    if stat is None:
+        return {}
+    return {
+        "games_played": 1 if stat.played else 0,
+        "goals": stat.goals or 0,
+        "yellow_cards": stat.yellow_cards or 0,
+        "red_cards": stat.red_cards or 0,
+    }
+
+def apply_stat_changes(season_id, changes):
+    """Fold ``(player_id, before, after)`` stat snapshots into season_player_totals.
+
+    ``before``/``after`` come from :func:`stat_snapshot`; the caller commits.
+    """
+    deltas = {}
+    for player_id, before, after in changes:
+        delta = deltas.setdefault(player_id, {})
+        for field in STAT_FIELDS:
+            delta[field] = delta.get(field, 0) + after.get(field, 0) - before.get(field, 0)
+    _increment_totals(season_id, deltas)
+
+def apply_vote_change(match_id, season_id, old_player_id, new_player_id):
+    """Move one MVP vote between players in mvp_tallies and season_player_totals.
+
+    The match's winners (every player tied on the most votes) are compared
+    before and after, and ``mvp_wins`` follows any change.
+    """
+    if old_player_id == new_player_id:
+        return
+    deltas = {}
+    if old_player_id:
+        deltas[old_player_id] = -1
+    if new_player_id:
+        deltas[new_player_id] = 1
+
+    winners_before = mvp_winners(match_id)
+    upsert_increments(
+        MVPTally,
+        ("match_id", "player_id"),
+        ("votes",),
+        [
+            {"match_id": match_id, "player_id": player_id, "votes": delta}
+            for player_id, delta in deltas.items()
+        ],
+    )
+    winners_after = mvp_winners(match_id)
+
+    totals = {player_id: {"mvp_votes_received": delta} for player_id, delta in deltas.items()}
+    for player_id in winners_after - winners_before:
+        totals.setdefault(player_id, {})["mvp_wins"] = 1
+    for player_id in winners_before - winners_after:
+        totals.setdefault(player_id, {})["mvp_wins"] = -1
+    _increment_totals(season_id, totals)
+
+def mvp_winners(match_id):
+    """Ids of the players tied on the most MVP votes for a match (empty with no votes)."""
+    top = (
+        db.select(db.func.max(MVPTally.votes))
+        .where(MVPTally.match_id == match_id)
+        .scalar_subquery()
+    )
+    return set(db.session.scalars(
+        db.select(MVPTally.player_id)
+        .where(MVPTally.match_id == match_id, MVPTally.votes > 0, MVPTally.votes == top)
+    ))
+
+def _increment_totals(season_id, deltas):
+    rows = []
+    for player_id, delta in deltas.items():
+        row = {"season_id": season_id, "player_id": player_id}
+        for field in TOTAL_FIELDS:
+            row[field] = delta.get(field, 0)
+        rows.append(row)
+    upsert_increments(SeasonPlayerTotal, ("season_id", "player_id"), TOTAL_FIELDS, rows)
+    _increment_leaderboards(season_id, deltas)
+
+def _increment_leaderboards(season_id, deltas):
+    """Apply the same deltas to the all-time and tournament leaderboard rows."""
+    scopes = (ALL_TIME_SCOPE, tournament_scope(db.session.get(Season, season_id).tournament_id))
+    rows = []
+    for player_id, delta in deltas.items():
+        row = {field: delta.get(field, 0) for field in LEADERBOARD_FIELDS if field != "cards"}
+        row["cards"] = row["yellow_cards"] + row["red_cards"]
+        for scope in scopes:
+            rows.append(dict(row, scope=scope, player_id=player_id))
+    upsert_increments(LeaderboardTotal, ("scope", "player_id"), LEADERBOARD_FIELDS, rows)
+
+def upsert_increments(model, key_fields, fields, rows):
+    """Add each row's ``fields`` onto the ``model`` row matching ``key_fields``.
+
+    Missing rows are inserted with the increments as their values. On SQLite
+    and PostgreSQL this is one INSERT ... ON CONFLICT DO UPDATE statement.
+    """
+    rows = [row for row in rows if any(row[field] for field in fields)]
+    if not rows:
+        return
+
+    now = utcnow()
+    make_insert = dialect_insert()
+    if make_insert is None:
+        for row in rows:
+            keys = {field: row[field] for field in key_fields}
+            record = model.query.filter_by(**keys).first()
+            if not record:
+                record = model(**keys)
+                for field in fields:
+                    setattr(record, field, 0)
+                db.session.add(record)
+            for field in fields:
+                setattr(record, field, getattr(record, field) + row[field])
+        return
+
+    table = model.__table__
+    stmt = make_insert(table)
+    set_ = {field: table.c[field] + stmt.excluded[field] for field in fields}
+    set_["updated_at"] = stmt.excluded.updated_at
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c[field] for field in key_fields],
+        set_=set_,
+    )
+    # Parameters go alongside the statement so its compiled form is cached
+    # and SQLAlchemy batches the rows into multi-row VALUES itself.
+    db.session.execute(stmt, [dict(row, created_at=now, updated_at=now) for row in rows])
+
+def rebuild_season_totals(season_id=None):
+    """Recompute season_player_totals from match_player_stats and mvp_votes.
+
+    Rebuilds one season when ``season_id`` is given, otherwise all of them,
+    then the leaderboards from the result. Returns the number of season rows
+    written; the caller commits.
+    """
+    zero = db.literal(0)
+    stats = (
+        db.select(
+            Match.season_id.label("season_id"),
+            MatchPlayerStat.player_id.label("player_id"),
+            db.case((MatchPlayerStat.played.is_(True), 1), else_=0).label("games_played"),
+            MatchPlayerStat.goals.label("goals"),
+            MatchPlayerStat.yellow_cards.label("yellow_cards"),
+            MatchPlayerStat.red_cards.label("red_cards"),
+            zero.label("mvp_votes_received"),
+            zero.label("mvp_wins"),
+        )
+        .select_from(MatchPlayerStat)
+        .join(Match, Match.id == MatchPlayerStat.match_id)
+    )
+    votes = (
+        db.select(
+            Match.season_id.label("season_id"),
+            MVPVote.voted_player_id.label("player_id"),
+            zero.label("games_played"),
+            zero.label("goals"),
+            zero.label("yellow_cards"),
+            zero.label("red_cards"),
+            db.literal(1).label("mvp_votes_received"),
+            zero.label("mvp_wins"),
+        )
+        .select_from(MVPVote)
+        .join(Match, Match.id == MVPVote.match_id)
+    )
+    tallies = _expected_tallies().subquery()
+    top = (
+        db.select(tallies.c.match_id, db.func.max(tallies.c.votes).label("votes"))
+        .group_by(tallies.c.match_id)
+        .subquery()
+    )
+    wins = (
+        db.select(
+            Match.season_id.label("season_id"),
+            tallies.c.player_id.label("player_id"),
+            zero.label("games_played"),
+            zero.label("goals"),
+            zero.label("yellow_cards"),
+            zero.label("red_cards"),
+            zero.label("mvp_votes_received"),
+            db.literal(1).label("mvp_wins"),
+        )
+        .select_from(tallies)
+        .join(top, db.and_(top.c.match_id == tallies.c.match_id, top.c.votes == tallies.c.votes))
+        .join(Match, Match.id == tallies.c.match_id)
+    )
+    delete = db.delete(SeasonPlayerTotal)
+    if season_id is not None:
+        stats = stats.where(Match.season_id == season_id)
+        votes = votes.where(Match.season_id == season_id)
+        wins = wins.where(Match.season_id == season_id)
+        delete = delete.where(SeasonPlayerTotal.season_id == season_id)
+
+    combined = db.union_all(stats, votes, wins).subquery()
+    now = db.literal(utcnow(), db.DateTime)
+    aggregate = (
+        db.select(
+            combined.c.season_id,
+            combined.c.player_id,
+            *[db.func.sum(combined.c[field]) for field in TOTAL_FIELDS],
+            now,
+            now,
+        )
+        .group_by(combined.c.season_id, combined.c.player_id)
+    )
+
+    db.session.execute(delete)
+    result = db.session.execute(
+        db.insert(SeasonPlayerTotal).from_select(
+            ["season_id", "player_id", *TOTAL_FIELDS, "created_at", "updated_at"],
+            aggregate,
+        )
+    )
+    rows = result.rowcount
+    rebuild_leaderboards()
+    return rows
+
+def rebuild_leaderboards():
+    """Recompute leaderboard_totals from season_player_totals; the caller commits."""
+    now = db.literal(utcnow(), db.DateTime)
+    sums = [
+        db.func.sum(SeasonPlayerTotal.goals),
+        db.func.sum(SeasonPlayerTotal.yellow_cards),
+        db.func.sum(SeasonPlayerTotal.red_cards),
+        db.func.sum(SeasonPlayerTotal.yellow_cards + SeasonPlayerTotal.red_cards),
+        db.func.sum(SeasonPlayerTotal.mvp_votes_received),
+        now,
+        now,
+    ]
+    all_time = (
+        db.select(db.literal(ALL_TIME_SCOPE), SeasonPlayerTotal.player_id, *sums)
+        .group_by(SeasonPlayerTotal.player_id)
+    )
+    per_tournament = (
+        db.select(
+            db.literal(tournament_scope("")) + db.cast(Season.tournament_id, db.String),
+            SeasonPlayerTotal.player_id,
+            *sums,
+        )
+        .join(Season, Season.id == SeasonPlayerTotal.season_id)
+        .group_by(Season.tournament_id, SeasonPlayerTotal.player_id)
+    )
+    columns = ["scope", "player_id", *LEADERBOARD_FIELDS, "created_at", "updated_at"]
+    db.session.execute(db.delete(LeaderboardTotal))
+    for select in (all_time, per_tournament):
+        db.session.execute(db.insert(LeaderboardTotal).from_select(columns, select))
+
+def _expected_tallies(match_id=None):
+    query = (
+        db.select(
+            MVPVote.match_id.label("match_id"),
+            MVPVote.voted_player_id.label("player_id"),
+            db.func.count(MVPVote.id).label("votes"),
+        )
+        .group_by(MVPVote.match_id, MVPVote.voted_player_id)
+    )
+    if match_id is not None:
+        query = query.where(MVPVote.match_id == match_id)
+    return query
+
+def rebuild_mvp_tallies(match_id=None):
+    """Recompute mvp_tallies from mvp_votes; returns rows written, caller commits."""
+    delete = db.delete(MVPTally)
+    if match_id is not None:
+        delete = delete.where(MVPTally.match_id == match_id)
+    expected = _expected_tallies(match_id).subquery()
+    now = db.literal(utcnow(), db.DateTime)
+
+    db.session.execute(delete)
+    result = db.session.execute(
+        db.insert(MVPTally).from_select(
+            ["match_id", "player_id", "votes", "created_at", "updated_at"],
+            db.select(expected.c.match_id, expected.c.player_id, expected.c.votes, now, now),
+        )
+    )
+    return result.rowcount
+
+def find_mvp_tally_drift(match_id=None):
+    """Compare mvp_tallies with a fresh count of mvp_votes.
+
+    Returns ``(match_id, player_id, expected, actual)`` for every mismatch.
+    """
+    expected = {
+        (row.match_id, row.player_id): row.votes
+        for row in db.session.execute(_expected_tallies(match_id))
+    }
+    tallies = db.select(MVPTally.match_id, MVPTally.player_id, MVPTally.votes)
+    if match_id is not None:
+        tallies = tallies.where(MVPTally.match_id == match_id)
+    actual = {
+        (row.match_id, row.player_id): row.votes
+        for row in db.session.execute(tallies)
+    }
+
+    drift = []
+    for key in sorted(set(expected) | set(actual)):
+        want = expected.get(key, 0)
+        have = actual.get(key, 0)
+        if want != have:
+            drift.append((key[0], key[1], want, have))
+    return drift
@@ -0,0 +1,404 @@
+import csv
+import json
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from app import db
+from app.models import Match, Player, RosterMembership, Season, Tournament
+from app.services.aggregates import rebuild_season_totals
+from app.services.match_stats import parse_stat_row, upsert_stat_rows
+from app.services.player_index import invalidate_player_index, normalize
+from app.services.standings import rebuild_standings
+from app.services.validation import (
+    ValidationError,
+    clean_text,
+    parse_match_fields,
+    parse_player_fields,
+)
+from app.services.versions import GLOBAL, bump_versions, season_key
+
+DEFAULT_CHUNK_SIZE = 1000
+READ_SIZE = 1 << 16
+MAX_RECORD_SIZE = 1 << 20
+FORMATS = {".csv": "csv", ".json": "json", ".jsonl": "json", ".ndjson": "json"}
+TRUE_VALUES = {"1", "on", "true", "yes", "y", "x"}
+FALSE_VALUES = {"0", "off", "false", "no", "n"}
+_PARTIAL_TOKEN_RE = re.compile(r"[-+.0-9eE]*|[A-Za-z]*")
+
+class ImportFileError(ValueError):
+    pass
+
+@dataclass
+class ImportReport:
+    kind: str
+    rows: int = 0
+    imported: int = 0
+    seconds: float = 0.0
+    errors: list = field(default_factory=list)  # (row number, message)
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+def detect_format(path):
+    file_format = FORMATS.get(os.path.splitext(path)[1].lower())
+    if file_format is None:
+        raise ImportFileError(f"Cannot tell the format of {path}; pass --format csv or json.")
+    return file_format
+
+def read_records(handle, file_format):
+    """Yield one dict per CSV line or JSON object without loading the whole file."""
+    if file_format == "csv":
+        reader = csv.DictReader(handle)
+        reader.fieldnames = [clean_text(name).lower() for name in reader.fieldnames or []]
+        return reader
+    return json_records(handle)
+
+def json_records(handle, read_size=READ_SIZE, max_record_size=MAX_RECORD_SIZE):
+    """Stream the values of a top-level JSON array or of JSON Lines.
+
+    Values are decoded one at a time from a sliding buffer, so memory
+    follows the largest record rather than the file. A malformed record
+    fails as soon as it is read, and a record that is still incomplete
+    after ``max_record_size`` characters fails too.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    exhausted = False
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,[]":
+            position += 1
+        if position < len(buffer):
+            try:
+                record, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as exc:
+                if exhausted or not _may_be_truncated(exc):
+                    raise ImportFileError(f"Invalid JSON: {exc}")
+                if len(buffer) - position > max_record_size:
+                    raise ImportFileError(f"Invalid JSON: a record is longer than {max_record_size} characters.")
+            else:
+                yield record
+                continue
+        if exhausted:
+            return
+        chunk = handle.read(read_size)
+        exhausted = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+def _may_be_truncated(exc):
+    """Whether more input could still turn this decode error into a record.
+
+    Running out of input shows up as an error at the end of the buffer, in
+    an unterminated string or \\u escape, or in a number or literal cut short.
+    """
+    if exc.msg.startswith(("Unterminated string", "Invalid \\uXXXX")):
+        return True
+    return _PARTIAL_TOKEN_RE.fullmatch(exc.doc, exc.pos) is not None
+
+def parse_flag(value, default=True):
+    raw = clean_text(value).lower()
+    if not raw:
+        return default
+    if raw in TRUE_VALUES:
+        return True
+    if raw in FALSE_VALUES:
+        return False
+    raise ValidationError(f"'{value}' is not a yes/no value.")
+
+def parse_id(value, label):
+    raw = clean_text(value)
+    if not raw:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValidationError(f"{label} must be a whole number.")
+
+class Lookups:
+    """Names and keys preloaded once per import, so rows resolve without queries."""
+
+    def __init__(self):
+        self._players = None
+        self._seasons = None
+        self._matches = None
+        self._rosters = None
+
+    @property
+    def players(self):
+        if self._players is None:
+            self._players = {"ids": {}, "names": {}}
+            for player_id, first_name, last_name, is_active in db.session.execute(
+                db.select(Player.id, Player.first_name, Player.last_name, Player.is_active)
+            ):
+                self._players["ids"][player_id] = is_active
+                name = normalize(f"{first_name} {last_name}")
+                self._players["names"].setdefault(name, []).append(player_id)
+        return self._players
+
+    @property
+    def seasons(self):
+        if self._seasons is None:
+            self._seasons = {"ids": set(), "keys": {}}
+            for season_id, year, term, tournament in db.session.execute(
+                db.select(Season.id, Season.year, Season.term, Tournament.name)
+                .join(Tournament, Tournament.id == Season.tournament_id)
+            ):
+                self._seasons["ids"].add(season_id)
+                self._seasons["keys"][(normalize(tournament), year, normalize(term))] = season_id
+        return self._seasons
+
+    @property
+    def matches(self):
+        if self._matches is None:
+            self._matches = {"ids": {}, "keys": {}}
+            for match_id, season_id, match_date, opponent in db.session.execute(
+                db.select(Match.id, Match.season_id, Match.date, Match.opponent)
+            ):
+                self._matches["ids"][match_id] = season_id
+                key = (season_id, match_date, normalize(opponent))
+                self._matches["keys"].setdefault(key, []).append(match_id)
+        return self._matches
+
+    @property
+    def rosters(self):
+        """Active ``(season_id, player_id)`` pairs."""
+        if self._rosters is None:
+            self._rosters = {
+                (season_id, player_id)
+                for season_id, player_id in db.session.execute(
+                    db.select(RosterMembership.season_id, RosterMembership.player_id)
+                    .where(RosterMembership.status == "active")
+                )
+            }
+        return self._rosters
+
+    def player_id(self, record):
+        """Resolve ``player_id``, ``player`` ("First Last") or first/last name columns."""
+        player_id = parse_id(record.get("player_id"), "Player id")
+        if player_id is not None:
+            if player_id not in self.players["ids"]:
+                raise ValidationError(f"Unknown player id {player_id}.")
+            return player_id
+        name = clean_text(record.get("player")) or " ".join(
+            clean_text(record.get(column)) for column in ("first_name", "last_name")
+        )
+        if not clean_text(name):
+            raise ValidationError("Player is required.")
+        found = self.players["names"].get(normalize(name), [])
+        if not found:
+            raise ValidationError(f"Unknown player '{clean_text(name)}'.")
+        if len(found) > 1:
+            raise ValidationError(f"'{clean_text(name)}' matches {len(found)} players; use player_id.")
+        return found[0]
+
+    def season_id(self, record):
+        """Resolve ``season_id`` or the tournament/year/term columns."""
+        season_id = parse_id(record.get("season_id"), "Season id")
+        if season_id is not None:
+            if season_id not in self.seasons["ids"]:
+                raise ValidationError(f"Unknown season id {season_id}.")
+            return season_id
+        tournament = clean_text(record.get("tournament"))
+        term = clean_text(record.get("term"))
+        year = parse_id(record.get("year"), "Season year")
+        if not tournament or not term or year is None:
+            raise ValidationError("Season is required.")
+        season_id = self.seasons["keys"].get((normalize(tournament), year, normalize(term)))
+        if season_id is None:
+            raise ValidationError(f"Unknown season {tournament} {term} {year}.")
+        return season_id
+
+    def match_id(self, record):
+        """Resolve ``match_id`` or the season columns plus date and opponent."""
+        match_id = parse_id(record.get("match_id"), "Match id")
+        if match_id is not None:
+            if match_id not in self.matches["ids"]:
+                raise ValidationError(f"Unknown match id {match_id}.")
+            return match_id
+        season_id = self.season_id(record)
+        fields = parse_match_fields(record.get("date"), record.get("opponent"))
+        found = self.matches["keys"].get((season_id, fields["date"], normalize(fields["opponent"])), [])
+        if not found:
+            raise ValidationError(f"No match against {fields['opponent']} on {fields['date']}.")
+        if len(found) > 1:
+            raise ValidationError(f"{len(found)} matches against {fields['opponent']} that day; use match_id.")
+        return found[0]
+
+class Importer(ABC):
+    """Turns records into row dicts (``prepare``) and writes them in chunks.
+
+    ``prepare`` raises ValidationError for a bad row; ``finish`` refreshes
+    whatever is derived from the imported rows. The caller commits.
+    """
+
+    kind = None
+    model = None
+
+    def __init__(self, lookups=None):
+        self.lookups = lookups or Lookups()
+
+    @abstractmethod
+    def prepare(self, record):
+        """Return the row dict to insert for ``record``."""
+
+    def write(self, rows):
+        db.session.execute(db.insert(self.model), rows)
+
+    def finish(self):
+        pass
+
+class PlayerImporter(Importer):
+    kind = "players"
+    model = Player
+
+    def prepare(self, record):
+        return parse_player_fields(
+            record.get("first_name"),
+            record.get("last_name"),
+            record.get("jersey_number"),
+        )
+
+    def finish(self):
+        invalidate_player_index()
+
+class RosterImporter(Importer):
+    kind = "rosters"
+    model = RosterMembership
+
+    def __init__(self, lookups=None):
+        super().__init__(lookups)
+        self.season_ids = set()
+
+    def prepare(self, record):
+        season_id = self.lookups.season_id(record)
+        player_id = self.lookups.player_id(record)
+        if not self.lookups.players["ids"][player_id]:
+            raise ValidationError("Player is required.")
+        if (season_id, player_id) in self.lookups.rosters:
+            raise ValidationError("Player is already active on this roster.")
+        self.lookups.rosters.add((season_id, player_id))
+        self.season_ids.add(season_id)
+        return {"season_id": season_id, "player_id": player_id}
+
+    def finish(self):
+        if self.season_ids:
+            bump_versions(*[season_key(season_id) for season_id in self.season_ids])
+
+class MatchImporter(Importer):
+    kind = "matches"
+    model = Match
+
+    def __init__(self, lookups=None):
+        super().__init__(lookups)
+        self.season_ids = set()
+
+    def prepare(self, record):
+        season_id = self.lookups.season_id(record)
+        fields = parse_match_fields(
+            record.get("date"),
+            record.get("opponent"),
+            record.get("location"),
+            clean_text(record.get("status")) or "scheduled",
+            record.get("our_score"),
+            record.get("their_score"),
+            record.get("notes"),
+        )
+        self.season_ids.add(season_id)
+        return dict(fields, season_id=season_id)
+
+    def finish(self):
+        for season_id in self.season_ids:
+            rebuild_standings(season_id)
+        if self.season_ids:
+            bump_versions(GLOBAL)
+
+class StatImporter(Importer):
+    """Match sheet lines; a row for an existing (match, player) overwrites it."""
+
+    kind = "stats"
+
+    def __init__(self, lookups=None):
+        super().__init__(lookups)
+        self.season_ids = set()
+        self._seen = set()
+        self._rostered_seasons = None
+
+    def prepare(self, record):
+        match_id = self.lookups.match_id(record)
+        player_id = self.lookups.player_id(record)
+        season_id = self.lookups.matches["ids"][match_id]
+        if self._rostered_seasons is None:
+            self._rostered_seasons = {season for season, _ in self.lookups.rosters}
+        # Same players the admin sheet offers: the active roster, if the season has one.
+        if season_id in self._rostered_seasons and (season_id, player_id) not in self.lookups.rosters:
+            raise ValidationError("Player is not on this season's roster.")
+        row = parse_stat_row(
+            parse_flag(record.get("played")),
+            record.get("goals"),
+            record.get("yellow_cards"),
+            record.get("red_cards"),
+        )
+        if (match_id, player_id) in self._seen:
+            raise ValidationError("Duplicate row for this match and player.")
+        self._seen.add((match_id, player_id))
+        self.season_ids.add(season_id)
+        return dict(row, match_id=match_id, player_id=player_id)
+
+    def write(self, rows):
+        upsert_stat_rows(rows)
+
+    def finish(self):
+        # One set-based rebuild beats folding every row into the totals.
+        if len(self.season_ids) == 1:
+            rebuild_season_totals(next(iter(self.season_ids)))
+        elif self.season_ids:
+            rebuild_season_totals()
+        if self.season_ids:
+            bump_versions(GLOBAL)
+
+IMPORTERS = {
+    importer.kind: importer
+    for importer in (PlayerImporter, RosterImporter, MatchImporter, StatImporter)
+}
+
+def run_import(importer, records, chunk_size=DEFAULT_CHUNK_SIZE, skip_invalid=False):
+    """Validate ``records`` and insert the good ones in ``chunk_size`` batches.
+
+    Every batch is one executemany inside the session's transaction. Unless
+    ``skip_invalid`` is set, nothing is written once a row has failed (the
+    rest are still checked, so the report lists every bad row). Returns an
+    :class:`ImportReport`; the caller commits or rolls back.
+    """
+    report = ImportReport(importer.kind)
+    started = time.perf_counter()
+    batch = []
+    for number, record in enumerate(records, start=1):
+        report.rows += 1
+        try:
+            if not isinstance(record, dict):
+                raise ValidationError("Row must be an object.")
+            row = importer.prepare(record)
+        except ValidationError as exc:
+            report.errors.append((number, str(exc)))
+            continue
+        if report.errors and not skip_invalid:
+            continue
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            importer.write(batch)
+            report.imported += len(batch)
+            batch = []
+    if report.errors and not skip_invalid:
+        report.imported = 0
+    else:
+        if batch:
+            importer.write(batch)
+            report.imported += len(batch)
+        if report.imported:
+            importer.finish()
+    report.seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,102 @@
+import sys
+import threading
+from collections import OrderedDict
+from flask import current_app, render_template
+from markupsafe import Markup
+
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+
+class FragmentCache:
+    """Size-capped LRU of rendered HTML fragments.
+
+    Keys are ``(template, version_key, entity_id, version)``; ``version_key``
+    is the resource_versions key the fragment depends on, so a write that
+    bumps it makes older entries unreachable and :meth:`invalidate` frees
+    them at once instead of waiting for eviction.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._by_version_key = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, html):
+        cost = sys.getsizeof(html)
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (html, cost)
+            self._by_version_key.setdefault(key[1], set()).add(key)
+            self.size += cost
+            while self.size > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate(self, *version_keys):
+        with self._lock:
+            for version_key in version_keys:
+                for key in list(self._by_version_key.get(version_key, ())):
+                    self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_version_key.clear()
+            self.size = 0
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= entry[1]
+        keys = self._by_version_key.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_version_key[key[1]]
+
+def get_fragment_cache():
+    cache = current_app.extensions.get("fragment_cache")
+    if cache is None:
+        max_bytes = current_app.config.get("FRAGMENT_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+        cache = current_app.extensions.setdefault("fragment_cache", FragmentCache(max_bytes))
+    return cache
+
+def render_fragment(template, version_key, version, entity_id=None, **context):
+    """Render ``template`` once per (template, entity, version) and reuse the HTML.
+
+    The fragment must only depend on ``context`` and on data covered by
+    ``version_key``; anything user-specific belongs outside it. A cap of
+    0 in FRAGMENT_CACHE_MAX_BYTES turns caching off.
+    """
+    cache = get_fragment_cache()
+    key = (template, version_key, entity_id, version)
+    html = cache.get(key)
+    if html is None:
+        html = render_template(template, **context)
+        cache.put(key, html)
+    return Markup(html)
+
+def invalidate_fragments(*version_keys):
+    """Drop this process's fragments for ``version_keys`` (other workers miss on version)."""
+    cache = current_app.extensions.get("fragment_cache")
+    if cache is not None:
+        cache.invalidate(*version_keys)
+
+def clear_fragments():
+    cache = current_app.extensions.get("fragment_cache")
+    if cache is not None:
+        cache.clear()
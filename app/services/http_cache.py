@@ -0,0 +1,38 @@
+import hashlib
+from datetime import timezone
+from flask import request, Response
+
+def make_etag(*parts):
+    """Opaque validator for a resource version built from ``parts``."""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def _http_date(value):
+    # Stored timestamps are naive UTC; HTTP dates have whole-second precision.
+    return value.replace(tzinfo=timezone.utc, microsecond=0) if value else None
+
+def not_modified(etag, last_modified=None):
+    """Return a 304 response when the request's validators still match, else None.
+
+    Call this before running the queries that build the page, so a repeat
+    view costs only the version lookup.
+    """
+    last_modified = _http_date(last_modified)
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(etag)
+    elif last_modified and request.if_modified_since:
+        fresh = last_modified <= request.if_modified_since
+    else:
+        fresh = False
+    if not fresh:
+        return None
+    return with_validators(Response(status=304), etag, last_modified)
+
+def with_validators(response, etag, last_modified=None):
+    """Attach ETag/Last-Modified and ask clients to revalidate on every view."""
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = _http_date(last_modified)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
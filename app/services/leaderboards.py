@@ -0,0 +1,57 @@
+from app import db
+from app.models import LeaderboardTotal, Player
+from app.services.aggregates import ALL_TIME_SCOPE, tournament_scope
+
+METRICS = {
+    "goals": ("Top scorers", LeaderboardTotal.goals),
+    "mvp_votes": ("Most MVP votes", LeaderboardTotal.mvp_votes_received),
+    "cards": ("Most cards", LeaderboardTotal.cards),
+}
+DEFAULT_K = 10
+MAX_K = 50
+
+def parse_k(raw, default=DEFAULT_K):
+    try:
+        k = int(raw) if raw else default
+    except ValueError:
+        k = default
+    return max(1, min(k, MAX_K))
+
+def top_players(metric, tournament_id=None, k=DEFAULT_K, tournament_ids=None):
+    """Return up to ``k`` ``(player, value)`` pairs, highest first, all-time or per tournament.
+
+    The ``(scope, <metric>, player_id)`` index is walked backwards, so the
+    query reads k rows however many seasons and players there are. Ties
+    are broken by newest player first, the index order. Passing
+    ``tournament_ids`` builds the all-time board from those tournaments'
+    rows only, for users who may not see every tournament.
+    """
+    _, column = METRICS[metric]
+    if tournament_ids is not None and not tournament_id:
+        return _top_players_in(column, tournament_ids, k)
+    scope = tournament_scope(tournament_id) if tournament_id else ALL_TIME_SCOPE
+    return (
+        db.session.query(Player, column.label("value"))
+        .select_from(LeaderboardTotal)
+        .join(Player, Player.id == LeaderboardTotal.player_id)
+        .filter(LeaderboardTotal.scope == scope, column > 0)
+        .order_by(column.desc(), LeaderboardTotal.player_id.desc())
+        .limit(min(k, MAX_K))
+        .all()
+    )
+
+def _top_players_in(column, tournament_ids, k):
+    if not tournament_ids:
+        return []
+    value = db.func.sum(column).label("value")
+    return (
+        db.session.query(Player, value)
+        .select_from(LeaderboardTotal)
+        .join(Player, Player.id == LeaderboardTotal.player_id)
+        .filter(LeaderboardTotal.scope.in_([tournament_scope(tournament_id) for tournament_id in tournament_ids]))
+        .group_by(Player.id)
+        .having(value > 0)
+        .order_by(value.desc(), Player.id.desc())
+        .limit(min(k, MAX_K))
+        .all()
+    )
@@ -0,0 +1,116 @@
+import json
+import threading
+from collections import deque
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from app import db
+
+DEFAULT_BACKLOG = 50
+
+class MatchChannel:
+    """Recent events for one match plus a condition its subscribers wait on.
+
+    Subscribers hold no queue of their own, just the last sequence number
+    they sent, so an idle subscriber costs a thread parked on the condition
+    and publishing is one append and notify_all however many are waiting.
+    """
+
+    def __init__(self, backlog):
+        self.events = deque(maxlen=backlog)
+        self.sequence = 0
+        self.subscribers = 0
+        self.condition = threading.Condition()
+
+    def since(self, last_seen):
+        return [item for item in self.events if item[0] > last_seen]
+
+class LiveBroker:
+    """In-process fan-out of committed match events to SSE subscribers.
+
+    Only subscribers in the same process see an event; channels exist
+    while somebody is subscribed. A match's sequence numbers carry over
+    from one channel to the next, so a client reconnecting with
+    Last-Event-ID after the last subscriber left still gets new events.
+    """
+
+    def __init__(self, backlog=DEFAULT_BACKLOG):
+        self.backlog = backlog
+        self._channels = {}
+        self._sequences = {}  # last sequence of matches with no open channel
+        self._lock = threading.Lock()
+
+    def subscribe(self, match_id):
+        with self._lock:
+            channel = self._channels.get(match_id)
+            if channel is None:
+                channel = self._channels[match_id] = MatchChannel(self.backlog)
+                channel.sequence = self._sequences.pop(match_id, 0)
+            channel.subscribers += 1
+            return channel
+
+    def unsubscribe(self, match_id, channel):
+        with self._lock:
+            channel.subscribers -= 1
+            if channel.subscribers <= 0 and self._channels.get(match_id) is channel:
+                del self._channels[match_id]
+                self._sequences[match_id] = channel.sequence
+
+    def sequence(self, match_id):
+        """Id of the last event published for ``match_id``."""
+        with self._lock:
+            channel = self._channels.get(match_id)
+            return channel.sequence if channel is not None else self._sequences.get(match_id, 0)
+
+    def publish(self, match_id, kind, data):
+        channel = self._channels.get(match_id)
+        if channel is None:
+            return
+        with channel.condition:
+            channel.sequence += 1
+            channel.events.append((channel.sequence, kind, data))
+            channel.condition.notify_all()
+
+    def wait(self, channel, last_seen, timeout):
+        """Return events after ``last_seen``, blocking up to ``timeout`` seconds for one."""
+        with channel.condition:
+            channel.condition.wait_for(lambda: channel.sequence > last_seen, timeout=timeout)
+            return channel.since(last_seen)
+
+def get_broker():
+    broker = current_app.extensions.get("live_updates")
+    if broker is None:
+        backlog = current_app.config.get("LIVE_UPDATES_BACKLOG", DEFAULT_BACKLOG)
+        broker = current_app.extensions.setdefault("live_updates", LiveBroker(backlog))
+    return broker
+
+def format_event(sequence, kind, data):
+    return f"id: {sequence}\nevent: {kind}\ndata: {json.dumps(data)}\n\n"
+
+def queue_event(match_id, kind, data):
+    """Publish an event for ``match_id`` once the current transaction commits."""
+    db.session.info.setdefault("live_events", []).append((match_id, kind, data))
+
+def queue_score_event(match):
+    queue_event(match.id, "score", {
+        "match_id": match.id,
+        "our_score": match.our_score,
+        "their_score": match.their_score,
+        "status": match.status,
+    })
+
+def queue_tally_event(match_id, deltas):
+    """``deltas`` is a list of ``{"player_id", "delta", "name"}`` vote changes."""
+    queue_event(match_id, "tally", {"match_id": match_id, "deltas": deltas})
+
+@event.listens_for(db.session, "after_commit")
+def _publish_committed(session):
+    events = session.info.pop("live_events", None)
+    if not events or not has_app_context():
+        return
+    broker = get_broker()
+    for match_id, kind, data in events:
+        broker.publish(match_id, kind, data)
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _drop_rolled_back(session, previous_transaction):
+    session.info.pop("live_events", None)
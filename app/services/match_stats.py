@@ -0,0 +1,101 @@
+from app import db
+from app.models import MatchPlayerStat, utcnow
+from app.services.aggregates import apply_stat_changes, dialect_insert, stat_snapshot
+from app.services.validation import ValidationError, clean_text
+
+STAT_FIELDS = ("played", "goals", "yellow_cards", "red_cards")
+COUNT_FIELDS = ("goals", "yellow_cards", "red_cards")
+COUNT_INPUTS = (("goals", "goals"), ("yellow_cards", "yellow"), ("red_cards", "red"))
+
+class StatFormError(ValidationError):
+    pass
+
+def parse_stats_form(form, player_ids):
+    """Validate a match sheet and return ``{player_id: {field: value}}``.
+
+    Every player is checked before anything is written, so a bad value
+    anywhere on the sheet leaves the stored stats untouched.
+    """
+    rows = {}
+    for player_id in player_ids:
+        rows[player_id] = parse_stat_row(
+            form.get(f"played_{player_id}") == "on",
+            *[form.get(f"{prefix}_{player_id}") for _, prefix in COUNT_INPUTS],
+        )
+    return rows
+
+def parse_stat_row(played, goals, yellow_cards, red_cards):
+    """Validate one player's line; blank counts are 0."""
+    row = {"played": played}
+    for field, raw in zip(COUNT_FIELDS, (goals, yellow_cards, red_cards)):
+        raw = clean_text(raw)
+        try:
+            row[field] = int(raw) if raw else 0
+        except ValueError:
+            raise StatFormError("Goals and cards must be whole numbers.")
+        if row[field] < 0:
+            raise StatFormError("Goals and cards must be zero or higher.")
+    return row
+
+def save_match_stats(match, rows, existing):
+    """Write changed rows for ``match`` and fold them into the season totals.
+
+    ``existing`` maps player ids to the match's current MatchPlayerStat rows.
+    Unchanged players are skipped; the rest go out as a single
+    INSERT ... ON CONFLICT (match_id, player_id) DO UPDATE statement.
+    Returns the number of rows written; the caller commits.
+    """
+    values = []
+    changes = []
+    for player_id, row in rows.items():
+        stat = existing.get(player_id)
+        if stat is not None and all(getattr(stat, field) == row[field] for field in STAT_FIELDS):
+            continue
+        values.append(dict(row, match_id=match.id, player_id=player_id))
+        changes.append((player_id, stat_snapshot(stat), _snapshot(row)))
+    if not values:
+        return 0
+
+    upsert_stat_rows(values, existing)
+    apply_stat_changes(match.season_id, changes)
+    return len(values)
+
+def upsert_stat_rows(values, existing=None):
+    """Insert or overwrite MatchPlayerStat rows keyed on (match_id, player_id).
+
+    ``values`` are dicts with the match and player ids plus every stat
+    field. Without ON CONFLICT support rows are looked up one at a time;
+    ``existing`` maps player ids to rows already loaded for a single match.
+    """
+    make_insert = dialect_insert()
+    if make_insert is None:
+        for row in values:
+            stat = (existing or {}).get(row["player_id"])
+            if stat is None:
+                stat = MatchPlayerStat.query.filter_by(
+                    match_id=row["match_id"],
+                    player_id=row["player_id"],
+                ).first()
+            if stat is None:
+                stat = MatchPlayerStat(match_id=row["match_id"], player_id=row["player_id"])
+                db.session.add(stat)
+            for field in STAT_FIELDS:
+                setattr(stat, field, row[field])
+        return
+
+    now = utcnow()
+    table = MatchPlayerStat.__table__
+    stmt = make_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.match_id, table.c.player_id],
+        set_={field: stmt.excluded[field] for field in STAT_FIELDS + ("updated_at",)},
+    )
+    db.session.execute(stmt, [dict(row, created_at=now, updated_at=now) for row in values])
+
+def _snapshot(row):
+    return {
+        "games_played": 1 if row["played"] else 0,
+        "goals": row["goals"],
+        "yellow_cards": row["yellow_cards"],
+        "red_cards": row["red_cards"],
+    }
@@ -0,0 +1,74 @@
+from datetime import date
+from app import db
+from app.models import Match
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+class MatchPage:
+    """One page of matches, newest first, with opaque cursors for the neighbours."""
+
+    def __init__(self, items, next_cursor=None, prev_cursor=None, per_page=DEFAULT_PAGE_SIZE):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.per_page = per_page
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+def encode_cursor(match):
+    return f"{match.date.isoformat()}.{match.id}"
+
+def decode_cursor(raw):
+    """Parse a ``YYYY-MM-DD.<id>`` cursor; invalid cursors are treated as absent."""
+    if not raw:
+        return None
+    date_raw, _, id_raw = raw.partition(".")
+    try:
+        return date.fromisoformat(date_raw), int(id_raw)
+    except ValueError:
+        return None
+
+def parse_page_size(raw, default=DEFAULT_PAGE_SIZE):
+    try:
+        per_page = int(raw) if raw else default
+    except ValueError:
+        per_page = default
+    return max(1, min(per_page, MAX_PAGE_SIZE))
+
+def paginate_matches(query, args, default_size=DEFAULT_PAGE_SIZE):
+    """Keyset-paginate a Match query over ``(date, id)`` descending.
+
+    ``args`` is the request's query string: ``after`` pages to older matches,
+    ``before`` to newer ones and ``per_page`` is capped at MAX_PAGE_SIZE.
+    Each page costs one indexed range scan regardless of how deep it is.
+    """
+    per_page = parse_page_size(args.get("per_page"), default_size)
+    after = decode_cursor(args.get("after"))
+    before = None if after else decode_cursor(args.get("before"))
+    key = db.tuple_(Match.date, Match.id)
+
+    if before:
+        query = query.filter(key > before).order_by(Match.date.asc(), Match.id.asc())
+    else:
+        if after:
+            query = query.filter(key < after)
+        query = query.order_by(Match.date.desc(), Match.id.desc())
+
+    items = query.limit(per_page + 1).all()
+    has_more = len(items) > per_page
+    items = items[:per_page]
+    if before:
+        items.reverse()
+
+    next_cursor = prev_cursor = None
+    if items:
+        if has_more or before:
+            next_cursor = encode_cursor(items[-1])
+        if after or (before and has_more):
+            prev_cursor = encode_cursor(items[0])
+    return MatchPage(items, next_cursor=next_cursor, prev_cursor=prev_cursor, per_page=per_page)
@@ -0,0 +1,60 @@
+import os
+import threading
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = "scrypt:32768:8:1"
+DEFAULT_SALT_LENGTH = 16
+DEFAULT_WAIT_SECONDS = 10
+
+class PasswordCheckBusy(Exception):
+    """Raised when no hashing slot frees up within PASSWORD_CHECK_WAIT seconds."""
+
+_state_lock = threading.Lock()
+
+def _state():
+    """Per-app limiter and normalized hash prefix, created on first use."""
+    state = current_app.extensions.get("passwords")
+    if state is None:
+        with _state_lock:
+            state = current_app.extensions.get("passwords")
+            if state is None:
+                config = current_app.config
+                concurrency = config.get("PASSWORD_CHECK_CONCURRENCY") or os.cpu_count() or 1
+                state = {"limiter": threading.BoundedSemaphore(concurrency), "prefix": None}
+                current_app.extensions["passwords"] = state
+    return state
+
+def _limited(func, *args):
+    """Run a CPU-bound hashing call once a slot is free, so login bursts
+    cannot occupy every worker thread at once."""
+    limiter = _state()["limiter"]
+    wait = current_app.config.get("PASSWORD_CHECK_WAIT", DEFAULT_WAIT_SECONDS)
+    if not limiter.acquire(timeout=wait):
+        raise PasswordCheckBusy()
+    try:
+        return func(*args)
+    finally:
+        limiter.release()
+
+def _method():
+    return current_app.config.get("PASSWORD_HASH_METHOD", DEFAULT_METHOD)
+
+def _generate(password):
+    salt_length = current_app.config.get("PASSWORD_SALT_LENGTH", DEFAULT_SALT_LENGTH)
+    return generate_password_hash(password, method=_method(), salt_length=salt_length)
+
+def hash_password(password):
+    return _limited(_generate, password)
+
+def verify_password(password_hash, password):
+    return _limited(check_password_hash, password_hash, password)
+
+def needs_rehash(password_hash):
+    """True when ``password_hash`` was made with a method or cost other than the configured one."""
+    state = _state()
+    if state["prefix"] is None:
+        # Werkzeug fills in defaults ("pbkdf2" -> "pbkdf2:sha256:600000"), so
+        # take the prefix from a real hash rather than the config string.
+        state["prefix"] = generate_password_hash("", method=_method(), salt_length=1).split("$", 1)[0]
+    return password_hash.split("$", 1)[0] != state["prefix"]
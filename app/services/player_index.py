@@ -0,0 +1,143 @@
+import threading
+from flask import current_app
+from app import db
+from app.models import Player, RosterMembership
+
+GRAM_SIZES = (1, 2, 3)
+
+def normalize(text: str) -> str:
+    return text.strip().lower()
+
+class PlayerNameIndex:
+    """In-memory lookup of players by full, first or last name.
+
+    Exact names live in a dict; partial (substring) lookups go through an
+    n-gram posting list so the candidate set does not depend on how many
+    players exist in total. Only ids and names are stored, never ORM objects.
+    """
+
+    def __init__(self, rows):
+        self.names = {}
+        self._exact = {}
+        self._grams = {}
+        for player_id, first_name, last_name in rows:
+            self.add(player_id, first_name, last_name)
+
+    def add(self, player_id, first_name, last_name):
+        full_name = f"{first_name} {last_name}".lower()
+        self.names[player_id] = full_name
+        keys = {full_name.strip(), first_name.lower(), last_name.lower()}
+        for key in keys:
+            self._exact.setdefault(key, []).append(player_id)
+        grams = {
+            full_name[start:start + size]
+            for size in GRAM_SIZES
+            for start in range(len(full_name) - size + 1)
+        }
+        for gram in grams:
+            self._grams.setdefault(gram, []).append(player_id)
+
+    def exact(self, normalized):
+        return self._exact.get(normalized, [])
+
+    def partial(self, normalized, limit=2):
+        """Return up to ``limit`` ids whose full name contains ``normalized``."""
+        if not normalized:
+            return []
+        size = min(len(normalized), GRAM_SIZES[-1])
+        postings = []
+        for start in range(len(normalized) - size + 1):
+            posting = self._grams.get(normalized[start:start + size])
+            if not posting:
+                return []
+            postings.append(posting)
+        shortest = min(postings, key=len)
+        if len(normalized) <= GRAM_SIZES[-1]:
+            return shortest[:limit]
+
+        found = []
+        for player_id in shortest:
+            if normalized in self.names[player_id]:
+                found.append(player_id)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def partial_within(self, normalized, player_ids, limit=2):
+        """Substring lookup restricted to a small id set (e.g. a season roster)."""
+        found = []
+        for player_id in player_ids:
+            name = self.names.get(player_id)
+            if name is not None and normalized in name:
+                found.append(player_id)
+                if len(found) >= limit:
+                    break
+        return found
+
+_build_lock = threading.Lock()
+
+def _latest_player_id():
+    return db.session.query(db.func.max(Player.id)).scalar() or 0
+
+def get_player_index():
+    """Return the app's PlayerNameIndex, (re)building it when players changed.
+
+    ``max(players.id)`` is an O(1) lookup that catches players added by
+    other worker processes; same-process writes call invalidate_player_index().
+    """
+    state = current_app.extensions.setdefault("player_index", {})
+    latest_id = _latest_player_id()
+    index = state.get("index")
+    if index is not None and state.get("latest_id") == latest_id:
+        return index
+
+    with _build_lock:
+        index = state.get("index")
+        if index is not None and state.get("latest_id") == latest_id:
+            return index
+        rows = db.session.query(Player.id, Player.first_name, Player.last_name).all()
+        index = PlayerNameIndex(rows)
+        state["index"] = index
+        state["latest_id"] = latest_id
+        return index
+
+def invalidate_player_index():
+    current_app.extensions.get("player_index", {}).pop("index", None)
+
+def resolve_player_id(identifier: str, season_id=None):
+    """Resolve a Telegram player identifier to a single player id or None.
+
+    The season roster is searched first (exact, then partial) so short or
+    common names resolve to the rostered player; otherwise all players are
+    searched with the same exact-then-unique-partial rules.
+    """
+    normalized = normalize(identifier)
+    if not normalized:
+        return None
+
+    index = get_player_index()
+    exact = index.exact(normalized)
+
+    if season_id is not None:
+        roster_ids = {
+            player_id
+            for (player_id,) in db.session.query(RosterMembership.player_id)
+            .filter_by(season_id=season_id)
+            .distinct()
+        }
+        roster_exact = [player_id for player_id in exact if player_id in roster_ids]
+        if len(roster_exact) == 1:
+            return roster_exact[0]
+        if len(roster_exact) > 1:
+            return None
+        roster_partial = index.partial_within(normalized, roster_ids)
+        if len(roster_partial) == 1:
+            return roster_partial[0]
+
+    if len(exact) == 1:
+        return exact[0]
+    if len(exact) > 1:
+        return None
+
+    partial = index.partial(normalized)
+    return partial[0] if len(partial) == 1 else None
@@ -0,0 +1,157 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from app import db
+
+slow_query_log = logging.getLogger("app.slow_queries")
+
+class EndpointStats:
+    """Rolling window of request timings and the slowest statements for one endpoint."""
+
+    def __init__(self, window, top_statements):
+        self.samples = deque(maxlen=window)
+        self.top_statements = top_statements
+        self.slowest = {}
+
+    def add(self, profile, total_ms):
+        self.samples.append((total_ms, profile.db_ms, profile.count))
+        for statement, duration_ms in profile.slowest:
+            if duration_ms > self.slowest.get(statement, 0):
+                self.slowest[statement] = duration_ms
+        if len(self.slowest) > self.top_statements:
+            keep = sorted(self.slowest.items(), key=lambda item: item[1], reverse=True)
+            self.slowest = dict(keep[:self.top_statements])
+
+    def summary(self):
+        totals = [sample[0] for sample in self.samples]
+        db_times = [sample[1] for sample in self.samples]
+        counts = [sample[2] for sample in self.samples]
+        return {
+            "requests": len(self.samples),
+            "p50_ms": percentile(totals, 0.5),
+            "p95_ms": percentile(totals, 0.95),
+            "p99_ms": percentile(totals, 0.99),
+            "db_p50_ms": percentile(db_times, 0.5),
+            "db_p95_ms": percentile(db_times, 0.95),
+            "queries_p50": percentile(counts, 0.5),
+            "queries_max": max(counts, default=0),
+            "slowest": sorted(self.slowest.items(), key=lambda item: item[1], reverse=True),
+        }
+
+class RequestProfile:
+    """Statements run while serving one request."""
+
+    __slots__ = ("started", "count", "db_ms", "slowest", "top_statements")
+
+    def __init__(self, top_statements):
+        self.started = time.perf_counter()
+        self.count = 0
+        self.db_ms = 0.0
+        self.slowest = []
+        self.top_statements = top_statements
+
+    def record(self, statement, duration_ms):
+        self.count += 1
+        self.db_ms += duration_ms
+        self.slowest.append((statement, duration_ms))
+        if len(self.slowest) > self.top_statements:
+            self.slowest.sort(key=lambda item: item[1], reverse=True)
+            self.slowest.pop()
+
+def percentile(values, fraction):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def init_profiling(app):
+    """Time every SQL statement and request when PROFILING_ENABLED is set.
+
+    Requests get a ``Server-Timing`` header and feed the per-endpoint
+    windows shown on /admin/perf; statements slower than SLOW_QUERY_MS go
+    to the ``app.slow_queries`` logger (and SLOW_QUERY_LOG, if set).
+    """
+    if not app.config.get("PROFILING_ENABLED"):
+        return
+
+    state = app.extensions["profiling"] = {
+        "endpoints": {},
+        "lock": threading.Lock(),
+    }
+    window = app.config.get("PROFILING_WINDOW", 500)
+    top_statements = app.config.get("PROFILING_TOP_STATEMENTS", 5)
+    log_path = app.config.get("SLOW_QUERY_LOG")
+    if log_path:
+        log_path = os.path.abspath(log_path)
+    if log_path and not any(getattr(handler, "baseFilename", None) == log_path for handler in slow_query_log.handlers):
+        handler = logging.FileHandler(log_path)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        slow_query_log.addHandler(handler)
+    slow_query_log.setLevel(logging.WARNING)
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profiling_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info["profiling_started"].pop()) * 1000
+        endpoint = None
+        if has_request_context():
+            endpoint = request.endpoint
+            profile = g.get("_profile")
+            if profile is not None:
+                profile.record(statement, duration_ms)
+        if duration_ms >= app.config.get("SLOW_QUERY_MS", 100):
+            # Parameters stay out of the log; they can hold user data.
+            slow_query_log.warning(
+                "%.1f ms endpoint=%s statement=%s",
+                duration_ms,
+                endpoint or "-",
+                " ".join(statement.split()),
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def drop_timer(exception_context):
+        # after_cursor_execute never runs for a failed statement.
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("profiling_started"):
+            connection.info["profiling_started"].pop()
+
+    @app.before_request
+    def start_profile():
+        g._profile = RequestProfile(top_statements)
+
+    @app.after_request
+    def finish_profile(response):
+        profile = g.pop("_profile", None)
+        if profile is None:
+            return response
+        total_ms = (time.perf_counter() - profile.started) * 1000
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={profile.db_ms:.1f};desc="{profile.count} queries", app;dur={total_ms:.1f}',
+        )
+        endpoint = request.endpoint or "-"
+        with state["lock"]:
+            stats = state["endpoints"].get(endpoint)
+            if stats is None:
+                stats = state["endpoints"][endpoint] = EndpointStats(window, top_statements)
+            stats.add(profile, total_ms)
+        return response
+
+def endpoint_summaries():
+    """Return ``[(endpoint, summary)]``, slowest p95 first, or None when profiling is off."""
+    state = current_app.extensions.get("profiling")
+    if state is None:
+        return None
+    with state["lock"]:
+        summaries = [(endpoint, stats.summary()) for endpoint, stats in state["endpoints"].items()]
+    return sorted(summaries, key=lambda item: item[1]["p95_ms"], reverse=True)
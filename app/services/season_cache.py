@@ -0,0 +1,59 @@
+import time
+from flask import current_app
+from app import db
+from app.models import Season, Tournament
+
+TERMS = ["Winter", "Spring", "Summer", "Fall"]
+TERM_ORDER = {term: index for index, term in enumerate(TERMS)}
+DEFAULT_TTL_SECONDS = 60
+
+class CurrentSeason:
+    """Detached snapshot of the season shown on /matches."""
+
+    __slots__ = ("id", "year", "term", "tournament_name")
+
+    def __init__(self, id, year, term, tournament_name):
+        self.id = id
+        self.year = year
+        self.term = term
+        self.tournament_name = tournament_name
+
+def term_rank():
+    return db.case(TERM_ORDER, value=Season.term, else_=-1)
+
+def get_active_or_latest_season():
+    """Return the active season, else the latest by (year, term), else None."""
+    active = (
+        Season.query.options(db.joinedload(Season.tournament))
+        .filter_by(is_active=True)
+        .first()
+    )
+    if active:
+        return active
+    return (
+        Season.query.options(db.joinedload(Season.tournament))
+        .order_by(Season.year.desc(), term_rank().desc(), Season.id.desc())
+        .first()
+    )
+
+def get_current_season():
+    """Cached CurrentSeason (or None), refreshed on invalidation or after the TTL.
+
+    The TTL only bounds staleness across worker processes; in-process writes
+    call invalidate_current_season().
+    """
+    ttl = current_app.config.get("CURRENT_SEASON_CACHE_TTL", DEFAULT_TTL_SECONDS)
+    cached = current_app.extensions.get("current_season")
+    now = time.monotonic()
+    if cached and cached[1] > now:
+        return cached[0]
+
+    season = get_active_or_latest_season()
+    snapshot = None
+    if season:
+        snapshot = CurrentSeason(season.id, season.year, season.term, season.tournament.name)
+    current_app.extensions["current_season"] = (snapshot, now + ttl)
+    return snapshot
+
+def invalidate_current_season():
+    current_app.extensions.pop("current_season", None)
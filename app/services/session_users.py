@@ -0,0 +1,61 @@
+import time
+from flask import current_app
+from flask_login import UserMixin
+from app import db, login_manager
+from app.models import User
+
+DEFAULT_TTL_SECONDS = 30
+
+class SessionUser(UserMixin):
+    """Detached snapshot of the logged-in user, enough for auth checks and templates."""
+
+    __slots__ = ("id", "username", "role", "player_id", "active")
+
+    def __init__(self, id, username, role, player_id, active):
+        self.id = id
+        self.username = username
+        self.role = role
+        self.player_id = player_id
+        self.active = active
+
+    @property
+    def is_active(self):
+        return self.active
+
+def _load_snapshot(user_id):
+    row = db.session.execute(
+        db.select(User.id, User.username, User.role, User.player_id, User.is_active)
+        .where(User.id == user_id)
+    ).first()
+    return SessionUser(*row) if row else None
+
+def get_session_user(user_id):
+    """Return the SessionUser for ``user_id``, cached per app for a short TTL.
+
+    Other processes' changes show up within SESSION_USER_CACHE_TTL seconds;
+    writes in this process call invalidate_session_user().
+    """
+    ttl = current_app.config.get("SESSION_USER_CACHE_TTL", DEFAULT_TTL_SECONDS)
+    cache = current_app.extensions.setdefault("session_users", {})
+    now = time.monotonic()
+    entry = cache.get(user_id)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    user = _load_snapshot(user_id)
+    if ttl > 0:
+        cache[user_id] = (now + ttl, user)
+    return user
+
+def invalidate_session_user(user_id=None):
+    """Drop one cached user, or all of them when ``user_id`` is None."""
+    cache = current_app.extensions.get("session_users", {})
+    if user_id is None:
+        cache.clear()
+    else:
+        cache.pop(user_id, None)
+
+@login_manager.user_loader
+def load_user(user_id):
+    user = get_session_user(int(user_id))
+    return user if user is not None and user.is_active else None
@@ -0,0 +1,99 @@
+from app import db
+from app.models import Match, SeasonStanding
+from app.services.aggregates import upsert_increments
+
+FORM_LENGTH = 5
+RESULT_FIELDS = ("played", "won", "drawn", "lost", "goals_for", "goals_against")
+
+def result_snapshot(match):
+    """Return the counters a match contributes to its season standing.
+
+    Only played matches count; scheduled and cancelled ones contribute nothing.
+    """
+    if match is None or match.status != "played":
+        return {}
+    ours = match.our_score or 0
+    theirs = match.their_score or 0
+    return {
+        "played": 1,
+        "won": 1 if ours > theirs else 0,
+        "drawn": 1 if ours == theirs else 0,
+        "lost": 1 if ours < theirs else 0,
+        "goals_for": ours,
+        "goals_against": theirs,
+    }
+
+def apply_result_change(season_id, before, after):
+    """Fold a match's ``before``/``after`` snapshots into season_standings.
+
+    The form string is re-read from the season's latest played matches, so
+    date edits and results entered out of order land in the right place.
+    The caller commits.
+    """
+    if not before and not after:
+        return
+    row = {"season_id": season_id}
+    for field in RESULT_FIELDS:
+        row[field] = after.get(field, 0) - before.get(field, 0)
+    upsert_increments(SeasonStanding, ("season_id",), RESULT_FIELDS, [row])
+    refresh_form(season_id)
+
+def refresh_form(season_id):
+    latest = db.session.execute(
+        db.select(Match.our_score, Match.their_score)
+        .where(Match.season_id == season_id, Match.status == "played")
+        .order_by(Match.date.desc(), Match.id.desc())
+        .limit(FORM_LENGTH)
+    ).all()
+    form = "".join(_result_letter(ours, theirs) for ours, theirs in reversed(latest))
+    db.session.execute(
+        db.update(SeasonStanding)
+        .where(SeasonStanding.season_id == season_id)
+        .values(form=form)
+    )
+
+def _result_letter(ours, theirs):
+    if ours > theirs:
+        return "W"
+    return "D" if ours == theirs else "L"
+
+def get_standing(season_id):
+    """The season's standing row (one unique-index lookup), or None before any result."""
+    return SeasonStanding.query.filter_by(season_id=season_id).first()
+
+def rebuild_standings(season_id=None):
+    """Recompute season_standings from matches; returns rows written, caller commits."""
+    played = Match.status == "played"
+    ours = db.func.coalesce(Match.our_score, 0)
+    theirs = db.func.coalesce(Match.their_score, 0)
+
+    def count(condition):
+        return db.func.sum(db.case((condition, 1), else_=0))
+
+    aggregate = (
+        db.select(
+            Match.season_id,
+            db.func.count(Match.id),
+            count(ours > theirs),
+            count(ours == theirs),
+            count(ours < theirs),
+            db.func.sum(ours),
+            db.func.sum(theirs),
+        )
+        .where(played)
+        .group_by(Match.season_id)
+    )
+    delete = db.delete(SeasonStanding)
+    if season_id is not None:
+        aggregate = aggregate.where(Match.season_id == season_id)
+        delete = delete.where(SeasonStanding.season_id == season_id)
+
+    db.session.execute(delete)
+    season_ids = []
+    for season, *counts in db.session.execute(aggregate):
+        db.session.add(SeasonStanding(season_id=season, **dict(zip(RESULT_FIELDS, counts))))
+        season_ids.append(season)
+    db.session.flush()
+    for season in season_ids:
+        refresh_form(season)
+    return len(season_ids)
@@ -1,15 +1,112 @@
+import re
 import shlex
+from dataclasses import asdict, dataclass
+from typing import Optional
 
 class CommandError(ValueError):
     pass
 
+class _Command:
+    """Shared behaviour for parsed commands; ``command["field"]`` still works."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def to_dict(self):
+        return {"type": self.type, **asdict(self)}
+
+@dataclass
+class ScoreCommand(_Command):
+    __slots__ = ("match_id", "home_score", "away_score", "notes")
+    type = "score"
+
+    match_id: int
+    home_score: int
+    away_score: int
+    notes: Optional[str]
+
+@dataclass
+class StatsCommand(_Command):
+    __slots__ = ("match_id", "player_identifier", "goals", "yellow_cards", "red_cards", "played")
+    type = "stats"
+
+    match_id: int
+    player_identifier: str
+    goals: int
+    yellow_cards: int
+    red_cards: int
+    played: bool
+
+# Fast-path grammar. It only accepts lines whose shlex tokens are obvious:
+# whitespace is shlex's (space, tab, CR, LF), bare words contain no quotes or
+# backslashes and quoted words contain neither their quote nor a backslash.
+# Anything else, including every malformed command, goes through shlex so
+# results and error messages stay identical.
+_WS = r"[ \t\r\n]"
+_INT = r"([0-9]{1,18})"
+_WORD = r"""(?:"([^"\\]*)"|'([^'\\]*)'|([^ \t\r\n'"\\]+))"""
+_SCORE_RE = re.compile(
+    rf"{_WS}*/match{_WS}+{_INT}{_WS}+score{_WS}+{_INT}-{_INT}"
+    rf"(?:{_WS}+notes{_WS}+{_WORD})?{_WS}*"
+)
+_STATS_RE = re.compile(
+    rf"{_WS}*/match{_WS}+{_INT}{_WS}+stats{_WS}+{_WORD}"
+    rf"((?:{_WS}+[A-Za-z_]+=[0-9]{{1,18}})+){_WS}*"
+)
+_FIELD_RE = re.compile(r"([A-Za-z_]+)=([0-9]{1,18})")
+_STATS_KEYS = {"goals": "goals", "y": "yellow_cards", "r": "red_cards", "played": "played"}
+
 def tokenize(text: str):
     if not text:
         return []
-    return shlex.split(text)
+    try:
+        return shlex.split(text)
+    except ValueError as exc:
+        raise CommandError("Unbalanced quotes in command.") from exc
 
 def parse_command(text: str):
-    tokens = tokenize(text)
+    """Parse one ``/match`` command into a ScoreCommand or StatsCommand.
+
+    Plain commands are matched by a precompiled pattern; anything unusual
+    (escapes, odd quoting, invalid values) falls back to the shlex parser.
+    """
+    command = _parse_fast(text) if text else None
+    if command is not None:
+        return command
+    return parse_tokens(tokenize(text))
+
+def _parse_fast(text):
+    found = _SCORE_RE.fullmatch(text)
+    if found:
+        match_id, home, away, double, single, bare = found.groups()
+        notes = double if double is not None else single if single is not None else bare
+        return ScoreCommand(int(match_id), int(home), int(away), notes)
+
+    found = _STATS_RE.fullmatch(text)
+    if not found:
+        return None
+    match_id, double, single, bare, fields_raw = found.groups()
+    values = {}
+    for key, value in _FIELD_RE.findall(fields_raw):
+        values[key] = value
+    if len(values.keys() & _STATS_KEYS.keys()) < len(_STATS_KEYS):
+        return None
+    stats = {field: int(values[key]) for key, field in _STATS_KEYS.items()}
+    if stats["played"] not in (0, 1):
+        return None
+    return StatsCommand(
+        match_id=int(match_id),
+        player_identifier=double if double is not None else single if single is not None else bare,
+        goals=stats["goals"],
+        yellow_cards=stats["yellow_cards"],
+        red_cards=stats["red_cards"],
+        played=bool(stats["played"]),
+    )
+
+def parse_tokens(tokens):
+    """Parse an already-tokenized command; the reference (shlex) path."""
     if len(tokens) < 3:
         raise CommandError("Command is too short.")
     if tokens[0] != "/match":
@@ -29,6 +126,23 @@ def parse_command(text: str):
     raise CommandError("Unknown action. Use 'score' or 'stats'.")
 
 
+def parse_commands(text: str):
+    """Parse a multi-line message, one /match command per line.
+
+    Returns ``(line_number, command, error)`` tuples where exactly one of
+    ``command`` and ``error`` (a CommandError) is set. Blank lines are skipped.
+    """
+    results = []
+    for line_number, line in enumerate((text or "").splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            results.append((line_number, parse_command(line), None))
+        except CommandError as exc:
+            results.append((line_number, None, exc))
+    return results
+
+
 def _parse_score(match_id: int, tokens):
     if not tokens:
         raise CommandError("Score is required.")
@@ -55,13 +169,12 @@ def _parse_score(match_id: int, tokens):
             raise CommandError("Notes text is missing.")
         notes = tokens[2]
 
-    return {
-        "type": "score",
-        "match_id": match_id,
-        "home_score": home_score,
-        "away_score": away_score,
-        "notes": notes,
-    }
+    return ScoreCommand(
+        match_id=match_id,
+        home_score=home_score,
+        away_score=away_score,
+        notes=notes,
+    )
 
 
 def _parse_stats(match_id: int, tokens):
@@ -94,12 +207,11 @@ def _parse_stats(match_id: int, tokens):
     if goals < 0 or yellow_cards < 0 or red_cards < 0:
         raise CommandError("Stats values must be zero or higher.")
 
-    return {
-        "type": "stats",
-        "match_id": match_id,
-        "player_identifier": player_identifier,
-        "goals": goals,
-        "yellow_cards": yellow_cards,
-        "red_cards": red_cards,
-        "played": bool(played),
-    }
+    return StatsCommand(
+        match_id=match_id,
+        player_identifier=player_identifier,
+        goals=goals,
+        yellow_cards=yellow_cards,
+        red_cards=red_cards,
+        played=bool(played),
+    )
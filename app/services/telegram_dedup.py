@@ -0,0 +1,43 @@
+import hashlib
+import time
+from datetime import timedelta
+from flask import current_app
+from app import db
+from app.models import TelegramDelivery, utcnow
+
+DEFAULT_WINDOW_SECONDS = 60
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+def idempotency_key(payload, now=None):
+    """Key identifying one webhook delivery.
+
+    Telegram resends the same ``update_id`` when it retries an update. Without
+    one, the sender, text and a TELEGRAM_DEDUP_WINDOW-second time bucket are
+    hashed, so an identical message within the same bucket counts as a repeat.
+    """
+    update_id = payload.get("update_id")
+    if update_id is not None and update_id != "":
+        return f"update:{update_id}"
+
+    window = current_app.config.get("TELEGRAM_DEDUP_WINDOW", DEFAULT_WINDOW_SECONDS)
+    bucket = int((time.time() if now is None else now) // window)
+    raw = f"{payload.get('telegram_user_id')}\n{bucket}\n{payload.get('text')}"
+    return "hash:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def find_delivery(key):
+    return TelegramDelivery.query.filter_by(idempotency_key=key).first()
+
+def record_delivery(key, response, status):
+    """Store the response for ``key`` in the caller's transaction.
+
+    Entries older than TELEGRAM_DEDUP_TTL are pruned here, which keeps the
+    table bounded by the webhook rate times the TTL.
+    """
+    ttl = current_app.config.get("TELEGRAM_DEDUP_TTL", DEFAULT_TTL_SECONDS)
+    now = utcnow()
+    db.session.execute(
+        db.delete(TelegramDelivery).where(TelegramDelivery.created_at < now - timedelta(seconds=ttl))
+    )
+    db.session.add(
+        TelegramDelivery(idempotency_key=key, response=response, response_status=status, created_at=now)
+    )
@@ -0,0 +1,216 @@
+from app import db
+from app.models import Match, MatchPlayerStat, Player
+from app.services.aggregates import apply_stat_changes, stat_snapshot
+from app.services.live_updates import queue_score_event
+from app.services.player_index import resolve_player_id
+from app.services.standings import apply_result_change, result_snapshot
+from app.services.telegram_commands import parse_command, parse_commands, CommandError
+from app.services.versions import bump_match
+
+COMMAND_HINT = "Use /match <id> score <home>-<away> [notes \"...\"] or /match <id> stats <player> goals=0 y=0 r=0 played=1"
+MAX_BATCH_LINES = 200
+
+class IngestError(Exception):
+    def __init__(self, message, hint=None, status=400):
+        super().__init__(message)
+        self.message = message
+        self.hint = hint
+        self.status = status
+
+def error_payload(message, hint=None):
+    payload = {"ok": False, "error": message}
+    if hint:
+        payload["hint"] = hint
+    return payload
+
+class CommandApplier:
+    """Applies parsed commands to the session without committing.
+
+    Matches, resolved players and stat rows are cached so a batch touching
+    the same match or player many times loads each of them once. Call
+    :meth:`finish` before committing to fold stat and score changes into
+    aggregates and bump the version of every match written to.
+    """
+
+    def __init__(self):
+        self._matches = {}
+        self._players = {}
+        self._stats = {}
+        self._stat_changes = {}
+        self._touched = {}
+        self._results_before = {}
+
+    def apply(self, command):
+        match = self._get_match(command.match_id)
+        if command.type == "score":
+            result = self._apply_score(match, command)
+        else:
+            result = self._apply_stats(match, command)
+        self._touched[match.id] = match
+        return result
+
+    def finish(self):
+        for season_id, changes in self._stat_changes.items():
+            apply_stat_changes(season_id, changes)
+        for match, before in self._results_before.values():
+            apply_result_change(match.season_id, before, result_snapshot(match))
+            queue_score_event(match)
+        for match in self._touched.values():
+            bump_match(match)
+        self._stat_changes = {}
+        self._touched = {}
+        self._results_before = {}
+
+    def _get_match(self, match_id):
+        if match_id not in self._matches:
+            self._matches[match_id] = db.session.get(Match, match_id)
+        match = self._matches[match_id]
+        if not match:
+            raise IngestError("Match not found.", status=404)
+        return match
+
+    def _get_player(self, identifier, season_id):
+        key = (identifier, season_id)
+        if key not in self._players:
+            self._players[key] = _resolve_player(identifier, season_id)
+        player = self._players[key]
+        if not player:
+            raise IngestError("Player not found.", hint="Use full name or last name.")
+        return player
+
+    def _apply_score(self, match, command):
+        if match.id not in self._results_before:
+            self._results_before[match.id] = (match, result_snapshot(match))
+        match.our_score = command.home_score
+        match.their_score = command.away_score
+        if command.notes is not None:
+            match.notes = command.notes
+        return {
+            "message": f"Match {match.id} updated.",
+            "data": {
+                "match_id": match.id,
+                "score": f"{match.our_score}-{match.their_score}",
+                "notes": match.notes,
+            },
+        }
+
+    def _apply_stats(self, match, command):
+        player = self._get_player(command.player_identifier, match.season_id)
+
+        key = (match.id, player.id)
+        stat = self._stats.get(key)
+        if stat is None:
+            stat = MatchPlayerStat.query.filter_by(match_id=match.id, player_id=player.id).first()
+        before = stat_snapshot(stat)
+        if not stat:
+            stat = MatchPlayerStat(match_id=match.id, player_id=player.id)
+            db.session.add(stat)
+        self._stats[key] = stat
+
+        stat.played = command.played
+        stat.goals = command.goals
+        stat.yellow_cards = command.yellow_cards
+        stat.red_cards = command.red_cards
+        self._stat_changes.setdefault(match.season_id, []).append(
+            (player.id, before, stat_snapshot(stat))
+        )
+
+        return {
+            "message": f"Stats updated for {player.first_name} {player.last_name}.",
+            "data": {
+                "match_id": match.id,
+                "player_id": player.id,
+                "goals": stat.goals,
+                "yellow_cards": stat.yellow_cards,
+                "red_cards": stat.red_cards,
+                "played": stat.played,
+            },
+        }
+
+def _is_single(text, batch):
+    """Whether ``text`` is applied as one command rather than line by line.
+
+    /admin/batch always splits lines. On /admin a multi-line message is only
+    a batch when every line parses as a command, so a single command whose
+    quoted notes span lines is still applied whole.
+    """
+    if batch:
+        return False
+    if len(text.strip().splitlines()) <= 1:
+        return True
+    return any(error is not None for _, _, error in parse_commands(text))
+
+def validate_message(text, batch=False):
+    """Parse ``text`` without touching the database.
+
+    Returns ``(parsed, error)``: ``parsed`` is a list of
+    ``(line_number, command, parse_error)`` tuples, ``error`` an
+    ``(payload, status)`` pair when the message cannot be applied at all.
+    A single-line message must parse; batch lines may fail individually.
+    """
+    if _is_single(text, batch):
+        try:
+            return [(1, parse_command(text), None)], None
+        except CommandError as exc:
+            return None, (error_payload(str(exc), hint=COMMAND_HINT), 400)
+
+    parsed = parse_commands(text)
+    if not parsed:
+        return None, (error_payload("No commands found.", hint=COMMAND_HINT), 400)
+    if len(parsed) > MAX_BATCH_LINES:
+        return None, (error_payload(f"Too many commands (max {MAX_BATCH_LINES} per batch)."), 400)
+    return parsed, None
+
+def apply_message(text, batch=False, applier=None):
+    """Validate and apply one Telegram message; returns ``(payload, status)``.
+
+    Batches (``batch=True``, or multi-line messages where every line is a
+    command) are applied line by line with per-line results. Nothing is committed; pass a shared ``applier`` to
+    apply several messages in one transaction and call its ``finish()``.
+    """
+    parsed, error = validate_message(text, batch=batch)
+    if error:
+        return error
+
+    own_applier = applier is None
+    if own_applier:
+        applier = CommandApplier()
+
+    if _is_single(text, batch):
+        try:
+            result = applier.apply(parsed[0][1])
+        except IngestError as exc:
+            return error_payload(exc.message, hint=exc.hint), exc.status
+        if own_applier:
+            applier.finish()
+        return {"ok": True, **result}, 200
+
+    results = []
+    for line_number, command, parse_error in parsed:
+        if parse_error is not None:
+            results.append({"line": line_number, "ok": False, "error": str(parse_error), "hint": COMMAND_HINT})
+            continue
+        try:
+            result = applier.apply(command)
+        except IngestError as exc:
+            entry = {"line": line_number, "ok": False, "error": exc.message}
+            if exc.hint:
+                entry["hint"] = exc.hint
+            results.append(entry)
+            continue
+        results.append({"line": line_number, "ok": True, **result})
+    if own_applier:
+        applier.finish()
+
+    applied = sum(1 for result in results if result["ok"])
+    return {
+        "ok": applied == len(results),
+        "message": f"Applied {applied} of {len(results)} commands.",
+        "applied": applied,
+        "failed": len(results) - applied,
+        "results": results,
+    }, 200
+
+def _resolve_player(identifier: str, season_id=None):
+    player_id = resolve_player_id(identifier, season_id)
+    return db.session.get(Player, player_id) if player_id else None
@@ -0,0 +1,132 @@
+import uuid
+from datetime import timedelta
+from flask import current_app
+from app import db
+from app.models import TelegramCommand, utcnow
+from app.services.telegram_ingest import CommandApplier, apply_message, error_payload
+
+DEFAULT_BATCH_SIZE = 50
+CLAIM_TIMEOUT = timedelta(minutes=5)
+
+def enqueue(telegram_user_id, text, is_batch=False, key=None):
+    """Queue a validated message; returns ``(command, created)``.
+
+    A message whose idempotency key is already queued returns the existing
+    row instead, so re-delivered webhooks are applied at most once.
+    """
+    if key is not None:
+        existing = TelegramCommand.query.filter_by(idempotency_key=key).first()
+        if existing:
+            return existing, False
+
+    command = TelegramCommand(
+        idempotency_key=key,
+        telegram_user_id=str(telegram_user_id),
+        text=text,
+        is_batch=is_batch,
+    )
+    db.session.add(command)
+    try:
+        db.session.commit()
+    except db.exc.IntegrityError:
+        # A concurrent delivery with the same key won the insert.
+        db.session.rollback()
+        return TelegramCommand.query.filter_by(idempotency_key=key).one(), False
+    return command, True
+
+def _claim(batch_size):
+    """Mark up to ``batch_size`` queued commands as ours and return them."""
+    now = utcnow()
+    db.session.execute(
+        db.update(TelegramCommand)
+        .where(
+            TelegramCommand.status == "applying",
+            TelegramCommand.claimed_at < now - CLAIM_TIMEOUT,
+        )
+        .values(status="queued", claim_token=None, claimed_at=None)
+    )
+    ids = db.select(TelegramCommand.id).where(TelegramCommand.status == "queued").order_by(TelegramCommand.id).limit(batch_size)
+    token = uuid.uuid4().hex
+    db.session.execute(
+        db.update(TelegramCommand)
+        .where(TelegramCommand.id.in_(ids.scalar_subquery()), TelegramCommand.status == "queued")
+        .values(status="applying", claim_token=token, claimed_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return (
+        TelegramCommand.query.filter_by(claim_token=token, status="applying")
+        .order_by(TelegramCommand.id)
+        .all()
+    )
+
+def apply_queued_commands(batch_size=DEFAULT_BATCH_SIZE):
+    """Apply one batch of queued commands in a single transaction.
+
+    Matches and players are shared across the batch through one
+    CommandApplier. Each command's response is stored with its effects, so
+    a crash leaves the claim to expire and the batch is retried whole. If
+    the batch raises, it is rolled back and retried one command per
+    transaction, and a command that still raises is marked ``failed``,
+    so one bad command cannot hold back the others claimed with it.
+    Returns the number of commands processed.
+    """
+    commands = _claim(batch_size)
+    if not commands:
+        return 0
+
+    command_ids = [command.id for command in commands]
+    try:
+        _apply(commands)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception("Queued Telegram batch failed; retrying commands one by one.")
+        for command_id in command_ids:
+            try:
+                _apply([db.session.get(TelegramCommand, command_id)])
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                current_app.logger.exception("Queued Telegram command %s failed.", command_id)
+                _mark_failed(command_id)
+    return len(command_ids)
+
+def _apply(commands):
+    applier = CommandApplier()
+    now = utcnow()
+    for command in commands:
+        response, status = apply_message(command.text, batch=command.is_batch, applier=applier)
+        command.response = response
+        command.response_status = status
+        command.status = _result_status(response)
+        command.applied_at = now
+        command.claim_token = None
+    applier.finish()
+
+def _result_status(response):
+    """``partial`` for a batch with committed and rejected lines; its results say which."""
+    if response["ok"]:
+        return "applied"
+    return "partial" if response.get("applied") else "failed"
+
+def _mark_failed(command_id):
+    command = db.session.get(TelegramCommand, command_id)
+    command.response = error_payload("Command could not be applied.", hint="Check the server log and resend it.")
+    command.response_status = 500
+    command.status = "failed"
+    command.applied_at = utcnow()
+    command.claim_token = None
+    db.session.commit()
+
+def command_status(command):
+    payload = {
+        "ok": True,
+        "command_id": command.id,
+        "status": command.status,
+        "created_at": command.created_at.isoformat(),
+    }
+    if command.applied_at:
+        payload["applied_at"] = command.applied_at.isoformat()
+        payload["result"] = command.response
+    return payload
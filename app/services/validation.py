@@ -0,0 +1,63 @@
+from datetime import date
+
+MATCH_STATUSES = ("scheduled", "played", "cancelled")
+
+class ValidationError(ValueError):
+    pass
+
+def clean_text(value):
+    """Strip a form or file value; missing values become the empty string."""
+    return "" if value is None else str(value).strip()
+
+def parse_player_fields(first_name, last_name, jersey_number=None):
+    """Validate the admin player form and return the Player column values."""
+    first_name = clean_text(first_name)
+    last_name = clean_text(last_name)
+    jersey_number = clean_text(jersey_number)
+    if not first_name or not last_name:
+        raise ValidationError("First and last name are required.")
+    try:
+        jersey_number = int(jersey_number) if jersey_number else None
+    except ValueError:
+        raise ValidationError("Jersey number must be a whole number.")
+    return {"first_name": first_name, "last_name": last_name, "jersey_number": jersey_number}
+
+def parse_match_fields(
+    date_raw,
+    opponent,
+    location=None,
+    status="scheduled",
+    our_score=None,
+    their_score=None,
+    notes=None,
+):
+    """Validate the admin match form and return the Match column values.
+
+    Blank scores count as 0, as they do on the form.
+    """
+    date_raw = clean_text(date_raw)
+    opponent = clean_text(opponent)
+    status = clean_text(status)
+    try:
+        match_date = date.fromisoformat(date_raw) if date_raw else None
+    except ValueError:
+        match_date = None
+    if not match_date:
+        raise ValidationError("Match date is required.")
+    if not opponent:
+        raise ValidationError("Opponent is required.")
+    if status not in MATCH_STATUSES:
+        raise ValidationError("Status must be scheduled, played, or cancelled.")
+    try:
+        scores = [int(raw) if raw else 0 for raw in (clean_text(our_score), clean_text(their_score))]
+    except ValueError:
+        raise ValidationError("Scores must be whole numbers.")
+    return {
+        "date": match_date,
+        "opponent": opponent,
+        "location": clean_text(location) or None,
+        "status": status,
+        "our_score": scores[0],
+        "their_score": scores[1],
+        "notes": clean_text(notes) or None,
+    }
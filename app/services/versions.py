@@ -0,0 +1,44 @@
+from app import db
+from app.models import ResourceVersion
+from app.services.aggregates import upsert_increments
+from app.services.fragment_cache import clear_fragments, invalidate_fragments
+
+GLOBAL = "global"
+
+def match_key(match_id):
+    return f"match:{match_id}"
+
+def season_key(season_id):
+    return f"season:{season_id}"
+
+def bump_versions(*keys):
+    """Increment the write counters for ``keys`` in the caller's transaction.
+
+    Every write that changes what a match or season page shows bumps the
+    matching keys; page ETags and cached fragments are keyed by these
+    counters. This process's fragments for ``keys`` are dropped right away.
+    """
+    keys = [key for key in dict.fromkeys(keys) if key]
+    upsert_increments(
+        ResourceVersion,
+        ("key",),
+        ("version",),
+        [{"key": key, "version": 1} for key in keys],
+    )
+    if GLOBAL in keys:
+        clear_fragments()
+    else:
+        invalidate_fragments(*keys)
+
+def bump_match(match, *extra_keys):
+    """Bump a match and its season (its card and score show on the season pages)."""
+    bump_versions(match_key(match.id), season_key(match.season_id), *extra_keys)
+
+def get_versions(*keys):
+    """Return ``{key: version}`` for ``keys`` in one query; unseen keys are 0."""
+    found = dict(
+        db.session.query(ResourceVersion.key, ResourceVersion.version)
+        .filter(ResourceVersion.key.in_(keys))
+        .all()
+    )
+    return {key: found.get(key, 0) for key in keys}
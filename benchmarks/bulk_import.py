@@ -0,0 +1,80 @@
+"""`flask import stats` throughput on ~100k stat rows, by chunk size.
+
+Generates a league, writes its match sheets out as a CSV keyed by player
+name and date/opponent (the way a spreadsheet export would be), deletes
+them, and times re-importing the file, including the season totals rebuild:
+
+    python -m benchmarks.bulk_import
+"""
+import csv
+import os
+import tempfile
+from app import create_app, db
+from app.models import Match, MatchPlayerStat, Player, Season, SeasonPlayerTotal, Tournament
+from app.services.bulk_import import StatImporter, read_records, run_import
+from benchmarks.league import generate_league
+
+COLUMNS = ["tournament", "year", "term", "date", "opponent", "player", "played", "goals", "yellow_cards", "red_cards"]
+
+def _export_stats(path):
+    rows = db.session.execute(
+        db.select(
+            Tournament.name, Season.year, Season.term, Match.date, Match.opponent,
+            Player.first_name, Player.last_name, MatchPlayerStat.played,
+            MatchPlayerStat.goals, MatchPlayerStat.yellow_cards, MatchPlayerStat.red_cards,
+        )
+        .join(Match, Match.id == MatchPlayerStat.match_id)
+        .join(Season, Season.id == Match.season_id)
+        .join(Tournament, Tournament.id == Season.tournament_id)
+        .join(Player, Player.id == MatchPlayerStat.player_id)
+    )
+    count = 0
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(COLUMNS)
+        for tournament, year, term, match_date, opponent, first, last, played, *counts in rows:
+            writer.writerow([tournament, year, term, match_date, opponent, f"{first} {last}", int(played), *counts])
+            count += 1
+    return count
+
+def _totals():
+    return sorted(
+        db.session.execute(
+            db.select(SeasonPlayerTotal.season_id, SeasonPlayerTotal.player_id, SeasonPlayerTotal.goals)
+            .where(SeasonPlayerTotal.games_played > 0)
+        ).all()
+    )
+
+def run(chunk_sizes=(100, 1000, 5000), seasons=10, roster_size=100, matches_per_season=102):
+    for chunk_size in chunk_sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'bench.db')}"})
+            with app.app_context():
+                db.create_all()
+                generate_league(
+                    seasons=seasons,
+                    players=roster_size * 2,
+                    roster_size=roster_size,
+                    matches_per_season=matches_per_season,
+                    voters_per_match=0,
+                )
+                path = os.path.join(tmp, "stats.csv")
+                rows = _export_stats(path)
+                expected = _totals()
+                db.session.execute(db.delete(MatchPlayerStat))
+                db.session.execute(db.delete(SeasonPlayerTotal))
+                db.session.commit()
+
+                with open(path, newline="") as handle:
+                    report = run_import(StatImporter(), read_records(handle, "csv"), chunk_size=chunk_size)
+                db.session.commit()
+                assert not report.errors, report.errors[:5]
+                assert _totals() == expected
+                db.engine.dispose()
+            print(
+                f"{rows} rows, chunk size {chunk_size:>5}: {report.seconds:6.2f} s "
+                f"({report.rows_per_second:8.0f} rows/s)"
+            )
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,156 @@
+"""Seeded synthetic league data for the route benchmarks.
+
+Builds tournaments, seasons, a shared player pool, per-season rosters,
+matches, stat sheets and MVP votes with bulk inserts, then derives the
+season totals, MVP tallies and standings the way the maintenance commands do.
+"""
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from app import db
+from app.models import (
+    Match,
+    MatchPlayerStat,
+    MVPVote,
+    Player,
+    RosterMembership,
+    Season,
+    Tournament,
+    User,
+)
+from app.services.aggregates import rebuild_mvp_tallies, rebuild_season_totals
+from app.services.passwords import hash_password
+from app.services.season_cache import TERMS
+from app.services.standings import rebuild_standings
+
+FIRST_NAMES = ["Luca", "Marco", "Pablo", "Diego", "Juan", "Tomas", "Nico", "Facu", "Santi", "Martin"]
+SYLLABLES = ["ro", "ssi", "bian", "chi", "gar", "cia", "fer", "nan", "dez", "lo", "pez", "mar"]
+TOURNAMENTS = ["Liga", "Copa", "Torneo Apertura"]
+
+@dataclass
+class League:
+    """Ids the benchmark scenarios need from a generated league."""
+
+    season_id: int
+    roster_ids: list
+    match_ids: list
+    admin_id: int
+    voter_ids: list  # (user_id, player_id) for rostered players with logins
+    player_names: list
+
+def _insert(model, rows):
+    if not rows:
+        return []
+    stmt = db.insert(model).returning(model.id, sort_by_parameter_order=True)
+    return list(db.session.scalars(stmt, rows))
+
+def generate_league(
+    seasons=10,
+    players=500,
+    roster_size=30,
+    matches_per_season=20,
+    voters_per_match=10,
+    seed=1,
+):
+    """Fill the current database with a league and return its :class:`League`.
+
+    The last season is the active one; its rostered players get logins.
+    Every match but the last two of a season is played, with a full stat
+    sheet and ``voters_per_match`` MVP votes. Same seed, same data.
+    """
+    rng = random.Random(seed)
+    roster_size = min(roster_size, players)
+
+    tournament_ids = _insert(Tournament, [{"name": name} for name in TOURNAMENTS])
+    player_rows = []
+    for number in range(players):
+        last_name = "".join(rng.choice(SYLLABLES) for _ in range(3)).title() + str(number)
+        player_rows.append({"first_name": rng.choice(FIRST_NAMES), "last_name": last_name})
+    player_ids = _insert(Player, player_rows)
+
+    season_ids = _insert(Season, [
+        {
+            "year": 2000 + number // len(TERMS),
+            "term": TERMS[number % len(TERMS)],
+            "tournament_id": tournament_ids[number % len(tournament_ids)],
+            "is_active": number == seasons - 1,
+        }
+        for number in range(seasons)
+    ])
+
+    rosters = {}
+    matches = []
+    for number, season_id in enumerate(season_ids):
+        rosters[season_id] = rng.sample(player_ids, roster_size)
+        start = date(2000 + number // len(TERMS), 1 + 3 * (number % len(TERMS)), 1)
+        for round_number in range(matches_per_season):
+            played = round_number < matches_per_season - 2
+            matches.append({
+                "season_id": season_id,
+                "date": start + timedelta(days=7 * round_number),
+                "opponent": f"Rivals {rng.randrange(100)}",
+                "status": "played" if played else "scheduled",
+                "our_score": rng.randrange(6) if played else 0,
+                "their_score": rng.randrange(6) if played else 0,
+            })
+    _insert(RosterMembership, [
+        {"season_id": season_id, "player_id": player_id}
+        for season_id, roster in rosters.items()
+        for player_id in roster
+    ])
+    match_ids = _insert(Match, matches)
+
+    stats = []
+    votes = []
+    for match_id, match in zip(match_ids, matches):
+        if match["status"] != "played":
+            continue
+        roster = rosters[match["season_id"]]
+        for player_id in roster:
+            stats.append({
+                "match_id": match_id,
+                "player_id": player_id,
+                "played": rng.random() < 0.8,
+                "goals": rng.choices((0, 1, 2, 3), weights=(70, 20, 8, 2))[0],
+                "yellow_cards": 1 if rng.random() < 0.1 else 0,
+                "red_cards": 1 if rng.random() < 0.02 else 0,
+            })
+        for voter_id in rng.sample(roster, min(voters_per_match, len(roster))):
+            voted_id = rng.choice(roster)
+            if voted_id != voter_id:
+                votes.append({"match_id": match_id, "voter_player_id": voter_id, "voted_player_id": voted_id})
+    _insert(MatchPlayerStat, stats)
+    _insert(MVPVote, votes)
+
+    # One real hash shared by every generated login; scenarios sign in by session.
+    password_hash = hash_password("bench")
+    active_season_id = season_ids[-1]
+    active_roster = rosters[active_season_id]
+    admin_id, *user_ids = _insert(User, [
+        {"username": "admin", "role": "admin", "password_hash": password_hash},
+        *[
+            {"username": f"player{player_id}", "role": "player", "password_hash": password_hash, "player_id": player_id}
+            for player_id in active_roster
+        ],
+    ])
+
+    rebuild_season_totals()
+    rebuild_mvp_tallies()
+    rebuild_standings()
+    db.session.commit()
+
+    names = {player_id: row for player_id, row in zip(player_ids, player_rows)}
+    return League(
+        season_id=active_season_id,
+        roster_ids=active_roster,
+        match_ids=[
+            match_id for match_id, match in zip(match_ids, matches)
+            if match["season_id"] == active_season_id
+        ],
+        admin_id=admin_id,
+        voter_ids=list(zip(user_ids, active_roster)),
+        player_names=[
+            f"{names[player_id]['first_name']} {names[player_id]['last_name']}"
+            for player_id in active_roster
+        ],
+    )
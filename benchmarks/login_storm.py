@@ -0,0 +1,82 @@
+"""Season-kickoff login storm: many concurrent sign-ins while others browse.
+
+Reports sign-ins/sec and the latency of a cheap page served during the
+storm, for each hashing method and verification concurrency limit:
+
+    python -m benchmarks.login_storm
+"""
+import os
+import statistics
+import tempfile
+import threading
+import time
+from app import create_app, db
+from app.models import User
+
+SCENARIOS = [
+    ("scrypt:32768:8:1", 64),
+    ("scrypt:32768:8:1", os.cpu_count() or 1),
+    ("pbkdf2:sha256:600000", os.cpu_count() or 1),
+]
+
+def _storm(app, users, logins_per_user, probes):
+    errors = []
+    latencies = []
+    stop = threading.Event()
+
+    def sign_in(username):
+        client = app.test_client()
+        for _ in range(logins_per_user):
+            response = client.post("/auth/login", data={"username": username, "password": "pw"})
+            if response.status_code != 302:
+                errors.append(response.status_code)
+
+    def browse():
+        client = app.test_client()
+        while not stop.is_set() and len(latencies) < probes:
+            start = time.perf_counter()
+            client.get("/auth/login")
+            latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.005)
+
+    threads = [threading.Thread(target=sign_in, args=(username,)) for username in users]
+    prober = threading.Thread(target=browse)
+    start = time.perf_counter()
+    prober.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    prober.join()
+    return len(users) * logins_per_user / elapsed, latencies, errors
+
+def run(user_count=32, logins_per_user=2, probes=200):
+    for method, concurrency in SCENARIOS:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = create_app({
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                "PASSWORD_HASH_METHOD": method,
+                "PASSWORD_CHECK_CONCURRENCY": concurrency,
+            })
+            with app.app_context():
+                db.create_all()
+                users = []
+                for number in range(user_count):
+                    user = User(username=f"player{number}", role="player", is_active=True)
+                    user.set_password("pw")
+                    db.session.add(user)
+                    users.append(user.username)
+                db.session.commit()
+            rate, latencies, errors = _storm(app, users, logins_per_user, probes)
+            with app.app_context():
+                db.engine.dispose()
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else float("nan")
+        print(
+            f"{method:>22}, {concurrency:>2} slots: {rate:6.1f} sign-ins/sec, "
+            f"page p95 {p95:7.1f} ms during storm, {len(errors)} failed"
+        )
+
+if __name__ == "__main__":
+    run()
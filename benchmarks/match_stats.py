@@ -0,0 +1,94 @@
+"""Admin match-sheet save latency for 30- and 300-player rosters.
+
+Compares the old per-player ORM loop against the bulk upsert path, both for
+a first save (every row inserted) and a re-save where one player changed:
+
+    python -m benchmarks.match_stats
+"""
+import os
+import tempfile
+import time
+from datetime import date
+from app import create_app, db
+from app.models import Match, MatchPlayerStat, Player, RosterMembership, Season, Tournament
+from app.services.aggregates import apply_stat_changes, stat_snapshot
+from app.services.match_stats import save_match_stats
+
+def _legacy_save(match, rows, existing):
+    changes = []
+    for player_id, row in rows.items():
+        stat = existing.get(player_id)
+        before = stat_snapshot(stat)
+        if not stat:
+            stat = MatchPlayerStat(match_id=match.id, player_id=player_id)
+            db.session.add(stat)
+            existing[player_id] = stat
+        stat.played = row["played"]
+        stat.goals = row["goals"]
+        stat.yellow_cards = row["yellow_cards"]
+        stat.red_cards = row["red_cards"]
+        changes.append((player_id, before, stat_snapshot(stat)))
+    apply_stat_changes(match.season_id, changes)
+
+def _seed(roster_size):
+    tournament = Tournament(name="Liga")
+    db.session.add(tournament)
+    db.session.flush()
+    season = Season(year=2026, term="Spring", tournament_id=tournament.id, is_active=True)
+    db.session.add(season)
+    db.session.flush()
+    player_ids = []
+    for number in range(roster_size):
+        player = Player(first_name="Player", last_name=f"Number{number}")
+        db.session.add(player)
+        db.session.flush()
+        db.session.add(RosterMembership(season_id=season.id, player_id=player.id))
+        player_ids.append(player.id)
+    db.session.commit()
+    return season, player_ids
+
+def _time_save(save, season, player_ids, rounds):
+    """Return (first save ms, one-change re-save ms) averaged over ``rounds`` matches."""
+    first = resave = 0.0
+    for round_number in range(rounds):
+        match = Match(season_id=season.id, date=date(2026, 3, 1), opponent=f"Rivals {round_number}")
+        db.session.add(match)
+        db.session.commit()
+        rows = {
+            player_id: {"played": True, "goals": 0, "yellow_cards": 0, "red_cards": 0}
+            for player_id in player_ids
+        }
+
+        start = time.perf_counter()
+        save(match, rows, {})
+        db.session.commit()
+        first += time.perf_counter() - start
+
+        existing = {
+            stat.player_id: stat
+            for stat in MatchPlayerStat.query.filter_by(match_id=match.id)
+        }
+        rows[player_ids[0]] = dict(rows[player_ids[0]], goals=1)
+        start = time.perf_counter()
+        save(match, rows, existing)
+        db.session.commit()
+        resave += time.perf_counter() - start
+    return first / rounds * 1000, resave / rounds * 1000
+
+def run(roster_sizes=(30, 300), rounds=20):
+    for roster_size in roster_sizes:
+        for label, save in (("legacy loop", _legacy_save), ("bulk upsert", save_match_stats)):
+            with tempfile.TemporaryDirectory() as tmp:
+                app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'bench.db')}"})
+                with app.app_context():
+                    db.create_all()
+                    season, player_ids = _seed(roster_size)
+                    first, resave = _time_save(save, season, player_ids, rounds)
+                    db.engine.dispose()
+            print(
+                f"{roster_size:>4} players, {label}: first save {first:7.2f} ms, "
+                f"one-change re-save {resave:7.2f} ms"
+            )
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,72 @@
+"""Telegram player resolution latency at 10k and 100k players.
+
+Compares the old full-table scan against the indexed resolver:
+
+    python -m benchmarks.player_resolver
+"""
+import random
+import time
+from app import create_app, db
+from app.models import Player
+from app.services.player_index import get_player_index, resolve_player_id
+
+FIRST_NAMES = ["Luca", "Marco", "Pablo", "Diego", "Juan", "Tomas", "Nico", "Facu", "Santi", "Martin"]
+SYLLABLES = ["ro", "ssi", "bian", "chi", "gar", "cia", "fer", "nan", "dez", "lo", "pez", "mar"]
+
+def _legacy_resolve(identifier):
+    normalized = identifier.strip().lower()
+    candidates = Player.query.all()
+    exact = [
+        player for player in candidates
+        if normalized in (
+            f"{player.first_name} {player.last_name}".strip().lower(),
+            player.first_name.lower(),
+            player.last_name.lower(),
+        )
+    ]
+    if exact:
+        return exact[0] if len(exact) == 1 else None
+    partial = [
+        player for player in candidates
+        if normalized in f"{player.first_name} {player.last_name}".lower()
+    ]
+    return partial[0] if len(partial) == 1 else None
+
+def _seed_players(count, rng):
+    rows = []
+    for number in range(count):
+        last_name = "".join(rng.choice(SYLLABLES) for _ in range(3)).title() + str(number)
+        rows.append({"first_name": rng.choice(FIRST_NAMES), "last_name": last_name})
+    db.session.execute(db.insert(Player), rows)
+    db.session.commit()
+    return rows
+
+def _time_per_call(func, identifiers):
+    start = time.perf_counter()
+    for identifier in identifiers:
+        func(identifier)
+    return (time.perf_counter() - start) / len(identifiers) * 1000
+
+def run(counts=(10_000, 100_000), lookups=200, legacy_lookups=3, seed=7):
+    rng = random.Random(seed)
+    for count in counts:
+        app = create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://"})
+        with app.app_context():
+            db.create_all()
+            rows = _seed_players(count, rng)
+            identifiers = [rng.choice(rows)["last_name"] for _ in range(lookups)]
+            identifiers += [row[: len(row) - 2] for row in identifiers[: lookups // 2]]
+
+            build_start = time.perf_counter()
+            get_player_index()
+            build_ms = (time.perf_counter() - build_start) * 1000
+
+            indexed = _time_per_call(resolve_player_id, identifiers)
+            legacy = _time_per_call(_legacy_resolve, identifiers[:legacy_lookups])
+            print(
+                f"{count:>7} players: indexed {indexed:8.3f} ms/lookup, "
+                f"legacy scan {legacy:9.1f} ms/lookup, index build {build_ms:7.1f} ms"
+            )
+
+if __name__ == "__main__":
+    run()
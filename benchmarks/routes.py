@@ -0,0 +1,174 @@
+"""Route latency and SQL statement counts on a generated league.
+
+Seeds a league with :mod:`benchmarks.league`, then times each scenario
+through the test client (or directly, for the player resolver) and
+reports p50/p95 latency and statements per call:
+
+    python -m benchmarks.routes
+    flask bench --seasons 50 --players 500
+"""
+import itertools
+import statistics
+import time
+from sqlalchemy import event
+from app import create_app, db
+from app.services.telegram_ingest import _resolve_player
+from benchmarks.league import generate_league
+
+BENCH_CONFIG = {
+    "SECRET_KEY": "bench",
+    "TELEGRAM_INGEST_SECRET": "bench",
+    "TELEGRAM_ADMIN_IDS": "42",
+}
+SCENARIOS = {}
+
+def scenario(name):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+def _client(app, user_id):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user_id)
+        session["_fresh"] = True
+    return client
+
+def _expect(response, status):
+    if response.status_code != status:
+        raise RuntimeError(f"{response.request.path} answered {response.status_code}, expected {status}")
+    return response
+
+def _played_match_id(league):
+    # The last two matches of each season are scheduled, not played.
+    return league.match_ids[len(league.match_ids) // 2]
+
+@scenario("season_stats")
+def season_stats(app, league):
+    client = _client(app, league.admin_id)
+    url = f"/seasons/{league.season_id}/stats"
+    return lambda step: _expect(client.get(url), 200)
+
+@scenario("detail")
+def detail(app, league):
+    user_id, _ = league.voter_ids[0]
+    client = _client(app, user_id)
+    urls = itertools.cycle(f"/matches/{match_id}" for match_id in league.match_ids)
+    return lambda step: _expect(client.get(next(urls)), 200)
+
+@scenario("leaderboard")
+def leaderboard(app, league):
+    client = _client(app, league.admin_id)
+    return lambda step: _expect(client.get("/leaderboards/goals.json?k=10"), 200)
+
+@scenario("vote")
+def vote(app, league):
+    user_id, player_id = league.voter_ids[0]
+    client = _client(app, user_id)
+    url = f"/matches/{_played_match_id(league)}/vote"
+    candidates = itertools.cycle([other for other in league.roster_ids if other != player_id])
+    return lambda step: _expect(client.post(url, data={"voted_player_id": next(candidates)}), 302)
+
+@scenario("match_stats")
+def match_stats(app, league):
+    client = _client(app, league.admin_id)
+    url = f"/admin/matches/{_played_match_id(league)}/stats"
+
+    def step(number):
+        form = {}
+        for player_id in league.roster_ids:
+            form[f"played_{player_id}"] = "on"
+            form[f"goals_{player_id}"] = str((player_id + number) % 3)
+        return _expect(client.post(url, data=form), 302)
+    return step
+
+@scenario("admin_ingest")
+def admin_ingest(app, league):
+    client = app.test_client()
+    match_id = _played_match_id(league)
+    headers = {"X-TELEGRAM_SECRET": BENCH_CONFIG["TELEGRAM_INGEST_SECRET"]}
+
+    def step(number):
+        payload = {
+            "update_id": number,
+            "telegram_user_id": "42",
+            "text": f"/match {match_id} score {number % 5}-{number % 3}",
+        }
+        return _expect(client.post("/api/telegram/admin", json=payload, headers=headers), 200)
+    return step
+
+@scenario("resolve_player")
+def resolve_player(app, league):
+    identifiers = []
+    for name in league.player_names:
+        last_name = name.split(" ", 1)[1]
+        identifiers += [name, last_name, last_name[:-2]]
+    identifiers = itertools.cycle(identifiers)
+
+    def step(number):
+        with app.app_context():
+            return _resolve_player(next(identifiers), league.season_id)
+    return step
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def measure(app, step, iterations, warmup=2):
+    """Run ``step`` and return ``(p50 ms, p95 ms, median statements, max statements)``."""
+    with app.app_context():
+        engine = db.engine
+    statements = [0]
+
+    def count(*args):
+        statements[0] += 1
+
+    for number in range(warmup):
+        step(-1 - number)
+    latencies = []
+    counts = []
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        for number in range(iterations):
+            statements[0] = 0
+            start = time.perf_counter()
+            step(number)
+            latencies.append((time.perf_counter() - start) * 1000)
+            counts.append(statements[0])
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return (
+        _percentile(latencies, 0.5),
+        _percentile(latencies, 0.95),
+        statistics.median_low(counts),
+        max(counts),
+    )
+
+def run(database=None, scenarios=None, iterations=50, seed=1, echo=print, **scale):
+    """Seed a league into ``database`` (a SQLite file path, default in memory) and time it.
+
+    ``scale`` goes to :func:`benchmarks.league.generate_league`.
+    """
+    uri = f"sqlite:///{database}" if database else "sqlite://"
+    app = create_app({**BENCH_CONFIG, "SQLALCHEMY_DATABASE_URI": uri})
+    with app.app_context():
+        db.create_all()
+        start = time.perf_counter()
+        league = generate_league(seed=seed, **scale)
+        echo(f"Seeded league in {time.perf_counter() - start:.1f} s")
+
+    try:
+        for name in scenarios or SCENARIOS:
+            step = SCENARIOS[name](app, league)
+            p50, p95, median_statements, max_statements = measure(app, step, iterations)
+            echo(
+                f"{name:>14}: p50 {p50:7.2f} ms, p95 {p95:7.2f} ms, "
+                f"{median_statements} SQL statements (max {max_statements})"
+            )
+    finally:
+        with app.app_context():
+            db.engine.dispose()
+
+if __name__ == "__main__":
+    run()
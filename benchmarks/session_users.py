@@ -0,0 +1,62 @@
+"""Requests/sec on /matches for a logged-in player, with and without the session-user cache.
+
+    python -m benchmarks.session_users
+"""
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from app import create_app, db
+from app.models import Match, Player, RosterMembership, Season, Tournament, User
+
+def _seed(matches=40):
+    tournament = Tournament(name="Liga")
+    db.session.add(tournament)
+    db.session.flush()
+    season = Season(year=2026, term="Spring", tournament_id=tournament.id, is_active=True)
+    db.session.add(season)
+    db.session.flush()
+    player = Player(first_name="Luca", last_name="Rossi")
+    db.session.add(player)
+    db.session.flush()
+    db.session.add(RosterMembership(season_id=season.id, player_id=player.id))
+    for number in range(matches):
+        db.session.add(Match(
+            season_id=season.id,
+            date=date(2026, 3, 1) + timedelta(days=number),
+            opponent=f"Rivals {number}",
+        ))
+    user = User(username="luca", role="player", is_active=True, player_id=player.id)
+    user.set_password("pw")
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+def _requests_per_second(client, requests):
+    client.get("/matches")
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get("/matches")
+    return requests / (time.perf_counter() - start)
+
+def run(requests=1000):
+    for label, ttl in (("uncached (TTL 0)", 0), ("cached (TTL 30s)", 30)):
+        with tempfile.TemporaryDirectory() as tmp:
+            app = create_app({
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                "SESSION_USER_CACHE_TTL": ttl,
+            })
+            with app.app_context():
+                db.create_all()
+                user_id = _seed()
+            client = app.test_client()
+            with client.session_transaction() as session:
+                session["_user_id"] = str(user_id)
+                session["_fresh"] = True
+            rate = _requests_per_second(client, requests)
+            with app.app_context():
+                db.engine.dispose()
+        print(f"{label:>17}: {rate:7.1f} requests/sec on /matches")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,28 @@
+"""Telegram command parsing cost: shlex tokenizer vs the precompiled fast path.
+
+    python -m benchmarks.telegram_parser
+"""
+import timeit
+from app.services.telegram_commands import parse_command, parse_tokens, tokenize
+
+COMMANDS = {
+    "score": "/match 12 score 3-1",
+    "score + notes": '/match 12 score 3-1 notes "Great first half"',
+    "stats": "/match 5 stats Luca goals=2 y=1 r=0 played=1",
+    "stats, quoted": "/match 5 stats 'Luca Rossi' goals=2 y=1 r=0 played=1",
+}
+
+def _shlex_parse(text):
+    return parse_tokens(tokenize(text))
+
+def run(number=20_000):
+    for label, text in COMMANDS.items():
+        legacy = min(timeit.repeat(lambda: _shlex_parse(text), number=number, repeat=3))
+        fast = min(timeit.repeat(lambda: parse_command(text), number=number, repeat=3))
+        print(
+            f"{label:>14}: shlex {legacy / number * 1e6:6.2f} us, "
+            f"fast path {fast / number * 1e6:6.2f} us ({legacy / fast:4.1f}x)"
+        )
+
+if __name__ == "__main__":
+    run()
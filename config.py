@@ -1,8 +1,61 @@
 import os
 
+def _database_url():
+    url = os.environ.get("DATABASE_URL")
+    # Some hosts still hand out the pre-1.4 "postgres://" scheme.
+    if url and url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    return url
+
 class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY", "dev-secret")
-    SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL", "sqlite:///instance/app.db")
+    # Empty means instance/app.db (resolved in create_app).
+    SQLALCHEMY_DATABASE_URI = _database_url()
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": int(os.environ.get("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": True,
+    }
+    # Applied to every new SQLite connection; ignored for other databases.
+    SQLITE_PRAGMAS = {
+        "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        "cache_size": int(os.environ.get("SQLITE_CACHE_SIZE", "-65536")),
+        "temp_store": "MEMORY",
+    }
+    CURRENT_SEASON_CACHE_TTL = int(os.environ.get("CURRENT_SEASON_CACHE_TTL", "60"))
+    # Seconds a logged-in user's role/player/active flags are served from memory; 0 disables.
+    SESSION_USER_CACHE_TTL = int(os.environ.get("SESSION_USER_CACHE_TTL", "30"))
+    # Memory cap for rendered match cards / season stat rows per process; 0 disables.
+    FRAGMENT_CACHE_MAX_BYTES = int(os.environ.get("FRAGMENT_CACHE_MAX_BYTES", str(4 * 1024 * 1024)))
+    # Werkzeug hash method string; stored hashes made differently are upgraded at login.
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_SALT_LENGTH = int(os.environ.get("PASSWORD_SALT_LENGTH", "16"))
+    # Concurrent hash/verify calls per process (default: CPU count) and how long
+    # a login waits for a slot before getting a 503.
+    PASSWORD_CHECK_CONCURRENCY = int(os.environ.get("PASSWORD_CHECK_CONCURRENCY", "0")) or None
+    PASSWORD_CHECK_WAIT = float(os.environ.get("PASSWORD_CHECK_WAIT", "10"))
+    # Opt-in SQL/request timing: Server-Timing headers, /admin/perf and a log of
+    # statements slower than SLOW_QUERY_MS (also written to SLOW_QUERY_LOG if set).
+    PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+    PROFILING_WINDOW = int(os.environ.get("PROFILING_WINDOW", "500"))
+    SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "100"))
+    SLOW_QUERY_LOG = os.environ.get("SLOW_QUERY_LOG")
+    # Live match updates over SSE: seconds between keep-alives and before a
+    # stream closes (browsers reconnect and resume from Last-Event-ID).
+    LIVE_STREAM_HEARTBEAT = float(os.environ.get("LIVE_STREAM_HEARTBEAT", "15"))
+    LIVE_STREAM_MAX_SECONDS = float(os.environ.get("LIVE_STREAM_MAX_SECONDS", "300"))
     TELEGRAM_INGEST_SECRET = os.environ.get("TELEGRAM_INGEST_SECRET")
     TELEGRAM_ADMIN_IDS = os.environ.get("TELEGRAM_ADMIN_IDS", "")
+    # "sync" applies commands inside the webhook request; "queue" answers 202
+    # and leaves them to `flask telegram-worker`.
+    TELEGRAM_INGEST_MODE = os.environ.get("TELEGRAM_INGEST_MODE", "sync")
+    # Re-deliveries without an update_id are matched on sender + text within
+    # this many seconds; stored responses are kept for TELEGRAM_DEDUP_TTL.
+    TELEGRAM_DEDUP_WINDOW = int(os.environ.get("TELEGRAM_DEDUP_WINDOW", "60"))
+    TELEGRAM_DEDUP_TTL = int(os.environ.get("TELEGRAM_DEDUP_TTL", str(24 * 60 * 60)))
@@ -0,0 +1,60 @@
+"""Add season_player_totals aggregate
+
+Revision ID: 7c1e5b2f9a04
+Revises: 4a9b8c7d1b32
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e5b2f9a04'
+down_revision = '4a9b8c7d1b32'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('season_player_totals',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('season_id', sa.Integer(), nullable=False),
+        sa.Column('player_id', sa.Integer(), nullable=False),
+        sa.Column('games_played', sa.Integer(), nullable=False),
+        sa.Column('goals', sa.Integer(), nullable=False),
+        sa.Column('yellow_cards', sa.Integer(), nullable=False),
+        sa.Column('red_cards', sa.Integer(), nullable=False),
+        sa.Column('mvp_votes_received', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id'], ),
+        sa.ForeignKeyConstraint(['season_id'], ['seasons.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('season_id', 'player_id', name='uq_season_player_totals')
+    )
+
+    # Backfill from existing stats and votes (same as `flask rebuild-season-totals`).
+    op.execute("""
+        INSERT INTO season_player_totals (
+            season_id, player_id, games_played, goals, yellow_cards, red_cards,
+            mvp_votes_received, created_at, updated_at
+        )
+        SELECT season_id, player_id, SUM(games_played), SUM(goals), SUM(yellow_cards),
+               SUM(red_cards), SUM(mvp_votes_received), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        FROM (
+            SELECT m.season_id AS season_id, s.player_id AS player_id,
+                   CASE WHEN s.played THEN 1 ELSE 0 END AS games_played,
+                   s.goals AS goals, s.yellow_cards AS yellow_cards, s.red_cards AS red_cards,
+                   0 AS mvp_votes_received
+            FROM match_player_stats s JOIN matches m ON m.id = s.match_id
+            UNION ALL
+            SELECT m.season_id, v.voted_player_id, 0, 0, 0, 0, 1
+            FROM mvp_votes v JOIN matches m ON m.id = v.match_id
+        ) AS contributions
+        GROUP BY season_id, player_id
+    """)
+
+
+def downgrade():
+    op.drop_table('season_player_totals')
@@ -0,0 +1,43 @@
+"""Add secondary indexes for hot filter/join paths
+
+Revision ID: 9d3f6a1c2b57
+Revises: 7c1e5b2f9a04
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3f6a1c2b57'
+down_revision = '7c1e5b2f9a04'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    # matches.list_matches / season_stats: season filter ordered by (date, id)
+    ('ix_matches_season_date_id', 'matches', ['season_id', 'date', 'id']),
+    # admin.matches: every match ordered by (date, id)
+    ('ix_matches_date_id', 'matches', ['date', 'id']),
+    ('ix_match_player_stats_player_id', 'match_player_stats', ['player_id']),
+    # MVP results grouped by voted player for one match
+    ('ix_mvp_votes_match_voted', 'mvp_votes', ['match_id', 'voted_player_id']),
+    ('ix_mvp_votes_voted_player_id', 'mvp_votes', ['voted_player_id']),
+    # roster lookups by season and status (vote, match_stats, season_roster)
+    ('ix_roster_memberships_season_status_player', 'roster_memberships', ['season_id', 'status', 'player_id']),
+    ('ix_roster_memberships_player_id', 'roster_memberships', ['player_id']),
+    ('ix_seasons_is_active', 'seasons', ['is_active']),
+    ('ix_seasons_tournament_id', 'seasons', ['tournament_id']),
+    ('ix_users_player_id', 'users', ['player_id']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
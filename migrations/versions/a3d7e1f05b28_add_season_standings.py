@@ -0,0 +1,65 @@
+"""Add season_standings read model
+
+Revision ID: a3d7e1f05b28
+Revises: f1a6d4c92e73
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from datetime import datetime, timezone
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d7e1f05b28'
+down_revision = 'f1a6d4c92e73'
+branch_labels = None
+depends_on = None
+
+FORM_LENGTH = 5
+
+
+def upgrade():
+    standings = op.create_table('season_standings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('season_id', sa.Integer(), nullable=False),
+        sa.Column('played', sa.Integer(), nullable=False),
+        sa.Column('won', sa.Integer(), nullable=False),
+        sa.Column('drawn', sa.Integer(), nullable=False),
+        sa.Column('lost', sa.Integer(), nullable=False),
+        sa.Column('goals_for', sa.Integer(), nullable=False),
+        sa.Column('goals_against', sa.Integer(), nullable=False),
+        sa.Column('form', sa.String(length=10), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['season_id'], ['seasons.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('season_id', name='uq_season_standings_season')
+    )
+
+    # Backfill from played matches (same as `flask rebuild-standings`).
+    results = op.get_bind().execute(sa.text("""
+        SELECT season_id, COALESCE(our_score, 0), COALESCE(their_score, 0)
+        FROM matches
+        WHERE status = 'played'
+        ORDER BY season_id, date, id
+    """))
+    rows = {}
+    for season_id, ours, theirs in results:
+        row = rows.setdefault(season_id, {
+            'season_id': season_id, 'played': 0, 'won': 0, 'drawn': 0, 'lost': 0,
+            'goals_for': 0, 'goals_against': 0, 'form': '',
+        })
+        letter = 'W' if ours > theirs else ('D' if ours == theirs else 'L')
+        row['played'] += 1
+        row[{'W': 'won', 'D': 'drawn', 'L': 'lost'}[letter]] += 1
+        row['goals_for'] += ours
+        row['goals_against'] += theirs
+        row['form'] = (row['form'] + letter)[-FORM_LENGTH:]
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    if rows:
+        op.bulk_insert(standings, [dict(row, created_at=now, updated_at=now) for row in rows.values()])
+
+
+def downgrade():
+    op.drop_table('season_standings')
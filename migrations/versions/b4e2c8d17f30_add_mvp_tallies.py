@@ -0,0 +1,43 @@
+"""Add mvp_tallies counters
+
+Revision ID: b4e2c8d17f30
+Revises: 9d3f6a1c2b57
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e2c8d17f30'
+down_revision = '9d3f6a1c2b57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('mvp_tallies',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('match_id', sa.Integer(), nullable=False),
+        sa.Column('player_id', sa.Integer(), nullable=False),
+        sa.Column('votes', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['match_id'], ['matches.id'], ),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('match_id', 'player_id', name='uq_mvp_tallies_match_player')
+    )
+
+    # Backfill from existing votes (same as `flask check-mvp-tallies --fix`).
+    op.execute("""
+        INSERT INTO mvp_tallies (match_id, player_id, votes, created_at, updated_at)
+        SELECT match_id, voted_player_id, COUNT(*), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        FROM mvp_votes
+        GROUP BY match_id, voted_player_id
+    """)
+
+
+def downgrade():
+    op.drop_table('mvp_tallies')
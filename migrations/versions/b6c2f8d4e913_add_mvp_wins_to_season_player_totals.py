@@ -0,0 +1,44 @@
+"""Add mvp_wins to season_player_totals
+
+Revision ID: b6c2f8d4e913
+Revises: a3d7e1f05b28
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6c2f8d4e913'
+down_revision = 'a3d7e1f05b28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('season_player_totals', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('mvp_wins', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_season_player_totals_player_id', ['player_id'], unique=False)
+
+    # A win is topping a match's tallies, ties included (same as the rebuild).
+    op.execute("""
+        UPDATE season_player_totals SET mvp_wins = (
+            SELECT COUNT(*)
+            FROM mvp_tallies t
+            JOIN matches m ON m.id = t.match_id
+            WHERE m.season_id = season_player_totals.season_id
+              AND t.player_id = season_player_totals.player_id
+              AND t.votes > 0
+              AND t.votes = (SELECT MAX(votes) FROM mvp_tallies top WHERE top.match_id = t.match_id)
+        )
+    """)
+
+    with op.batch_alter_table('season_player_totals', schema=None) as batch_op:
+        batch_op.alter_column('mvp_wins', existing_type=sa.Integer(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('season_player_totals', schema=None) as batch_op:
+        batch_op.drop_index('ix_season_player_totals_player_id')
+        batch_op.drop_column('mvp_wins')
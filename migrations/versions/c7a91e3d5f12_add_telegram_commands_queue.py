@@ -0,0 +1,44 @@
+"""Add telegram_commands ingest queue
+
+Revision ID: c7a91e3d5f12
+Revises: b4e2c8d17f30
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7a91e3d5f12'
+down_revision = 'b4e2c8d17f30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('telegram_commands',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=128), nullable=True),
+        sa.Column('telegram_user_id', sa.String(length=32), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('is_batch', sa.Boolean(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('claim_token', sa.String(length=32), nullable=True),
+        sa.Column('claimed_at', sa.DateTime(), nullable=True),
+        sa.Column('response', sa.JSON(), nullable=True),
+        sa.Column('response_status', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('applied_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('idempotency_key', name='uq_telegram_commands_idempotency_key')
+    )
+    with op.batch_alter_table('telegram_commands', schema=None) as batch_op:
+        batch_op.create_index('ix_telegram_commands_status_id', ['status', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('telegram_commands', schema=None) as batch_op:
+        batch_op.drop_index('ix_telegram_commands_status_id')
+
+    op.drop_table('telegram_commands')
@@ -0,0 +1,72 @@
+"""Add leaderboard_totals for top-k leaderboards
+
+Revision ID: c9e4a2b7d615
+Revises: b6c2f8d4e913
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9e4a2b7d615'
+down_revision = 'b6c2f8d4e913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('leaderboard_totals',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('scope', sa.String(length=32), nullable=False),
+        sa.Column('player_id', sa.Integer(), nullable=False),
+        sa.Column('goals', sa.Integer(), nullable=False),
+        sa.Column('yellow_cards', sa.Integer(), nullable=False),
+        sa.Column('red_cards', sa.Integer(), nullable=False),
+        sa.Column('cards', sa.Integer(), nullable=False),
+        sa.Column('mvp_votes_received', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('scope', 'player_id', name='uq_leaderboard_totals_scope_player')
+    )
+    with op.batch_alter_table('leaderboard_totals', schema=None) as batch_op:
+        batch_op.create_index('ix_leaderboard_totals_goals', ['scope', 'goals', 'player_id'], unique=False)
+        batch_op.create_index('ix_leaderboard_totals_cards', ['scope', 'cards', 'player_id'], unique=False)
+        batch_op.create_index('ix_leaderboard_totals_mvp_votes', ['scope', 'mvp_votes_received', 'player_id'], unique=False)
+
+    # Backfill from the season totals (same as `flask rebuild-season-totals`).
+    op.execute("""
+        INSERT INTO leaderboard_totals (
+            scope, player_id, goals, yellow_cards, red_cards, cards,
+            mvp_votes_received, created_at, updated_at
+        )
+        SELECT 'all', player_id, SUM(goals), SUM(yellow_cards), SUM(red_cards),
+               SUM(yellow_cards + red_cards), SUM(mvp_votes_received),
+               CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        FROM season_player_totals
+        GROUP BY player_id
+    """)
+    op.execute("""
+        INSERT INTO leaderboard_totals (
+            scope, player_id, goals, yellow_cards, red_cards, cards,
+            mvp_votes_received, created_at, updated_at
+        )
+        SELECT 'tournament:' || s.tournament_id, t.player_id, SUM(t.goals),
+               SUM(t.yellow_cards), SUM(t.red_cards), SUM(t.yellow_cards + t.red_cards),
+               SUM(t.mvp_votes_received), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        FROM season_player_totals t
+        JOIN seasons s ON s.id = t.season_id
+        GROUP BY s.tournament_id, t.player_id
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('leaderboard_totals', schema=None) as batch_op:
+        batch_op.drop_index('ix_leaderboard_totals_mvp_votes')
+        batch_op.drop_index('ix_leaderboard_totals_cards')
+        batch_op.drop_index('ix_leaderboard_totals_goals')
+
+    op.drop_table('leaderboard_totals')
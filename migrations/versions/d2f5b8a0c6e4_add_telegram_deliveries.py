@@ -0,0 +1,37 @@
+"""Add telegram_deliveries dedup table
+
+Revision ID: d2f5b8a0c6e4
+Revises: c7a91e3d5f12
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f5b8a0c6e4'
+down_revision = 'c7a91e3d5f12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('telegram_deliveries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=128), nullable=False),
+        sa.Column('response', sa.JSON(), nullable=False),
+        sa.Column('response_status', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('idempotency_key', name='uq_telegram_deliveries_idempotency_key')
+    )
+    with op.batch_alter_table('telegram_deliveries', schema=None) as batch_op:
+        batch_op.create_index('ix_telegram_deliveries_created_at', ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('telegram_deliveries', schema=None) as batch_op:
+        batch_op.drop_index('ix_telegram_deliveries_created_at')
+
+    op.drop_table('telegram_deliveries')
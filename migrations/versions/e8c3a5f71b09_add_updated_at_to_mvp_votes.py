@@ -0,0 +1,31 @@
+"""Add updated_at to mvp_votes
+
+Revision ID: e8c3a5f71b09
+Revises: d2f5b8a0c6e4
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8c3a5f71b09'
+down_revision = 'd2f5b8a0c6e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('mvp_votes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    op.execute("UPDATE mvp_votes SET updated_at = created_at")
+
+    with op.batch_alter_table('mvp_votes', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('mvp_votes', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,32 @@
+"""Add resource_versions write counters
+
+Revision ID: f1a6d4c92e73
+Revises: e8c3a5f71b09
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a6d4c92e73'
+down_revision = 'e8c3a5f71b09'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('resource_versions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('key', name='uq_resource_versions_key')
+    )
+
+
+def downgrade():
+    op.drop_table('resource_versions')
@@ -0,0 +1,107 @@
+import unittest
+from contextlib import contextmanager
+from datetime import date
+from flask import g
+from sqlalchemy import event
+from app import create_app, db
+from app.models import (
+    Tournament,
+    Season,
+    Player,
+    RosterMembership,
+    Match,
+    User,
+)
+from app.services.season_cache import invalidate_current_season
+from app.services.session_users import invalidate_session_user
+
+TEST_CONFIG = {
+    "TESTING": True,
+    "SECRET_KEY": "test",
+    "SQLALCHEMY_DATABASE_URI": "sqlite://",
+    "TELEGRAM_INGEST_SECRET": "secret",
+    "TELEGRAM_ADMIN_IDS": "42",
+}
+
+class AppTestCase(unittest.TestCase):
+    """Base case with an in-memory database and small fixture helpers."""
+
+    config = {}
+
+    def setUp(self):
+        self.app = create_app({**TEST_CONFIG, **self.config})
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def make_season(self, year=2026, term="Spring", tournament_name="Liga", is_active=True):
+        tournament = Tournament.query.filter_by(name=tournament_name).first()
+        if not tournament:
+            tournament = Tournament(name=tournament_name)
+            db.session.add(tournament)
+            db.session.flush()
+        season = Season(year=year, term=term, tournament_id=tournament.id, is_active=is_active)
+        db.session.add(season)
+        db.session.commit()
+        invalidate_current_season()
+        return season
+
+    def make_player(self, first_name, last_name, season=None):
+        player = Player(first_name=first_name, last_name=last_name)
+        db.session.add(player)
+        db.session.flush()
+        if season:
+            db.session.add(RosterMembership(season_id=season.id, player_id=player.id))
+        db.session.commit()
+        return player
+
+    def make_match(self, season, opponent="Rivals", match_date=None, status="scheduled"):
+        match = Match(
+            season_id=season.id,
+            date=match_date or date(2026, 3, 1),
+            opponent=opponent,
+            status=status,
+        )
+        db.session.add(match)
+        db.session.commit()
+        return match
+
+    def make_user(self, username, role="player", player=None, password="pw"):
+        user = User(
+            username=username,
+            role=role,
+            is_active=True,
+            player_id=player.id if player else None,
+        )
+        user.set_password(password)
+        db.session.add(user)
+        db.session.commit()
+        return user
+
+    def login(self, user):
+        # Requests share this test's app context, so drop Flask-Login's cached user.
+        g.pop("_login_user", None)
+        invalidate_session_user(user.id)
+        with self.client.session_transaction() as session:
+            session["_user_id"] = str(user.id)
+            session["_fresh"] = True
+
+    @contextmanager
+    def capture_queries(self):
+        """Collect ``(statement, parameters)`` for every SQL statement executed."""
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
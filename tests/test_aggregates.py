@@ -0,0 +1,182 @@
+import unittest
+from app import db
+from app.models import MVPTally, SeasonPlayerTotal
+from app.services.aggregates import find_mvp_tally_drift, rebuild_mvp_tallies, rebuild_season_totals
+from tests.support import AppTestCase
+
+class SeasonTotalsTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.season = self.make_season()
+        self.luca = self.make_player("Luca", "Rossi", self.season)
+        self.marco = self.make_player("Marco", "Bianchi", self.season)
+        self.match = self.make_match(self.season, status="played")
+        self.admin = self.make_user("admin", role="admin")
+
+    def totals(self, player):
+        return SeasonPlayerTotal.query.filter_by(
+            season_id=self.season.id,
+            player_id=player.id,
+        ).first()
+
+    def post_stats(self, goals):
+        self.login(self.admin)
+        form = {}
+        for player in (self.luca, self.marco):
+            form[f"played_{player.id}"] = "on"
+            form[f"goals_{player.id}"] = str(goals.get(player.id, 0))
+        return self.client.post(f"/admin/matches/{self.match.id}/stats", data=form)
+
+    def test_match_stats_updates_totals_incrementally(self):
+        self.post_stats({self.luca.id: 2})
+        self.post_stats({self.luca.id: 1, self.marco.id: 3})
+
+        db.session.expire_all()
+        self.assertEqual(self.totals(self.luca).goals, 1)
+        self.assertEqual(self.totals(self.luca).games_played, 1)
+        self.assertEqual(self.totals(self.marco).goals, 3)
+
+    def test_vote_change_moves_mvp_vote(self):
+        voter = self.make_player("Pablo", "Diaz", self.season)
+        self.login(self.make_user("pablo", player=voter))
+        url = f"/matches/{self.match.id}/vote"
+        self.client.post(url, data={"voted_player_id": self.luca.id})
+        self.client.post(url, data={"voted_player_id": self.marco.id})
+
+        db.session.expire_all()
+        self.assertEqual(self.totals(self.luca).mvp_votes_received, 0)
+        self.assertEqual(self.totals(self.marco).mvp_votes_received, 1)
+
+    def test_mvp_wins_follow_the_lead_including_ties(self):
+        url = f"/matches/{self.match.id}/vote"
+        voters = [self.make_player(name, "Voter", self.season) for name in ("Pablo", "Diego")]
+        users = [self.make_user(player.first_name.lower(), player=player) for player in voters]
+
+        def wins():
+            db.session.expire_all()
+            # The rebuild leaves no row for a player without stats or votes.
+            return tuple(
+                getattr(self.totals(player), "mvp_wins", 0)
+                for player in (self.luca, self.marco)
+            )
+
+        self.login(users[0])
+        self.client.post(url, data={"voted_player_id": self.luca.id})
+        self.login(users[1])
+        self.client.post(url, data={"voted_player_id": self.marco.id})
+        self.assertEqual(wins(), (1, 1))
+
+        self.client.post(url, data={"voted_player_id": self.luca.id})
+        self.assertEqual(wins(), (1, 0))
+
+        rebuild_season_totals(self.season.id)
+        db.session.commit()
+        self.assertEqual(wins(), (1, 0))
+
+    def test_rebuild_matches_incremental_totals(self):
+        self.post_stats({self.luca.id: 2, self.marco.id: 1})
+        before = {
+            (row.player_id, row.goals, row.games_played)
+            for row in SeasonPlayerTotal.query.all()
+        }
+
+        rebuild_season_totals(self.season.id)
+        db.session.commit()
+
+        after = {
+            (row.player_id, row.goals, row.games_played)
+            for row in SeasonPlayerTotal.query.all()
+        }
+        self.assertEqual(before, after)
+
+    def test_season_stats_page_reads_totals(self):
+        self.post_stats({self.luca.id: 4})
+        response = self.client.get(f"/seasons/{self.season.id}/stats")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"4 goals", response.data)
+
+class MVPTallyTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.season = self.make_season()
+        self.luca = self.make_player("Luca", "Rossi", self.season)
+        self.marco = self.make_player("Marco", "Bianchi", self.season)
+        self.match = self.make_match(self.season, status="played")
+
+    def vote(self, voter, player):
+        self.login(voter)
+        return self.client.post(
+            f"/matches/{self.match.id}/vote",
+            data={"voted_player_id": player.id},
+        )
+
+    def tallies(self):
+        db.session.expire_all()
+        return {
+            tally.player_id: tally.votes
+            for tally in MVPTally.query.filter_by(match_id=self.match.id)
+        }
+
+    def test_votes_update_tallies(self):
+        pablo = self.make_user("pablo", player=self.make_player("Pablo", "Diaz", self.season))
+        juan = self.make_user("juan", player=self.make_player("Juan", "Perez", self.season))
+        self.vote(pablo, self.luca)
+        self.vote(juan, self.luca)
+        self.assertEqual(self.tallies(), {self.luca.id: 2})
+
+        self.vote(pablo, self.marco)
+        self.assertEqual(self.tallies(), {self.luca.id: 1, self.marco.id: 1})
+        self.assertEqual(find_mvp_tally_drift(), [])
+
+    def test_detail_page_reads_tallies(self):
+        pablo = self.make_user("pablo", player=self.make_player("Pablo", "Diaz", self.season))
+        self.vote(pablo, self.marco)
+        self.vote(pablo, self.luca)
+
+        response = self.client.get(f"/matches/{self.match.id}")
+        self.assertEqual(response.status_code, 200)
+        results = response.data.split(b"MVP results", 1)[1]
+        self.assertIn(b"Rossi, Luca", results)
+        self.assertNotIn(b"Bianchi, Marco", results)
+
+    def test_drift_is_reported_and_rebuilt(self):
+        pablo = self.make_user("pablo", player=self.make_player("Pablo", "Diaz", self.season))
+        self.vote(pablo, self.luca)
+        db.session.add(MVPTally(match_id=self.match.id, player_id=self.marco.id, votes=3))
+        MVPTally.query.filter_by(player_id=self.luca.id).delete()
+        db.session.commit()
+
+        self.assertEqual(
+            find_mvp_tally_drift(self.match.id),
+            [
+                (self.match.id, self.luca.id, 1, 0),
+                (self.match.id, self.marco.id, 0, 3),
+            ],
+        )
+
+        rebuild_mvp_tallies(self.match.id)
+        db.session.commit()
+        self.assertEqual(self.tallies(), {self.luca.id: 1})
+        self.assertEqual(find_mvp_tally_drift(), [])
+
+    def test_fix_command_rebuilds_mvp_wins(self):
+        pablo = self.make_user("pablo", player=self.make_player("Pablo", "Diaz", self.season))
+        self.vote(pablo, self.luca)
+        # Drifted tallies credited the win to Marco.
+        MVPTally.query.filter_by(player_id=self.luca.id).delete()
+        db.session.add(MVPTally(match_id=self.match.id, player_id=self.marco.id, votes=3))
+        db.session.add(SeasonPlayerTotal(season_id=self.season.id, player_id=self.marco.id, mvp_wins=1))
+        SeasonPlayerTotal.query.filter_by(player_id=self.luca.id).update({"mvp_wins": 0})
+        db.session.commit()
+
+        result = self.app.test_cli_runner().invoke(args=["check-mvp-tallies", "--fix"])
+        self.assertIn("MVP tallies rebuilt", result.output)
+        db.session.expire_all()
+        wins = {
+            row.player_id: row.mvp_wins
+            for row in SeasonPlayerTotal.query.filter_by(season_id=self.season.id)
+        }
+        self.assertEqual((wins[self.luca.id], wins.get(self.marco.id, 0)), (1, 0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from app import db
+from app.models import MatchPlayerStat, Player, RosterMembership, SeasonPlayerTotal
+from app.services.bulk_import import Importer, ImportFileError, json_records
+from app.services.leaderboards import top_players
+from app.services.standings import get_standing
+from tests.support import AppTestCase
+
+class JsonRecordsTests(unittest.TestCase):
+    def test_array_and_lines_stream_across_reads(self):
+        array = '[{"name": "a, ]b"}, {"name": "c"}]'
+        lines = '{"name": "a, ]b"}\n{"name": "c"}\n'
+        for text in (array, lines):
+            records = list(json_records(io.StringIO(text), read_size=4))
+            self.assertEqual(records, [{"name": "a, ]b"}, {"name": "c"}])
+
+    def test_values_split_at_any_point_still_decode(self):
+        record = {"flag": True, "none": None, "value": -1.5e3, "name": "x\u00e9y"}
+        text = json.dumps(record, ensure_ascii=True) + "\n" + json.dumps(record)
+        self.assertEqual(list(json_records(io.StringIO(text), read_size=1)), [record, record])
+
+    def test_malformed_record_fails_before_reading_the_rest(self):
+        handle = io.StringIO('{"a": 1}\n{"a": 1 2}\n' + '{"b": 2}\n' * 10000)
+        with self.assertRaises(ImportFileError):
+            list(json_records(handle, read_size=64))
+        self.assertLess(handle.tell(), 200)
+
+        handle = io.StringIO('{"a": "' + "x" * 10000)
+        with self.assertRaises(ImportFileError):
+            list(json_records(handle, read_size=64, max_record_size=1000))
+        self.assertLess(handle.tell(), 2000)
+
+class ImporterTests(unittest.TestCase):
+    def test_base_importer_cannot_be_instantiated(self):
+        with self.assertRaises(TypeError):
+            Importer()
+
+class BulkImportTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        season = self.make_season(tournament_name="Liga")
+        self.season_id = season.id
+        self.tmp = tempfile.TemporaryDirectory()
+        self.runner = self.app.test_cli_runner()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as handle:
+            handle.write(text)
+        return path
+
+    def run_import(self, kind, path, *args):
+        result = self.runner.invoke(args=["import", kind, path, *args])
+        db.session.expunge_all()
+        return result
+
+    def test_imports_players_rosters_matches_and_stats(self):
+        players = self.write("players.csv", "First_Name,last_name,jersey_number\nLuca,Rossi,9\nMarco,Bianchi,\n")
+        result = self.run_import("players", players, "--chunk-size", "1")
+        self.assertIn("Imported 2 players rows.", result.output)
+        self.assertEqual(Player.query.filter_by(last_name="Rossi").one().jersey_number, 9)
+
+        rosters = self.write("rosters.json", json.dumps([
+            {"tournament": "liga", "year": 2026, "term": "spring", "player": "Luca Rossi"},
+            {"season_id": self.season_id, "first_name": "Marco", "last_name": "Bianchi"},
+        ]))
+        self.assertEqual(self.run_import("rosters", rosters).exit_code, 0)
+        self.assertEqual(RosterMembership.query.count(), 2)
+
+        matches = self.write("matches.jsonl", "\n".join(json.dumps(row) for row in [
+            {"season_id": self.season_id, "date": "2026-03-01", "opponent": "Rivals", "status": "played",
+             "our_score": 3, "their_score": 1},
+            {"season_id": self.season_id, "date": "2026-03-08", "opponent": "Rivals"},
+        ]))
+        self.assertEqual(self.run_import("matches", matches).exit_code, 0)
+        self.assertEqual(get_standing(self.season_id).won, 1)
+
+        stats = self.write("stats.csv", (
+            "season_id,date,opponent,player,played,goals,yellow_cards,red_cards\n"
+            f"{self.season_id},2026-03-01,rivals,Luca Rossi,yes,2,1,\n"
+            f"{self.season_id},2026-03-01,Rivals,marco bianchi,0,,,\n"
+        ))
+        result = self.run_import("stats", stats)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("rows/s", result.output)
+        luca = SeasonPlayerTotal.query.join(Player).filter(Player.last_name == "Rossi").one()
+        self.assertEqual((luca.games_played, luca.goals, luca.yellow_cards), (1, 2, 1))
+        self.assertEqual([(player.last_name, value) for player, value in top_players("goals")], [("Rossi", 2)])
+
+    def test_invalid_rows_abort_unless_skipped(self):
+        luca_id = self.make_player("Luca", "Rossi").id
+        match_id = self.make_match(self.make_season(year=2025, is_active=False), status="played").id
+        stats = self.write("stats.csv", (
+            "match_id,player_id,player,goals\n"
+            f"{match_id},{luca_id},,1\n"
+            f"{match_id},,Nobody Here,1\n"
+            f"{match_id},{luca_id},,-1\n"
+            f"{match_id},{luca_id},,1\n"
+        ))
+        result = self.run_import("stats", stats)
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("Row 2: Unknown player 'Nobody Here'.", result.output)
+        self.assertIn("Row 3: Goals and cards must be zero or higher.", result.output)
+        self.assertIn("Row 4: Duplicate row for this match and player.", result.output)
+        self.assertEqual(MatchPlayerStat.query.count(), 0)
+
+        result = self.run_import("stats", stats, "--skip-invalid", "--chunk-size", "1")
+        self.assertIn("Imported 1 stats rows.", result.output)
+        self.assertEqual(MatchPlayerStat.query.one().goals, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import sys
+import unittest
+from flask import g
+from app import db
+from app.models import User
+from app.services.fragment_cache import FragmentCache, get_fragment_cache
+from tests.support import AppTestCase
+
+class FragmentCacheTests(unittest.TestCase):
+    def test_evicts_least_recently_used_past_the_cap(self):
+        html = "x" * 100
+        cache = FragmentCache(max_bytes=sys.getsizeof(html) * 2)
+        cache.put(("card", "match:1", None, 1), html)
+        cache.put(("card", "match:2", None, 1), html)
+        cache.get(("card", "match:1", None, 1))
+        cache.put(("card", "match:3", None, 1), html)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(("card", "match:2", None, 1)))
+        self.assertEqual(cache.get(("card", "match:1", None, 1)), html)
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+    def test_invalidate_drops_every_entry_for_a_version_key(self):
+        cache = FragmentCache()
+        cache.put(("row", "season:1", 7, (0, 1)), "a")
+        cache.put(("row", "season:1", 8, (0, 1)), "b")
+        cache.put(("row", "season:2", 7, (0, 1)), "c")
+        cache.invalidate("season:1")
+
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get(("row", "season:2", 7, (0, 1))), "c")
+
+    def test_zero_cap_disables_caching(self):
+        cache = FragmentCache(max_bytes=0)
+        cache.put(("card", "match:1", None, 1), "html")
+        self.assertEqual(len(cache), 0)
+
+class FragmentPageTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        season = self.make_season()
+        luca = self.make_player("Luca", "Rossi", season)
+        self.marco_id = self.make_player("Marco", "Bianchi", season).id
+        self.match_id = self.make_match(season, status="played").id
+        self.other_match_id = self.make_match(season, opponent="Others").id
+        self.season_id = season.id
+        self.user_id = self.make_user("luca", player=luca).id
+        self.login(db.session.get(User, self.user_id))
+
+    def get(self, url):
+        g.pop("_login_user", None)
+        db.session.expunge_all()
+        return self.client.get(url)
+
+    def cached_keys(self):
+        return set(get_fragment_cache()._entries)
+
+    def test_cards_and_rows_are_rendered_once_per_version(self):
+        first = self.get("/matches").data
+        self.get(f"/seasons/{self.season_id}/stats")
+        keys = self.cached_keys()
+        # Two match cards plus two stat rows.
+        self.assertEqual(len(keys), 4)
+
+        self.assertEqual(self.get("/matches").data, first)
+        self.get(f"/seasons/{self.season_id}/stats")
+        self.assertEqual(self.cached_keys(), keys)
+
+    def test_vote_refreshes_only_the_voted_match_and_season(self):
+        self.get("/matches")
+        self.get(f"/seasons/{self.season_id}/stats")
+        other_card = [key for key in self.cached_keys() if key[1] == f"match:{self.other_match_id}"]
+
+        self.client.post(f"/matches/{self.match_id}/vote", data={"voted_player_id": self.marco_id})
+        self.assertEqual(
+            {key[1] for key in self.cached_keys()},
+            {f"match:{self.other_match_id}"},
+        )
+
+        response = self.get(f"/seasons/{self.season_id}/stats")
+        self.assertIn(b"MVP votes: 1", response.data)
+        self.get("/matches")
+        self.assertTrue(set(other_card) <= self.cached_keys())
+
+    def test_telegram_score_update_shows_on_the_card(self):
+        self.get("/matches")
+        self.client.post(
+            "/api/telegram/admin",
+            json={"telegram_user_id": "42", "text": f"/match {self.match_id} score 3-1"},
+            headers={"X-TELEGRAM_SECRET": "secret"},
+        )
+        self.assertIn(b"3 - 1", self.get("/matches").data)
+
+if __name__ == "__main__":
+    unittest.main()
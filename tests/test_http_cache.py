@@ -0,0 +1,86 @@
+import unittest
+from flask import g
+from app import db
+from app.models import Season, User
+from app.services.season_cache import invalidate_current_season
+from tests.support import AppTestCase
+
+class PageEtagTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.season = self.make_season()
+        self.luca = self.make_player("Luca", "Rossi", self.season)
+        self.marco_id = self.make_player("Marco", "Bianchi", self.season).id
+        self.match_id = self.make_match(self.season, status="played").id
+        self.season_id = self.season.id
+        self.admin_id = self.make_user("admin", role="admin").id
+        self.player_user_id = self.make_user("luca", player=self.luca).id
+
+    def as_user(self, user_id):
+        self.login(db.session.get(User, user_id))
+
+    def get(self, url, etag=None):
+        g.pop("_login_user", None)
+        db.session.expunge_all()
+        headers = {"If-None-Match": etag} if etag else {}
+        return self.client.get(url, headers=headers)
+
+    def test_repeat_views_return_304_with_only_the_version_lookup(self):
+        self.as_user(self.player_user_id)
+        # The season page still loads the season and checks roster access first.
+        expected_queries = {
+            "/matches": 1,
+            f"/matches/{self.match_id}": 1,
+            f"/seasons/{self.season_id}/stats": 3,
+        }
+        for url, expected in expected_queries.items():
+            etag = self.get(url).headers["ETag"]
+            with self.capture_queries() as statements:
+                response = self.get(url, etag)
+            self.assertEqual(response.status_code, 304, url)
+            self.assertEqual(len(statements), expected, url)
+            self.assertIn("resource_versions", statements[-1][0])
+
+    def test_writes_change_the_etag(self):
+        self.as_user(self.player_user_id)
+        list_etag = self.get("/matches").headers["ETag"]
+        detail_etag = self.get(f"/matches/{self.match_id}").headers["ETag"]
+
+        self.client.post(f"/matches/{self.match_id}/vote", data={"voted_player_id": self.marco_id})
+        self.assertEqual(self.get(f"/matches/{self.match_id}", detail_etag).status_code, 200)
+
+        list_etag = self.get("/matches").headers["ETag"]
+        self.client.post(
+            "/api/telegram/admin",
+            json={"telegram_user_id": "42", "text": f"/match {self.match_id} score 2-1"},
+            headers={"X-TELEGRAM_SECRET": "secret"},
+        )
+        self.assertEqual(self.get("/matches", list_etag).status_code, 200)
+
+    def test_switching_the_current_season_changes_the_etag(self):
+        self.as_user(self.player_user_id)
+        etag = self.get("/matches").headers["ETag"]
+        other = self.make_season(year=2027, is_active=False)
+        db.session.get(Season, self.season_id).is_active = False
+        other.is_active = True
+        db.session.commit()
+        invalidate_current_season()
+        self.assertEqual(self.get("/matches", etag).status_code, 200)
+
+    def test_etag_is_per_user(self):
+        self.as_user(self.player_user_id)
+        player_etag = self.get("/matches").headers["ETag"]
+        self.as_user(self.admin_id)
+        self.assertEqual(self.get("/matches", player_etag).status_code, 200)
+
+    def test_pending_flash_messages_are_rendered(self):
+        self.as_user(self.player_user_id)
+        etag = self.get("/matches").headers["ETag"]
+        with self.client.session_transaction() as session:
+            session["_flashes"] = [("success", "Your vote has been recorded.")]
+        response = self.get("/matches", etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"Your vote has been recorded.", response.data)
+
+if __name__ == "__main__":
+    unittest.main()
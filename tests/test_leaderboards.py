@@ -0,0 +1,98 @@
+import unittest
+from app import db
+from app.models import LeaderboardTotal
+from app.services.aggregates import rebuild_season_totals
+from app.services.leaderboards import MAX_K, top_players
+from tests.support import AppTestCase
+
+class LeaderboardTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        liga = self.make_season(year=2025, tournament_name="Liga", is_active=False)
+        copa = self.make_season(year=2026, tournament_name="Copa")
+        self.luca = self.make_player("Luca", "Rossi", liga)
+        self.marco = self.make_player("Marco", "Bianchi", liga)
+        self.liga_tournament_id = liga.tournament_id
+        self.copa_tournament_id = copa.tournament_id
+        self.liga_match = self.make_match(liga, status="played")
+        self.copa_match = self.make_match(copa, status="played")
+        self.admin = self.make_user("admin", role="admin")
+
+    def post_stats(self, match, rows):
+        self.login(self.admin)
+        form = {}
+        for player, goals, yellow in rows:
+            form[f"played_{player.id}"] = "on"
+            form[f"goals_{player.id}"] = str(goals)
+            form[f"yellow_{player.id}"] = str(yellow)
+        self.client.post(f"/admin/matches/{match.id}/stats", data=form)
+
+    def nonzero_rows(self):
+        # The rebuild also writes all-zero rows, which never rank.
+        return {
+            (row.scope, row.player_id, row.goals, row.cards, row.mvp_votes_received)
+            for row in LeaderboardTotal.query.all()
+            if row.goals or row.cards or row.mvp_votes_received
+        }
+
+    def ranking(self, metric, tournament_id=None, k=10):
+        return [(player.last_name, value) for player, value in top_players(metric, tournament_id, k)]
+
+    def test_writes_keep_tournament_and_all_time_boards_current(self):
+        self.post_stats(self.liga_match, [(self.luca, 3, 0), (self.marco, 1, 1)])
+        self.post_stats(self.copa_match, [(self.luca, 0, 0), (self.marco, 4, 1)])
+
+        self.assertEqual(self.ranking("goals"), [("Bianchi", 5), ("Rossi", 3)])
+        self.assertEqual(self.ranking("goals", self.liga_tournament_id), [("Rossi", 3), ("Bianchi", 1)])
+        self.assertEqual(self.ranking("goals", self.copa_tournament_id), [("Bianchi", 4)])
+        self.assertEqual(self.ranking("cards"), [("Bianchi", 2)])
+        self.assertEqual(self.ranking("goals", k=1), [("Bianchi", 5)])
+
+        before = self.nonzero_rows()
+        rebuild_season_totals()
+        db.session.commit()
+        self.assertEqual(self.nonzero_rows(), before)
+
+    def test_top_k_reads_the_metric_index(self):
+        with self.capture_queries() as statements:
+            top_players("goals", self.liga_tournament_id, k=5)
+        statement, parameters = statements[-1]
+        with db.engine.connect() as connection:
+            plan = " ".join(
+                row[-1]
+                for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+            )
+        self.assertIn("ix_leaderboard_totals_goals", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_endpoints_cap_k(self):
+        self.post_stats(self.liga_match, [(self.luca, 2, 0)])
+        self.login(self.admin)
+        response = self.client.get("/leaderboards/goals.json?k=1000")
+        self.assertEqual(response.json["players"][0]["value"], 2)
+
+        page = self.client.get(f"/leaderboards/mvp_votes?tournament_id={self.liga_tournament_id}")
+        self.assertEqual(page.status_code, 200)
+        self.assertIn(f'name="k" value="{MAX_K}"'.encode(), self.client.get("/leaderboards/goals?k=999").data)
+        self.assertEqual(self.client.get("/leaderboards/assists").status_code, 404)
+
+    def test_players_only_see_tournaments_they_were_rostered_in(self):
+        self.post_stats(self.liga_match, [(self.luca, 3, 0)])
+        self.post_stats(self.copa_match, [(self.marco, 4, 0)])
+        self.login(self.make_user("luca", player=self.luca))
+
+        response = self.client.get("/leaderboards/goals.json")
+        self.assertEqual([row["value"] for row in response.json["players"]], [3])
+        self.assertEqual(self.client.get(f"/leaderboards/goals.json?tournament_id={self.copa_tournament_id}").status_code, 404)
+        page = self.client.get("/leaderboards/goals")
+        self.assertIn(b"Liga", page.data)
+        self.assertNotIn(b"Copa", page.data)
+
+        self.login(self.make_user("outsider", player=self.make_player("Ivo", "Neri")))
+        self.assertEqual(self.client.get("/leaderboards/goals.json").json["players"], [])
+        self.assertEqual(self.client.get(f"/leaderboards/goals?tournament_id={self.liga_tournament_id}").status_code, 404)
+        self.login(self.make_user("coach"))
+        self.assertEqual(self.client.get("/leaderboards/goals.json").status_code, 403)
+
+if __name__ == "__main__":
+    unittest.main()
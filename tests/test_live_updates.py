@@ -0,0 +1,115 @@
+import threading
+import unittest
+from app import db
+from app.services.live_updates import LiveBroker, get_broker, queue_event
+from tests.support import AppTestCase
+
+class LiveBrokerTests(unittest.TestCase):
+    def test_waiting_subscribers_all_receive_a_publish(self):
+        broker = LiveBroker()
+        channel = broker.subscribe(7)
+        received = []
+
+        def listen():
+            received.append(broker.wait(channel, 0, timeout=5))
+
+        threads = [threading.Thread(target=listen) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        broker.publish(7, "score", {"our_score": 1})
+        for thread in threads:
+            thread.join()
+        self.assertEqual(received, [[(1, "score", {"our_score": 1})]] * 20)
+
+    def test_events_without_subscribers_are_dropped(self):
+        broker = LiveBroker()
+        broker.publish(7, "score", {})
+        channel = broker.subscribe(7)
+        self.assertEqual(broker.wait(channel, 0, timeout=0), [])
+        broker.unsubscribe(7, channel)
+        self.assertEqual(broker._channels, {})
+
+    def test_reconnect_after_last_unsubscribe_resumes_sequence(self):
+        broker = LiveBroker()
+        channel = broker.subscribe(7)
+        for score in range(3):
+            broker.publish(7, "score", {"our_score": score})
+        broker.unsubscribe(7, channel)
+
+        channel = broker.subscribe(7)
+        broker.publish(7, "score", {"our_score": 3})
+        self.assertEqual(broker.wait(channel, 3, timeout=0), [(4, "score", {"our_score": 3})])
+
+class LiveUpdateRouteTests(AppTestCase):
+    config = {"LIVE_STREAM_HEARTBEAT": 0.05, "LIVE_STREAM_MAX_SECONDS": 0.2}
+
+    def setUp(self):
+        super().setUp()
+        season = self.make_season()
+        self.luca_id = self.make_player("Luca", "Rossi", season).id
+        voter = self.make_player("Pablo", "Diaz", season)
+        self.match_id = self.make_match(season, status="played").id
+        self.login(self.make_user("pablo", player=voter))
+        self.channel = get_broker().subscribe(self.match_id)
+
+    def tearDown(self):
+        get_broker().unsubscribe(self.match_id, self.channel)
+        super().tearDown()
+
+    def events(self):
+        return get_broker().wait(self.channel, 0, timeout=0)
+
+    def test_vote_publishes_tally_delta_after_commit(self):
+        self.client.post(f"/matches/{self.match_id}/vote", data={"voted_player_id": self.luca_id})
+        [(_, kind, data)] = self.events()
+        self.assertEqual(kind, "tally")
+        self.assertEqual(data["deltas"], [{"player_id": self.luca_id, "delta": 1, "name": "Rossi, Luca"}])
+
+    def test_telegram_score_publishes_score(self):
+        self.client.post(
+            "/api/telegram/admin",
+            json={"telegram_user_id": "42", "text": f"/match {self.match_id} score 2-0"},
+            headers={"X-TELEGRAM_SECRET": "secret"},
+        )
+        [(_, kind, data)] = self.events()
+        self.assertEqual((kind, data["our_score"], data["their_score"], data["status"]), ("score", 2, 0, "played"))
+
+    def test_rolled_back_events_are_not_published(self):
+        queue_event(self.match_id, "score", {})
+        db.session.rollback()
+        db.session.commit()
+        self.assertEqual(self.events(), [])
+
+    def test_page_carries_the_sequence_it_includes(self):
+        get_broker().publish(self.match_id, "score", {"our_score": 3})
+        response = self.client.get(f"/matches/{self.match_id}")
+        self.assertIn(b'id="live-match" data-sequence="1"', response.data)
+
+        # With nobody subscribed the page still reports the last sequence.
+        get_broker().unsubscribe(self.match_id, self.channel)
+        self.assertEqual(get_broker().sequence(self.match_id), 1)
+        self.channel = get_broker().subscribe(self.match_id)
+
+    def test_stream_resumes_from_last_event_id(self):
+        get_broker().publish(self.match_id, "score", {"our_score": 3})
+        response = self.client.get(
+            f"/matches/{self.match_id}/events",
+            headers={"Last-Event-ID": "0"},
+        )
+        self.assertEqual(response.mimetype, "text/event-stream")
+        body = response.get_data(as_text=True)
+        self.assertIn('id: 1\nevent: score\ndata: {"our_score": 3}\n\n', body)
+        self.assertIn(": keep-alive", body)
+
+    def test_last_event_id_from_before_a_restart_starts_from_now(self):
+        publish = threading.Timer(0.05, get_broker().publish, (self.match_id, "score", {"our_score": 1}))
+        publish.start()
+        response = self.client.get(
+            f"/matches/{self.match_id}/events",
+            headers={"Last-Event-ID": "40"},
+        )
+        publish.join()
+        self.assertIn('id: 1\nevent: score\ndata: {"our_score": 1}\n\n', response.get_data(as_text=True))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from app import db
+from app.models import MatchPlayerStat, SeasonPlayerTotal, User
+from tests.support import AppTestCase
+
+class MatchStatsFormTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.season = self.make_season()
+        self.player_ids = [
+            self.make_player("Player", f"Number{number}", self.season).id
+            for number in range(5)
+        ]
+        self.match_id = self.make_match(self.season, status="played").id
+        self.admin_id = self.make_user("admin", role="admin").id
+
+    def form(self, goals=None, **overrides):
+        goals = goals or {}
+        form = {}
+        for player_id in self.player_ids:
+            form[f"played_{player_id}"] = "on"
+            form[f"goals_{player_id}"] = str(goals.get(player_id, 0))
+            form[f"yellow_{player_id}"] = "0"
+            form[f"red_{player_id}"] = "0"
+        form.update(overrides)
+        return form
+
+    def post(self, form):
+        self.login(db.session.get(User, self.admin_id))
+        db.session.expunge_all()
+        with self.capture_queries() as queries:
+            response = self.client.post(f"/admin/matches/{self.match_id}/stats", data=form)
+        self.assertEqual(response.status_code, 302)
+        return [
+            statement for statement, _ in queries
+            if statement.lstrip().upper().startswith(("INSERT", "UPDATE"))
+        ]
+
+    def goals(self):
+        db.session.expire_all()
+        return {
+            stat.player_id: stat.goals
+            for stat in MatchPlayerStat.query.filter_by(match_id=self.match_id)
+        }
+
+    def test_first_save_is_one_upsert(self):
+        writes = self.post(self.form({self.player_ids[0]: 2}))
+
+        stat_writes = [statement for statement in writes if "match_player_stats" in statement]
+        self.assertEqual(len(stat_writes), 1)
+        self.assertIn("ON CONFLICT", stat_writes[0])
+        self.assertEqual(len(self.goals()), len(self.player_ids))
+        self.assertEqual(self.goals()[self.player_ids[0]], 2)
+
+    def test_unchanged_rows_are_skipped(self):
+        self.post(self.form({self.player_ids[0]: 2}))
+        self.assertEqual(self.post(self.form({self.player_ids[0]: 2})), [])
+
+        self.post(self.form({self.player_ids[0]: 2, self.player_ids[1]: 1}))
+        self.assertEqual(self.goals()[self.player_ids[1]], 1)
+        totals = SeasonPlayerTotal.query.filter_by(player_id=self.player_ids[0]).one()
+        self.assertEqual((totals.goals, totals.games_played), (2, 1))
+
+    def test_invalid_value_writes_nothing(self):
+        self.post(self.form({self.player_ids[0]: 2}))
+        form = self.form({self.player_ids[0]: 5}, **{f"red_{self.player_ids[-1]}": "-1"})
+        self.assertEqual(self.post(form), [])
+        self.assertEqual(self.goals()[self.player_ids[0]], 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from datetime import date, timedelta
+from werkzeug.datastructures import MultiDict
+from app import db
+from app.models import Match
+from app.services.pagination import MAX_PAGE_SIZE, paginate_matches
+from tests.support import AppTestCase
+
+class MatchPaginationTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        season = self.make_season()
+        # Two matches per day so the id tiebreaker matters.
+        for index in range(25):
+            db.session.add(Match(
+                season_id=season.id,
+                date=date(2026, 1, 1) + timedelta(days=index // 2),
+                opponent=f"Rival {index}",
+            ))
+        db.session.commit()
+        self.expected = [
+            match.id for match in Match.query.order_by(Match.date.desc(), Match.id.desc())
+        ]
+
+    def page(self, **args):
+        return paginate_matches(Match.query, MultiDict({"per_page": "10", **args}))
+
+    def test_walks_forward_and_back_without_gaps(self):
+        forward = []
+        pages = [self.page()]
+        while pages[-1].next_cursor:
+            pages.append(self.page(after=pages[-1].next_cursor))
+        for page in pages:
+            forward.extend(match.id for match in page)
+        self.assertEqual(forward, self.expected)
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertIsNone(pages[0].prev_cursor)
+
+        back = self.page(before=pages[-1].prev_cursor)
+        self.assertEqual([match.id for match in back], self.expected[10:20])
+        first = self.page(before=back.prev_cursor)
+        self.assertEqual([match.id for match in first], self.expected[:10])
+        self.assertIsNone(first.prev_cursor)
+        self.assertIsNotNone(first.next_cursor)
+
+    def test_page_size_is_capped_and_bad_cursors_ignored(self):
+        page = paginate_matches(Match.query, MultiDict({"per_page": "5000", "after": "nope"}))
+        self.assertEqual(page.per_page, MAX_PAGE_SIZE)
+        self.assertEqual([match.id for match in page], self.expected)
+
+    def test_list_page_links_to_older_matches(self):
+        self.login(self.make_user("admin", role="admin"))
+        response = self.client.get("/admin/matches?per_page=10")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"after=", response.data)
+        self.assertNotIn(b"before=", response.data)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from werkzeug.security import generate_password_hash
+from app import db
+from app.models import User
+from app.services.passwords import _state, needs_rehash
+from tests.support import AppTestCase
+
+class PasswordPolicyTests(AppTestCase):
+    config = {
+        "PASSWORD_HASH_METHOD": "pbkdf2:sha256:1000",
+        "PASSWORD_CHECK_CONCURRENCY": 1,
+        "PASSWORD_CHECK_WAIT": 0,
+    }
+
+    def post_login(self, username="luca", password="pw"):
+        return self.client.post("/auth/login", data={"username": username, "password": password})
+
+    def stored_hash(self, user_id):
+        db.session.expire_all()
+        return db.session.get(User, user_id).password_hash
+
+    def test_new_hashes_use_configured_method(self):
+        user = self.make_user("luca")
+        self.assertTrue(user.password_hash.startswith("pbkdf2:sha256:1000$"))
+        self.assertFalse(needs_rehash(user.password_hash))
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        user = self.make_user("luca")
+        user.password_hash = generate_password_hash("pw", method="pbkdf2:sha256:500")
+        db.session.commit()
+
+        self.assertEqual(self.post_login().status_code, 302)
+        self.assertTrue(self.stored_hash(user.id).startswith("pbkdf2:sha256:1000$"))
+
+    def test_failed_login_keeps_hash(self):
+        user = self.make_user("luca")
+        user.password_hash = old_hash = generate_password_hash("pw", method="pbkdf2:sha256:500")
+        db.session.commit()
+
+        self.assertEqual(self.post_login(password="wrong").status_code, 200)
+        self.assertEqual(self.stored_hash(user.id), old_hash)
+
+    def test_login_gets_503_when_hashing_slots_are_busy(self):
+        self.make_user("luca")
+        limiter = _state()["limiter"]
+        limiter.acquire()
+        try:
+            response = self.post_login()
+        finally:
+            limiter.release()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.post_login().status_code, 302)
+
+if __name__ == "__main__":
+    unittest.main()
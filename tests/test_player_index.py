@@ -0,0 +1,40 @@
+import unittest
+from app.services.player_index import PlayerNameIndex, resolve_player_id
+from tests.support import AppTestCase
+
+class PlayerNameIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = PlayerNameIndex([
+            (1, "Luca", "Rossi"),
+            (2, "Marco", "Rossini"),
+            (3, "Pablo", "Diaz"),
+        ])
+
+    def test_exact_matches_full_first_and_last_name(self):
+        self.assertEqual(self.index.exact("luca rossi"), [1])
+        self.assertEqual(self.index.exact("marco"), [2])
+        self.assertEqual(self.index.exact("diaz"), [3])
+
+    def test_partial_matches_substrings_of_any_length(self):
+        self.assertEqual(self.index.partial("ssin"), [2])
+        self.assertEqual(self.index.partial("ross"), [1, 2])
+        self.assertEqual(self.index.partial("z"), [3])
+        self.assertEqual(self.index.partial("xyz"), [])
+
+class ResolvePlayerTests(AppTestCase):
+    def test_roster_is_searched_first(self):
+        season = self.make_season()
+        rostered = self.make_player("Luca", "Rossini", season)
+        self.make_player("Marco", "Rossi")
+
+        self.assertEqual(resolve_player_id("ross", season.id), rostered.id)
+        self.assertIsNone(resolve_player_id("ross"))
+
+    def test_players_added_after_build_are_found(self):
+        self.make_player("Luca", "Rossi")
+        self.assertIsNone(resolve_player_id("diaz"))
+        pablo = self.make_player("Pablo", "Diaz")
+        self.assertEqual(resolve_player_id("Diaz"), pablo.id)
+
+if __name__ == "__main__":
+    unittest.main()
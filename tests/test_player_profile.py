@@ -0,0 +1,60 @@
+import unittest
+from app import db
+from app.models import Player, RosterMembership, SeasonPlayerTotal
+from tests.support import AppTestCase
+
+class PlayerProfileTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.luca = self.make_player("Luca", "Rossi")
+        self.season_ids = {}
+        for year, goals in ((2024, 3), (2025, 5), (2026, 1)):
+            season = self.make_season(year=year, is_active=year == 2026)
+            self.season_ids[year] = season.id
+            db.session.add(SeasonPlayerTotal(
+                season_id=season.id,
+                player_id=self.luca.id,
+                games_played=4,
+                goals=goals,
+                yellow_cards=1,
+                red_cards=0,
+                mvp_votes_received=2,
+                mvp_wins=1,
+            ))
+        db.session.commit()
+        self.login(self.make_user("admin", role="admin"))
+
+    def test_career_sums_season_rollups(self):
+        response = self.client.get(f"/players/{self.luca.id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"Career (3 seasons)", response.data)
+        self.assertIn(b"9 goals", response.data)
+        self.assertIn(b"Games: 12", response.data)
+        self.assertIn(b"MVP wins: 3", response.data)
+        # Newest season first.
+        self.assertLess(response.data.index(b"2026 Spring"), response.data.index(b"2024 Spring"))
+
+    def test_reads_rollups_without_touching_match_stats(self):
+        with self.capture_queries() as statements:
+            self.client.get(f"/players/{self.luca.id}")
+        self.assertFalse(any("match_player_stats" in sql for sql, _ in statements))
+
+    def test_players_only_see_seasons_they_were_rostered_in(self):
+        marco = self.make_player("Marco", "Bianchi")
+        db.session.add(RosterMembership(season_id=self.season_ids[2025], player_id=marco.id))
+        db.session.commit()
+        self.login(self.make_user("marco", player=marco))
+
+        response = self.client.get(f"/players/{self.luca.id}")
+        self.assertIn(b"Career (1 season", response.data)
+        self.assertIn(b"5 goals", response.data)
+        self.assertNotIn(b"2026 Spring", response.data)
+        self.login(self.make_user("guest"))
+        self.assertEqual(self.client.get(f"/players/{self.luca.id}").status_code, 403)
+
+    def test_unknown_player_is_404(self):
+        missing_id = (db.session.query(db.func.max(Player.id)).scalar() or 0) + 1
+        self.assertEqual(self.client.get(f"/players/{missing_id}").status_code, 404)
+
+if __name__ == "__main__":
+    unittest.main()
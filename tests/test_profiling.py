@@ -0,0 +1,59 @@
+import unittest
+from flask import g
+from app import db
+from app.models import User
+from tests.support import AppTestCase
+
+class ProfilingTests(AppTestCase):
+    config = {"PROFILING_ENABLED": True, "SLOW_QUERY_MS": 10_000}
+
+    def setUp(self):
+        super().setUp()
+        season = self.make_season()
+        luca = self.make_player("Luca", "Rossi", season)
+        self.match_id = self.make_match(season).id
+        self.admin_id = self.make_user("admin", role="admin").id
+        self.player_user_id = self.make_user("luca", player=luca).id
+
+    def get(self, url, user_id):
+        self.login(db.session.get(User, user_id))
+        g.pop("_login_user", None)
+        db.session.expunge_all()
+        return self.client.get(url)
+
+    def test_server_timing_header_counts_queries(self):
+        response = self.get(f"/matches/{self.match_id}", self.player_user_id)
+        timing = response.headers["Server-Timing"]
+        self.assertRegex(timing, r'^db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+$')
+
+    def test_perf_page_lists_endpoints_for_admins_only(self):
+        self.get(f"/matches/{self.match_id}", self.player_user_id)
+        self.get(f"/matches/{self.match_id}", self.player_user_id)
+        self.assertEqual(self.get("/admin/perf", self.player_user_id).status_code, 403)
+
+        response = self.get("/admin/perf", self.admin_id)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"matches.detail", response.data)
+        self.assertIn(b"2 requests", response.data)
+
+    def test_slow_statements_are_logged_without_parameters(self):
+        self.app.config["SLOW_QUERY_MS"] = 0
+        with self.assertLogs("app.slow_queries", level="WARNING") as logs:
+            self.get(f"/matches/{self.match_id}", self.player_user_id)
+        self.assertTrue(any("endpoint=matches.detail" in line for line in logs.output))
+
+    def test_failed_statement_does_not_leave_a_timer_behind(self):
+        with db.engine.connect() as connection:
+            with self.assertRaises(Exception):
+                connection.exec_driver_sql("SELECT * FROM no_such_table")
+            self.assertEqual(connection.info.get("profiling_started"), [])
+
+class ProfilingDisabledTests(AppTestCase):
+    def test_no_header_and_perf_page_explains(self):
+        self.login(self.make_user("admin", role="admin"))
+        response = self.client.get("/admin/perf")
+        self.assertNotIn("Server-Timing", response.headers)
+        self.assertIn(b"Profiling is off", response.data)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from datetime import date, timedelta
+from app import db
+from app.models import RosterMembership, Match, MatchPlayerStat, MVPVote, User
+from tests.support import AppTestCase
+
+# Upper bounds on SQL statements per page view, independent of row counts.
+# Player-facing pages include one resource_versions lookup for their ETag;
+# /matches adds one more for the versions its cached match cards are keyed by.
+QUERY_BUDGETS = {
+    "/matches": 5,
+    "/matches/{match_id}": 6,
+    "/matches/{match_id}/vote": 4,
+    "/seasons/{season_id}/stats": 7,
+    "/admin/matches": 4,
+    "/admin/matches/{match_id}/stats": 4,
+    "/admin/matches/{match_id}/mvp": 3,
+    "/admin/seasons/{season_id}/roster": 5,
+}
+
+class QueryCountTests(AppTestCase):
+    def seed(self, seasons, players_per_season, matches_per_season):
+        admin = self.make_user("admin", role="admin")
+        first_season = None
+        for number in range(seasons):
+            season = self.make_season(
+                year=2020 + number,
+                tournament_name=f"Liga {number}",
+                is_active=number == seasons - 1,
+            )
+            first_season = first_season or season
+            players = [
+                self.make_player("Player", f"S{number}P{index}", season)
+                for index in range(players_per_season)
+            ]
+            # Half of the roster left the team, so roster history is populated too.
+            for membership in RosterMembership.query.filter_by(season_id=season.id).limit(players_per_season // 2):
+                membership.status = "inactive"
+            for index in range(matches_per_season):
+                match = Match(
+                    season_id=season.id,
+                    date=date(2020 + number, 1, 1) + timedelta(days=index),
+                    opponent=f"Rival {index}",
+                    status="played",
+                )
+                db.session.add(match)
+                db.session.flush()
+                for offset, player in enumerate(players):
+                    db.session.add(MatchPlayerStat(match_id=match.id, player_id=player.id, goals=offset % 3))
+                    voted = players[(offset + 1) % len(players)]
+                    db.session.add(MVPVote(match_id=match.id, voter_player_id=player.id, voted_player_id=voted.id))
+            db.session.commit()
+        voter = self.make_user("voter", player=players[-1])
+        return admin.id, voter.id, season.id, match.id
+
+    def count_per_route(self, seasons, players, matches):
+        admin_id, voter_id, season_id, match_id = self.seed(seasons, players, matches)
+        counts = {}
+        for template in QUERY_BUDGETS:
+            url = template.format(match_id=match_id, season_id=season_id)
+            user_id = admin_id if url.startswith("/admin") else voter_id
+            self.login(db.session.get(User, user_id))
+            # Requests share the test session; start each one with an empty identity map.
+            db.session.expunge_all()
+            with self.capture_queries() as statements:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            counts[template] = len(statements)
+        return counts
+
+    def test_routes_stay_within_query_budget(self):
+        counts = self.count_per_route(seasons=3, players=12, matches=8)
+        for template, budget in QUERY_BUDGETS.items():
+            self.assertLessEqual(counts[template], budget, template)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        small = self.count_per_route(seasons=1, players=4, matches=2)
+        db.drop_all()
+        db.create_all()
+        large = self.count_per_route(seasons=4, players=16, matches=10)
+        self.assertEqual(small, large)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import re
+import unittest
+from app import db
+from tests.support import AppTestCase
+
+INDEXED_TABLES = {
+    "matches",
+    "match_player_stats",
+    "mvp_votes",
+    "roster_memberships",
+    "seasons",
+    "users",
+    "season_player_totals",
+}
+FILTERED = re.compile(r"\bWHERE\b")
+FULL_SCAN = re.compile(r"^SCAN (\w+)")
+
+class QueryPlanTests(AppTestCase):
+    """Hot queries in matches.py and admin.py must be served by an index."""
+
+    def setUp(self):
+        super().setUp()
+        self.season = self.make_season()
+        self.player = self.make_player("Luca", "Rossi", self.season)
+        self.make_player("Marco", "Bianchi", self.season)
+        self.match = self.make_match(self.season, status="played")
+        self.admin = self.make_user("admin", role="admin")
+        self.user = self.make_user("luca", player=self.player)
+
+    def capture(self, user, urls):
+        self.login(user)
+        with self.capture_queries() as statements:
+            for url in urls:
+                db.session.expunge_all()
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200, url)
+        return statements
+
+    def assert_indexed(self, statements):
+        with db.engine.connect() as connection:
+            for statement, parameters in statements:
+                # Unfiltered listings (e.g. all seasons for a dropdown) are full by nature.
+                if not FILTERED.search(statement):
+                    continue
+                plan = connection.exec_driver_sql(
+                    "EXPLAIN QUERY PLAN " + statement,
+                    parameters,
+                ).fetchall()
+                for row in plan:
+                    scan = FULL_SCAN.match(row[-1])
+                    if scan and scan.group(1) in INDEXED_TABLES:
+                        self.fail(f"Full scan of {scan.group(1)}:\n{statement}")
+
+    def test_player_routes_use_indexes(self):
+        match_id = self.match.id
+        statements = self.capture(self.user, [
+            "/matches",
+            f"/matches/{match_id}",
+            f"/matches/{match_id}/vote",
+            f"/seasons/{self.season.id}/stats",
+        ])
+        self.assert_indexed(statements)
+
+    def test_admin_match_routes_use_indexes(self):
+        match_id = self.match.id
+        statements = self.capture(self.admin, [
+            "/admin/matches",
+            f"/admin/matches/{match_id}/stats",
+            f"/admin/matches/{match_id}/mvp",
+            f"/admin/seasons/{self.season.id}/roster",
+        ])
+        self.assert_indexed(statements)
+
+if __name__ == "__main__":
+    unittest.main()
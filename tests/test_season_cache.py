@@ -0,0 +1,29 @@
+import unittest
+from app.services.season_cache import get_current_season
+from tests.support import AppTestCase
+
+class CurrentSeasonCacheTests(AppTestCase):
+    def test_latest_season_ordered_by_year_then_term(self):
+        self.make_season(year=2025, term="Fall", is_active=False)
+        latest = self.make_season(year=2026, term="Spring", is_active=False)
+        self.make_season(year=2026, term="Winter", is_active=False)
+
+        current = get_current_season()
+        self.assertEqual((current.id, current.term), (latest.id, "Spring"))
+        self.assertEqual(current.tournament_name, "Liga")
+
+    def test_cached_until_admin_activates_a_season(self):
+        older = self.make_season(year=2025, term="Fall", is_active=True)
+        newer = self.make_season(year=2026, term="Spring", is_active=False)
+        self.assertEqual(get_current_season().id, older.id)
+
+        with self.capture_queries() as statements:
+            self.assertEqual(get_current_season().id, older.id)
+        self.assertEqual(statements, [])
+
+        self.login(self.make_user("admin", role="admin"))
+        self.client.post(f"/admin/seasons/{newer.id}/activate")
+        self.assertEqual(get_current_season().id, newer.id)
+
+if __name__ == "__main__":
+    unittest.main()
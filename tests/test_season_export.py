@@ -0,0 +1,76 @@
+import csv
+import io
+import unittest
+from app import db
+from tests.support import AppTestCase
+
+class SeasonExportTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.season = self.make_season()
+        self.luca = self.make_player("Luca", "Rossi", self.season)
+        self.marco = self.make_player("Marco", "Bianchi", self.season)
+        self.match = self.make_match(self.season, status="played")
+        self.admin = self.make_user("admin", role="admin")
+        self.login(self.admin)
+
+    def post_stats(self, goals):
+        form = {}
+        for player in (self.luca, self.marco):
+            form[f"played_{player.id}"] = "on"
+            form[f"goals_{player.id}"] = str(goals.get(player.id, 0))
+        self.client.post(f"/admin/matches/{self.match.id}/stats", data=form)
+
+    def export(self, export_format, **headers):
+        return self.client.get(f"/seasons/{self.season.id}/stats.{export_format}", headers=headers)
+
+    def test_csv_export_streams_totals(self):
+        self.post_stats({self.marco.id: 3})
+        response = self.export("csv")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        self.assertEqual([row["last_name"] for row in rows], ["Bianchi", "Rossi"])
+        self.assertEqual((rows[0]["goals"], rows[0]["games_played"]), ("3", "1"))
+
+    def test_json_export(self):
+        self.post_stats({self.luca.id: 2})
+        body = self.export("json").get_json()
+        self.assertEqual(body["season_id"], self.season.id)
+        self.assertEqual(body["players"][0]["player_id"], self.luca.id)
+        self.assertEqual(body["players"][0]["goals"], 2)
+
+    def test_unchanged_export_returns_304(self):
+        self.post_stats({self.luca.id: 1})
+        first = self.export("csv")
+        etag = first.headers["ETag"]
+
+        with self.capture_queries() as statements:
+            repeat = self.export("csv", **{"If-None-Match": etag})
+        self.assertEqual(repeat.status_code, 304)
+        self.assertFalse([statement for statement, _ in statements if "season_player_totals" in statement])
+
+        since = self.export("csv", **{"If-Modified-Since": first.headers["Last-Modified"]})
+        self.assertEqual(since.status_code, 304)
+        self.assertNotEqual(self.export("json").headers["ETag"], etag)
+
+    def test_stat_or_vote_change_invalidates_export(self):
+        self.post_stats({self.luca.id: 1})
+        etag = self.export("csv").headers["ETag"]
+        self.post_stats({self.luca.id: 2})
+        changed = self.export("csv", **{"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+
+        etag = changed.headers["ETag"]
+        voter = self.make_user("luca", player=self.luca)
+        self.login(voter)
+        self.client.post(f"/matches/{self.match.id}/vote", data={"voted_player_id": self.marco.id})
+        self.assertEqual(self.export("csv", **{"If-None-Match": etag}).status_code, 200)
+
+    def test_export_requires_roster_membership(self):
+        outsider = self.make_user("outsider", player=self.make_player("Out", "Sider"))
+        self.login(outsider)
+        self.assertEqual(self.export("csv").status_code, 403)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from flask import g
+from app import db
+from app.models import User
+from app.services.session_users import invalidate_session_user
+from tests.support import AppTestCase
+
+class SessionUserCacheTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.season = self.make_season()
+        self.player = self.make_player("Luca", "Rossi", self.season)
+        self.user_id = self.make_user("luca", player=self.player).id
+        self.login(db.session.get(User, self.user_id))
+
+    def get(self, url):
+        # Requests share the test's app context; make Flask-Login call the loader again.
+        g.pop("_login_user", None)
+        db.session.expunge_all()
+        return self.client.get(url)
+
+    def users_queries(self, url="/matches"):
+        with self.capture_queries() as statements:
+            response = self.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [statement for statement, _ in statements if "FROM users" in statement]
+
+    def test_logged_in_page_views_skip_users_table(self):
+        self.assertEqual(len(self.users_queries()), 1)
+        self.assertEqual(self.users_queries(), [])
+        self.assertEqual(self.users_queries(), [])
+
+    def test_invalidation_reloads_user(self):
+        self.users_queries()
+        db.session.get(User, self.user_id).role = "admin"
+        db.session.commit()
+        invalidate_session_user(self.user_id)
+
+        self.assertEqual(self.get("/admin/").status_code, 200)
+
+    def test_deactivated_user_is_logged_out(self):
+        self.users_queries()
+        db.session.get(User, self.user_id).is_active = False
+        db.session.commit()
+        invalidate_session_user(self.user_id)
+
+        response = self.get("/matches/1/vote")
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("/auth/login", response.headers["Location"])
+
+class UncachedSessionUserTests(SessionUserCacheTests):
+    config = {"SESSION_USER_CACHE_TTL": 0}
+
+    def test_logged_in_page_views_skip_users_table(self):
+        self.assertEqual(len(self.users_queries()), 1)
+        self.assertEqual(len(self.users_queries()), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from app import db
+from app.models import MVPVote
+from tests.support import AppTestCase
+
+WAIT_SECONDS = 5
+
+class SqliteTuningTests(AppTestCase):
+    """Runs against a file database so WAL and locking behave as in production."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.config = {"SQLALCHEMY_DATABASE_URI": "sqlite:///" + os.path.join(self.tmpdir, "app.db")}
+        super().setUp()
+        self.season = self.make_season()
+        self.players = [self.make_player("Player", f"P{number}", self.season) for number in range(8)]
+        self.match = self.make_match(self.season, status="played")
+        self.users = [
+            self.make_user(f"user{number}", player=player)
+            for number, player in enumerate(self.players)
+        ]
+
+    def tearDown(self):
+        super().tearDown()
+        with self.app.app_context():
+            db.engine.dispose()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_pragmas_applied_on_connect(self):
+        with db.engine.connect() as connection:
+            self.assertEqual(connection.exec_driver_sql("PRAGMA journal_mode").scalar(), "wal")
+            self.assertEqual(connection.exec_driver_sql("PRAGMA synchronous").scalar(), 1)
+            self.assertEqual(connection.exec_driver_sql("PRAGMA busy_timeout").scalar(), 5000)
+
+    def test_database_url_is_honoured(self):
+        self.assertTrue(db.engine.url.database.startswith(self.tmpdir))
+
+    def test_voters_not_blocked_by_admin_stat_entry(self):
+        match_id = self.match.id
+        user_ids = [user.id for user in self.users]
+        player_ids = [player.id for player in self.players]
+        engine = db.engine
+        db.session.remove()
+
+        writer_holding = threading.Event()
+        reads_done = threading.Event()
+        reads_lock = threading.Lock()
+        reads = []
+        held_through_reads = []
+
+        def admin_stat_entry():
+            # A slow admin write holding an exclusive lock, as a large commit does.
+            # It only commits once every reader has finished (or gives up after
+            # WAIT_SECONDS); under the rollback journal the readers would block
+            # on it instead, so the reads could not finish while it is held.
+            connection = engine.raw_connection()
+            try:
+                cursor = connection.cursor()
+                cursor.execute("BEGIN EXCLUSIVE")
+                cursor.execute(
+                    "INSERT INTO match_player_stats (match_id, player_id, played, goals, yellow_cards, red_cards, created_at, updated_at) "
+                    "VALUES (?, ?, 1, 2, 0, 0, '2026-01-01', '2026-01-01')",
+                    (match_id, player_ids[0]),
+                )
+                writer_holding.set()
+                held_through_reads.append(reads_done.wait(timeout=WAIT_SECONDS))
+                connection.commit()
+            finally:
+                connection.close()
+
+        vote_statuses = []
+        errors = []
+
+        def voter(index):
+            try:
+                client = self.app.test_client()
+                with client.session_transaction() as session:
+                    session["_user_id"] = str(user_ids[index])
+                writer_holding.wait(timeout=WAIT_SECONDS)
+                response = client.get(f"/matches/{match_id}")
+                self.assertEqual(response.status_code, 200)
+                with reads_lock:
+                    reads.append(index)
+                    if len(reads) == len(user_ids):
+                        reads_done.set()
+                voted = player_ids[(index + 1) % len(player_ids)]
+                response = client.post(f"/matches/{match_id}/vote", data={"voted_player_id": voted})
+                vote_statuses.append(response.status_code)
+            except Exception as exc:  # surfaced below; threads swallow assertions
+                errors.append(exc)
+
+        threads = [threading.Thread(target=admin_stat_entry)]
+        threads += [threading.Thread(target=voter, args=(index,)) for index in range(len(user_ids))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=WAIT_SECONDS * 2)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(held_through_reads, [True])
+        self.assertEqual(vote_statuses, [302] * len(user_ids))
+        self.assertEqual(MVPVote.query.count(), len(user_ids))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from datetime import date
+from flask import g
+from app import db
+from app.models import Match, SeasonStanding, User
+from app.services.standings import get_standing, rebuild_standings
+from tests.support import AppTestCase
+
+class SeasonStandingTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        season = self.make_season()
+        self.season_id = season.id
+        self.match_ids = [
+            self.make_match(season, opponent=f"Rivals {day}", match_date=date(2026, 3, day)).id
+            for day in (1, 8, 15)
+        ]
+        self.admin_id = self.make_user("admin", role="admin").id
+
+    def edit(self, match_id, status, our_score, their_score, match_date=None):
+        match = db.session.get(Match, match_id)
+        self.login(db.session.get(User, self.admin_id))
+        g.pop("_login_user", None)
+        self.client.post(f"/admin/matches/{match_id}", data={
+            "form": "match",
+            "date": (match_date or match.date).isoformat(),
+            "opponent": match.opponent,
+            "status": status,
+            "our_score": our_score,
+            "their_score": their_score,
+        })
+        db.session.expunge_all()
+
+    def standing(self):
+        standing = get_standing(self.season_id)
+        return (
+            standing.played, standing.won, standing.drawn, standing.lost,
+            standing.goals_for, standing.goals_against, standing.form,
+        )
+
+    def assert_matches_rebuild(self):
+        incremental = self.standing()
+        rebuild_standings(self.season_id)
+        self.assertEqual(self.standing(), incremental)
+
+    def test_admin_results_and_status_transitions(self):
+        self.edit(self.match_ids[0], "played", 2, 1)
+        self.edit(self.match_ids[1], "played", 0, 0)
+        self.edit(self.match_ids[2], "played", 1, 3)
+        self.assertEqual(self.standing(), (3, 1, 1, 1, 3, 4, "WDL"))
+
+        self.edit(self.match_ids[1], "cancelled", 0, 0)
+        self.assertEqual(self.standing(), (2, 1, 0, 1, 3, 4, "WL"))
+        self.assert_matches_rebuild()
+
+        self.edit(self.match_ids[1], "played", 4, 0)
+        self.assertEqual(self.standing(), (3, 2, 0, 1, 7, 4, "WWL"))
+        self.assertEqual(get_standing(self.season_id).points, 6)
+        self.assert_matches_rebuild()
+
+    def test_date_edit_reorders_form(self):
+        self.edit(self.match_ids[0], "played", 2, 1)
+        self.edit(self.match_ids[1], "played", 0, 1)
+        self.edit(self.match_ids[0], "played", 2, 1, match_date=date(2026, 3, 20))
+        self.assertEqual(self.standing()[-1], "LW")
+
+    def test_telegram_score_updates_played_match(self):
+        self.edit(self.match_ids[0], "played", 0, 0)
+        self.client.post(
+            "/api/telegram/admin",
+            json={"telegram_user_id": "42", "text": f"/match {self.match_ids[0]} score 3-2"},
+            headers={"X-TELEGRAM_SECRET": "secret"},
+        )
+        db.session.expunge_all()
+        self.assertEqual(self.standing(), (1, 1, 0, 0, 3, 2, "W"))
+        self.assert_matches_rebuild()
+
+    def test_page_reads_the_standing_row(self):
+        self.edit(self.match_ids[0], "played", 2, 1)
+        with self.capture_queries() as statements:
+            response = self.client.get(f"/seasons/{self.season_id}/standings")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"3 pts", response.data)
+        self.assertEqual(
+            len([sql for sql, _ in statements if "season_standings" in sql]),
+            1,
+        )
+        self.assertEqual(SeasonStanding.query.count(), 1)
+
+if __name__ == "__main__":
+    unittest.main()
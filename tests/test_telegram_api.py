@@ -0,0 +1,147 @@
+import unittest
+from datetime import timedelta
+from sqlalchemy import event
+from app import db
+from app.models import Match, MatchPlayerStat, SeasonPlayerTotal, TelegramDelivery, utcnow
+from app.services.telegram_dedup import idempotency_key, record_delivery
+from tests.support import AppTestCase
+
+class TelegramIngestTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.season = self.make_season()
+        self.luca = self.make_player("Luca", "Rossi", self.season)
+        self.marco = self.make_player("Marco", "Bianchi", self.season)
+        self.match = self.make_match(self.season)
+
+    def post(self, text, path="/api/telegram/admin", **extra):
+        return self.client.post(
+            path,
+            json={"telegram_user_id": "42", "text": text, **extra},
+            headers={"X-TELEGRAM_SECRET": "secret"},
+        )
+
+    def test_single_command(self):
+        response = self.post(f"/match {self.match.id} stats Rossi goals=2 y=0 r=0 played=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.get_json()["ok"])
+        stat = MatchPlayerStat.query.filter_by(player_id=self.luca.id).one()
+        self.assertEqual(stat.goals, 2)
+
+    def test_batch_applies_valid_lines_and_reports_failures(self):
+        text = "\n".join([
+            f"/match {self.match.id} score 3-1",
+            f"/match {self.match.id} stats Rossi goals=1 y=0 r=0 played=1",
+            f"/match {self.match.id} stats Bianchi goals=2 y=1 r=0 played=1",
+            f"/match {self.match.id} stats Nobody goals=0 y=0 r=0 played=1",
+            "",
+            "/match x score 1-0",
+            f"/match {self.match.id} stats Rossi goals=0 y=0 r=0 played=1",
+        ])
+        response = self.post(text, path="/api/telegram/admin/batch")
+        body = response.get_json()
+
+        self.assertFalse(body["ok"])
+        self.assertEqual(body["applied"], 4)
+        self.assertEqual(
+            [(result["line"], result["ok"]) for result in body["results"]],
+            [(1, True), (2, True), (3, True), (4, False), (6, False), (7, True)],
+        )
+        self.assertEqual(body["results"][3]["error"], "Player not found.")
+
+        db.session.expire_all()
+        match = db.session.get(Match, self.match.id)
+        self.assertEqual((match.our_score, match.their_score), (3, 1))
+        totals = {
+            row.player_id: row.goals
+            for row in SeasonPlayerTotal.query.filter_by(season_id=self.season.id)
+        }
+        self.assertEqual(totals, {self.luca.id: 0, self.marco.id: 2})
+
+    def test_multi_line_text_on_single_endpoint_is_batched(self):
+        text = f"/match {self.match.id} score 1-0\n/match {self.match.id} score 2-0"
+        body = self.post(text).get_json()
+        self.assertEqual(body["applied"], 2)
+
+    def test_multi_line_notes_stay_one_command(self):
+        response = self.post(f'/match {self.match.id} score 2-1 notes "Late winner.\nGreat crowd."')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("results", response.get_json())
+        db.session.expire_all()
+        match = db.session.get(Match, self.match.id)
+        self.assertEqual((match.our_score, match.notes), (2, "Late winner.\nGreat crowd."))
+
+        # Not every line is a command, so nothing is applied line by line.
+        self.assertEqual(self.post(f"/match {self.match.id} score 5-0\nwhat a game").status_code, 400)
+        db.session.expire_all()
+        self.assertEqual(db.session.get(Match, self.match.id).our_score, 2)
+
+    def test_redelivered_update_replays_response(self):
+        text = f"/match {self.match.id} stats Rossi goals=2 y=0 r=0 played=1"
+        first = self.post(text, update_id=1001)
+        stat = MatchPlayerStat.query.filter_by(player_id=self.luca.id).one()
+        stat.goals = 5  # an admin correction made after the first delivery
+        db.session.commit()
+
+        with self.capture_queries() as statements:
+            second = self.post(text, update_id=1001)
+        self.assertEqual(second.get_json(), first.get_json())
+        self.assertEqual(second.headers["Idempotent-Replayed"], "true")
+        self.assertFalse([
+            statement for statement, _ in statements
+            if statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+        ])
+        db.session.expire_all()
+        self.assertEqual(MatchPlayerStat.query.filter_by(player_id=self.luca.id).one().goals, 5)
+
+    def test_errors_are_not_replayed(self):
+        missing = self.post("/match 999 score 1-0", update_id=2001)
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(TelegramDelivery.query.count(), 0)
+
+        retry = self.post(f"/match {self.match.id} score 1-0", update_id=2001)
+        self.assertEqual(retry.status_code, 200)
+        self.assertNotIn("Idempotent-Replayed", retry.headers)
+
+    def test_unrelated_conflict_answers_409(self):
+        match_id, player_id = self.match.id, self.luca.id
+
+        def concurrent_insert(session):
+            # Another command writes the same stat row just before ours commits.
+            session.execute(db.insert(MatchPlayerStat).values(
+                match_id=match_id, player_id=player_id, played=True, goals=0, yellow_cards=0, red_cards=0,
+            ))
+
+        event.listen(db.session, "before_commit", concurrent_insert, once=True)
+        response = self.post(f"/match {match_id} stats Rossi goals=2 y=0 r=0 played=1", update_id=3001)
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(response.get_json()["ok"])
+        self.assertEqual(TelegramDelivery.query.count(), 0)
+
+    def test_repeat_without_update_id_is_deduplicated_within_window(self):
+        text = f"/match {self.match.id} score 1-0"
+        self.post(text)
+        self.assertEqual(self.post(text).headers.get("Idempotent-Replayed"), "true")
+        self.assertNotIn("Idempotent-Replayed", self.post(text, update_id=5).headers)
+
+        payload = {"telegram_user_id": "42", "text": text}
+        self.assertEqual(idempotency_key(payload, now=120), idempotency_key(payload, now=179))
+        self.assertNotEqual(idempotency_key(payload, now=179), idempotency_key(payload, now=180))
+
+    def test_old_deliveries_are_pruned(self):
+        db.session.add(TelegramDelivery(
+            idempotency_key="update:old",
+            response={"ok": True},
+            response_status=200,
+            created_at=utcnow() - timedelta(days=2),
+        ))
+        db.session.commit()
+        record_delivery("update:new", {"ok": True}, 200)
+        db.session.commit()
+        self.assertEqual(
+            [row.idempotency_key for row in TelegramDelivery.query.all()],
+            ["update:new"],
+        )
+
+if __name__ == "__main__":
+    unittest.main()
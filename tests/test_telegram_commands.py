@@ -1,5 +1,54 @@
+import random
 import unittest
-from app.services.telegram_commands import parse_command, CommandError
+from app.services.telegram_commands import (
+    parse_command,
+    parse_commands,
+    parse_tokens,
+    tokenize,
+    CommandError,
+    ScoreCommand,
+    StatsCommand,
+)
+
+TOKENS = [
+    "/match", "/MATCH", "5", "012", "-3", "x", "score", "stats", "2-1", "0-0", "3-", "1-x",
+    "2-1-3", "notes", '"Great half"', "'single quoted'", '""', '"a\\"b"', "Luca",
+    '"Luca Rossi"', "goals=2", "goals=0", "y=0", "y=1", "r=1", "r=0", "played=1",
+    "played=0", "played=2", "goals=-1", "y=x", "k=v=1", "extra", '"unterminated',
+    "a\\ b", "#", "=1", "goals=", "99999999999999999999",
+]
+SEPARATORS = [" ", "  ", "\t", " \r ", " \n "]
+
+def _outcome(parse, text):
+    try:
+        command = parse(text)
+    except ValueError as exc:
+        return type(exc), str(exc)
+    return command.to_dict()
+
+def _random_command(rng):
+    """Mostly well-formed commands with occasional junk tokens mixed in."""
+    words = ["/match", rng.choice(["5", "012", "x", "7"])]
+    kind = rng.random()
+    if kind < 0.4:
+        words += ["score", rng.choice(["2-1", "0-0", "10-3", "3-", "1-x", "2-1-3"])]
+        if rng.random() < 0.5:
+            words += ["notes", rng.choice(['"Great half"', "'single quoted'", '""', "Rain", '"a\\"b"'])]
+    elif kind < 0.8:
+        words += ["stats", rng.choice(["Luca", '"Luca Rossi"', "'Di Maria'", "goals=1", '""'])]
+        fields = ["goals", "y", "r", "played"]
+        rng.shuffle(fields)
+        for field in fields[: rng.randint(2, 4)]:
+            words.append(f"{field}={rng.choice(['0', '1', '2', '03', '-1', 'x', ''])}")
+    else:
+        words = [rng.choice(TOKENS) for _ in range(rng.randint(0, 6))]
+    if rng.random() < 0.3:
+        words.insert(rng.randint(0, len(words)), rng.choice(TOKENS))
+
+    text = ""
+    for word in words:
+        text += rng.choice(SEPARATORS) + word
+    return text if rng.random() < 0.5 else text.strip()
 
 class TelegramCommandTests(unittest.TestCase):
     def test_parse_score_with_notes(self):
@@ -23,5 +72,31 @@ class TelegramCommandTests(unittest.TestCase):
         with self.assertRaises(CommandError):
             parse_command('/match 5 score 1-x')
 
+    def test_parse_commands_per_line(self):
+        results = parse_commands('/match 5 score 2-0\n\n/match 5 stats Luca goals=1\n')
+        self.assertEqual([line for line, _, _ in results], [1, 3])
+        self.assertEqual(results[0][1]["home_score"], 2)
+        self.assertIsNone(results[0][2])
+        self.assertIsInstance(results[1][2], CommandError)
+
+    def test_commands_are_typed(self):
+        self.assertIsInstance(parse_command("/match 1 score 2-0"), ScoreCommand)
+        cmd = parse_command("/match 1 stats 'Luca Rossi' goals=1 y=0 r=0 played=0")
+        self.assertIsInstance(cmd, StatsCommand)
+        self.assertEqual(cmd.player_identifier, "Luca Rossi")
+        self.assertIs(cmd.played, False)
+        with self.assertRaises(AttributeError):
+            cmd.extra = 1
+
+    def test_fast_path_matches_shlex_parser(self):
+        rng = random.Random(1234)
+        for _ in range(5000):
+            text = _random_command(rng)
+            self.assertEqual(
+                _outcome(parse_command, text),
+                _outcome(lambda line: parse_tokens(tokenize(line)), text),
+                repr(text),
+            )
+
 if __name__ == "__main__":
     unittest.main()
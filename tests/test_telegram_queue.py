@@ -0,0 +1,116 @@
+import unittest
+from datetime import timedelta
+from sqlalchemy import event
+from app import db
+from app.models import Match, MatchPlayerStat, TelegramCommand, utcnow
+from app.services.telegram_queue import apply_queued_commands
+from tests.support import AppTestCase
+
+class TelegramQueueTests(AppTestCase):
+    config = {"TELEGRAM_INGEST_MODE": "queue"}
+
+    def setUp(self):
+        super().setUp()
+        self.season = self.make_season()
+        self.luca = self.make_player("Luca", "Rossi", self.season)
+        self.match = self.make_match(self.season)
+
+    def post(self, text, path="/api/telegram/admin", **extra):
+        return self.client.post(
+            path,
+            json={"telegram_user_id": "42", "text": text, **extra},
+            headers={"X-TELEGRAM_SECRET": "secret"},
+        )
+
+    def status(self, command_id):
+        return self.client.get(
+            f"/api/telegram/commands/{command_id}",
+            headers={"X-TELEGRAM_SECRET": "secret"},
+        )
+
+    def test_command_is_queued_then_applied_by_worker(self):
+        response = self.post(f"/match {self.match.id} stats Rossi goals=2 y=0 r=0 played=1")
+        self.assertEqual(response.status_code, 202)
+        command_id = response.get_json()["command_id"]
+        self.assertIsNone(MatchPlayerStat.query.filter_by(player_id=self.luca.id).first())
+        self.assertEqual(self.status(command_id).get_json()["status"], "queued")
+
+        self.assertEqual(apply_queued_commands(), 1)
+        self.assertEqual(apply_queued_commands(), 0)
+
+        body = self.status(command_id).get_json()
+        self.assertEqual(body["status"], "applied")
+        self.assertEqual(body["result"]["data"]["goals"], 2)
+        stat = MatchPlayerStat.query.filter_by(player_id=self.luca.id).one()
+        self.assertEqual(stat.goals, 2)
+
+    def test_batch_results_and_failures_are_recorded(self):
+        text = f"/match {self.match.id} score 2-0\n/match {self.match.id} stats Nobody goals=0 y=0 r=0 played=1"
+        command_id = self.post(text, path="/api/telegram/admin/batch").get_json()["command_id"]
+        missing_id = self.post("/match 999 score 1-0").get_json()["command_id"]
+        rejected_id = self.post("/match 999 score 1-0", path="/api/telegram/admin/batch").get_json()["command_id"]
+        apply_queued_commands()
+
+        batch = self.status(command_id).get_json()
+        self.assertEqual(batch["status"], "partial")
+        self.assertEqual(batch["result"]["applied"], 1)
+        self.assertEqual([line["ok"] for line in batch["result"]["results"]], [True, False])
+        self.assertEqual(self.status(rejected_id).get_json()["status"], "failed")
+        self.assertEqual(self.status(missing_id).get_json()["status"], "failed")
+        self.assertEqual(self.status(missing_id).get_json()["result"]["error"], "Match not found.")
+        db.session.expire_all()
+        self.assertEqual(db.session.get(Match, self.match.id).our_score, 2)
+
+    def test_poison_command_does_not_block_its_batch(self):
+        def reject(mapper, connection, target):
+            if target.goals == 77:
+                raise db.exc.IntegrityError("INSERT", {}, Exception("rejected"))
+
+        score_id = self.post(f"/match {self.match.id} score 2-0").get_json()["command_id"]
+        poison_id = self.post(f"/match {self.match.id} stats Rossi goals=77 y=0 r=0 played=1").get_json()["command_id"]
+        event.listen(MatchPlayerStat, "before_insert", reject)
+        try:
+            with self.assertLogs(self.app.logger, "ERROR"):
+                self.assertEqual(apply_queued_commands(), 2)
+        finally:
+            event.remove(MatchPlayerStat, "before_insert", reject)
+
+        self.assertEqual(self.status(score_id).get_json()["status"], "applied")
+        poison = self.status(poison_id).get_json()
+        self.assertEqual((poison["status"], poison["result"]["ok"]), ("failed", False))
+        self.assertEqual(TelegramCommand.query.filter_by(status="applying").count(), 0)
+        db.session.expire_all()
+        self.assertEqual(db.session.get(Match, self.match.id).our_score, 2)
+        self.assertIsNone(MatchPlayerStat.query.first())
+
+    def test_invalid_command_is_rejected_without_queueing(self):
+        response = self.post(f"/match {self.match.id} score two-one")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(TelegramCommand.query.count(), 0)
+
+    def test_redelivered_update_is_queued_once(self):
+        text = f"/match {self.match.id} score 1-0"
+        first = self.post(text, update_id=777).get_json()
+        second = self.post(text, update_id=777).get_json()
+
+        self.assertEqual(first["command_id"], second["command_id"])
+        self.assertTrue(second["duplicate"])
+        self.assertEqual(TelegramCommand.query.count(), 1)
+
+    def test_stale_claims_are_retried(self):
+        command_id = self.post(f"/match {self.match.id} score 4-0").get_json()["command_id"]
+        command = db.session.get(TelegramCommand, command_id)
+        command.status = "applying"
+        command.claim_token = "crashed"
+        command.claimed_at = utcnow() - timedelta(hours=1)
+        db.session.commit()
+
+        self.assertEqual(apply_queued_commands(), 1)
+        self.assertEqual(self.status(command_id).get_json()["status"], "applied")
+
+    def test_status_requires_secret(self):
+        response = self.client.get("/api/telegram/commands/1")
+        self.assertEqual(response.status_code, 401)
+
+if __name__ == "__main__":
+    unittest.main()